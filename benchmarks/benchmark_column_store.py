@@ -0,0 +1,91 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+# Custom modules
+import synthetic_data as sd
+import DataImportExport as die
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Declared dtypes of the synthetic data columns
+COLUMN_DTYPES = {"Location": "int64", "Date": "int64"}
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def time_import(import_function, repeats: int):
+    """Best time of an import, best of repeats
+
+    Args:
+        import_function (callable): function importing the data
+        repeats (int): number of times the import is timed
+
+    Returns:
+        float: best import time (s)
+    """
+    import_times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        import_function()
+        import_times.append(time.perf_counter() - start_time)
+    return min(import_times)
+
+# =============================================================================
+# Programme exectuion
+# =============================================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="compare the typed .csv import with memory mapping a" \
+            " column store ingested from the same data file"
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000,
+        help="number of rows of the generated data file")
+    parser.add_argument("--repeats", type=int, default=3,
+        help="number of times each import is timed")
+    args = parser.parse_args()
+
+    # Keep the pipeline logging out of the timings
+    logging.getLogger("forecasters_reference_book_logger").setLevel(
+        logging.ERROR
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = os.path.join(directory, "synthetic_data.csv")
+        store_directory = os.path.join(directory, "synthetic_data_store")
+        sd.write_synthetic_data_file(file, args.rows)
+
+        start_time = time.perf_counter()
+        die.ingest_csv_data_file(
+            file, store_directory, sd.DATA_COLUMNS, COLUMN_DTYPES, compact=True
+        )
+        print(f"one-time ingest: {time.perf_counter() - start_time:.3f} s")
+
+        imports = {
+            "typed .csv import": lambda: die.import_typed_csv_data_file(
+                file, sd.DATA_COLUMNS, COLUMN_DTYPES, compact=True
+            ),
+            "column store": lambda: die.import_column_store(
+                store_directory, sd.DATA_COLUMNS, compact=True
+            ),
+        }
+        print(f"{'import':<24}{'import (s)':>12}{'speed-up':>10}")
+        baseline_time = None
+        for name, import_function in imports.items():
+            import_time = time_import(import_function, args.repeats)
+            baseline_time = baseline_time or import_time
+            print(f"{name:<24}{import_time:>12.6f}"
+                f"{baseline_time / import_time:>10.0f}")
@@ -0,0 +1,114 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import argparse
+import logging
+import os
+import time
+
+# Third party modules
+import numpy as np
+
+# Custom modules
+import synthetic_data as sd
+import DataImportExport as die
+import ForecasterReferenceBook as frb
+import Pipeline as pl
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Configuration file of the reference data
+CONFIG_FILE_PATH = "data/forecasters_reference_book_config.yaml"
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def time_compute(
+    batch: dict,
+    coeff: list,
+    K_index: frb.KLookupIndex,
+    buffers: dict,
+    workers: int,
+    repeats: int
+):
+    """Best time of compute_tmin over a batch, best of repeats
+
+    Args:
+        batch (dict): arrays of the observation columns
+        coeff (list):
+            A list of three coefficients used in the linear calculation
+        K_index (frb.KLookupIndex): grid index of the K lookup table
+        buffers (dict): buffers from frb.allocate_tmin_buffers
+        workers (int): number of threads
+        repeats (int): number of times the computation is timed
+
+    Returns:
+        float: best compute time (s)
+    """
+    compute_times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        frb.compute_tmin(batch, coeff, K_index, out=buffers, workers=workers)
+        compute_times.append(time.perf_counter() - start_time)
+    return min(compute_times)
+
+# =============================================================================
+# Programme exectuion
+# =============================================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="scaling of compute_tmin from 1 to N threads"
+    )
+    parser.add_argument("--rows", type=int, default=10_000_000,
+        help="number of rows of the generated batch")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(),
+        help="largest number of threads, doubling from 1")
+    parser.add_argument("--repeats", type=int, default=3,
+        help="number of times each computation is timed")
+    args = parser.parse_args()
+
+    # Keep the pipeline logging out of the timings
+    logging.getLogger("forecasters_reference_book_logger").setLevel(
+        logging.ERROR
+    )
+
+    config_data = die.import_yaml_configuration_file(CONFIG_FILE_PATH)
+    coeff, K_index = pl.load_reference_data(config_data)
+    batch = sd.generate_synthetic_data(args.rows)
+    buffers = frb.allocate_tmin_buffers(args.rows, K_index.dtype)
+
+    # Results of one thread, each thread count must match them exactly
+    expected = frb.compute_tmin(batch, coeff, K_index)[
+        frb.TEMP_MIN_NOON_COLUMN
+    ]
+
+    worker_counts = []
+    workers = 1
+    while workers < args.max_workers:
+        worker_counts.append(workers)
+        workers *= 2
+    worker_counts.append(args.max_workers)
+
+    print(f"{args.rows:,} rows, {os.cpu_count()} CPUs")
+    print(f"{'threads':>8}{'compute (s)':>14}{'rows/s':>16}{'speed-up':>10}")
+    baseline_time = None
+    for workers in worker_counts:
+        compute_time = time_compute(
+            batch, coeff, K_index, buffers, workers, args.repeats
+        )
+        if not np.array_equal(
+            buffers[frb.TEMP_MIN_NOON_COLUMN], expected
+        ):
+            raise AssertionError(f"{workers} threads changed the results")
+        baseline_time = baseline_time or compute_time
+        print(f"{workers:>8}{compute_time:>14.3f}"
+            f"{args.rows / compute_time:>16,.0f}"
+            f"{baseline_time / compute_time:>10.2f}")
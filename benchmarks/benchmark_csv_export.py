@@ -0,0 +1,118 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+# Third party modules
+import pandas as pd
+
+# Custom modules
+import synthetic_data as sd
+import DataImportExport as die
+import Pipeline as pl
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Configuration file of the reference data
+CONFIG_FILE_PATH = "data/forecasters_reference_book_config.yaml"
+
+# Declared dtypes of the synthetic data columns
+COLUMN_DTYPES = {"Location": "int64", "Date": "int64"}
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def time_export(export_function, repeats: int):
+    """Best time of an export, best of repeats
+
+    Args:
+        export_function (callable): function exporting the data
+        repeats (int): number of times the export is timed
+
+    Returns:
+        float: best export time (s)
+    """
+    export_times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        export_function()
+        export_times.append(time.perf_counter() - start_time)
+    return min(export_times)
+
+
+def export_with_pandas(file: str, export_data: dict):
+    """Export the data through a DataFrame, as export_csv_data_file did"""
+    pd.DataFrame(die._get_export_columns(export_data)).to_csv(
+        file, index=False
+    )
+
+# =============================================================================
+# Programme exectuion
+# =============================================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="compare exporting the outputs with pandas' to_csv and" \
+            " with export_csv_data_file, uncompressed and gzip compressed"
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000,
+        help="number of rows of the generated data file")
+    parser.add_argument("--repeats", type=int, default=3,
+        help="number of times each export is timed")
+    args = parser.parse_args()
+
+    # Keep the pipeline logging out of the timings
+    logging.getLogger("forecasters_reference_book_logger").setLevel(
+        logging.ERROR
+    )
+
+    config_data = die.import_yaml_configuration_file(CONFIG_FILE_PATH)
+    coeff, K_index = pl.load_reference_data(config_data)
+
+    print(f"{'export':<26}{'export (s)':>10}{'rows/s':>16}{'speed-up':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        file = os.path.join(directory, "synthetic_data.csv")
+        sd.write_synthetic_data_file(file, args.rows)
+        export_data = pl.compute_reference_book(
+            die.import_typed_csv_data_file(
+                file, sd.DATA_COLUMNS, COLUMN_DTYPES, compact=True
+            ),
+            coeff,
+            K_index
+        )
+        columns = list(export_data.keys())
+        exports = {
+            "pandas to_csv": lambda output_file: export_with_pandas(
+                output_file, export_data
+            ),
+            "export_csv_data_file":
+                lambda output_file: die.export_csv_data_file(
+                    output_file, columns, export_data
+                ),
+            "export_csv_data_file, gz":
+                lambda output_file: die.export_csv_data_file(
+                    output_file + ".gz", columns, export_data
+                ),
+        }
+
+        baseline_time = None
+        output_file = os.path.join(directory, "outputs.csv")
+        for name, export_function in exports.items():
+            export_time = time_export(
+                lambda: export_function(output_file), args.repeats
+            )
+            baseline_time = baseline_time or export_time
+            print(f"{name:<26}{export_time:>10.3f}"
+                f"{args.rows / export_time:>16,.0f}"
+                f"{baseline_time / export_time:>10.2f}")
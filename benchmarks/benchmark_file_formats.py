@@ -0,0 +1,87 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+# Custom modules
+import synthetic_data as sd
+import DataImportExport as die
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Data file formats to compare, by file extension
+FILE_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def benchmark_file_format(file: str, columns: list, repeats: int):
+    """Time importing and exporting a data file, best of repeats
+
+    Args:
+        file (str): file path of the data file
+        columns (list): columns of the data file to import
+        repeats (int): number of times each operation is timed
+
+    Returns:
+        tuple: best import time (s) and best export time (s)
+    """
+    import_times = []
+    export_times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        imported_data = die.import_data_file(file, columns)
+        import_times.append(time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        die.export_data_file(file, columns, imported_data)
+        export_times.append(time.perf_counter() - start_time)
+    return min(import_times), min(export_times)
+
+
+# =============================================================================
+# Programme exectuion
+# =============================================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="compare .csv, Parquet and Arrow/Feather data files"
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000,
+        help="number of rows of the generated data file")
+    parser.add_argument("--repeats", type=int, default=3,
+        help="number of times each operation is timed")
+    args = parser.parse_args()
+
+    # Keep the pipeline logging out of the timings
+    logging.getLogger("forecasters_reference_book_logger").setLevel(
+        logging.ERROR
+    )
+
+    print(f"{'format':<10}{'size (MB)':>12}{'import (s)':>12}"
+        f"{'export (s)':>12}{'import rows/s':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        for file_format, extension in FILE_EXTENSIONS.items():
+            file = os.path.join(directory, "synthetic_data" + extension)
+            try:
+                sd.write_synthetic_data_file(file, args.rows)
+            except ImportError as ie:
+                print(f"{file_format:<10}skipped: {ie}")
+                continue
+            import_time, export_time = benchmark_file_format(
+                file, sd.DATA_COLUMNS, args.repeats
+            )
+            print(f"{file_format:<10}{os.path.getsize(file) / 1e6:>12.1f}"
+                f"{import_time:>12.3f}{export_time:>12.3f}"
+                f"{args.rows / import_time:>16,.0f}")
@@ -0,0 +1,106 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+# Custom modules
+import synthetic_data as sd
+import DataImportExport as die
+import Pipeline as pl
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Configuration file of the reference data
+CONFIG_FILE_PATH = "data/forecasters_reference_book_config.yaml"
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def append_rows(file: str, number_rows: int, seed: int):
+    """Append synthetic rows to a .csv data file, without its header
+
+    Args:
+        file (str): file path of the .csv data file
+        number_rows (int): number of rows to append
+        seed (int): seed of the random number generator
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        rows_file = os.path.join(directory, "rows.csv")
+        sd.write_synthetic_data_file(rows_file, number_rows, seed)
+        with open(rows_file, "rb") as f:
+            f.readline()
+            rows = f.read()
+    with open(file, "ab") as f:
+        f.write(rows)
+
+# =============================================================================
+# Programme exectuion
+# =============================================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="compare a full run with incremental runs over rows" \
+            " appended to a data file"
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000,
+        help="number of rows of the generated data file")
+    parser.add_argument("--appended-rows", type=int, default=20_000,
+        help="number of rows appended before each incremental run")
+    parser.add_argument("--appends", type=int, default=3,
+        help="number of appends")
+    args = parser.parse_args()
+
+    # Keep the pipeline logging out of the timings
+    logging.getLogger("forecasters_reference_book_logger").setLevel(
+        logging.ERROR
+    )
+
+    config_data = die.import_yaml_configuration_file(CONFIG_FILE_PATH)
+    coeff, K_index = pl.load_reference_data(config_data)
+    column_dtypes = {"Location": "int64", "Date": "int64"}
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = os.path.join(directory, "synthetic_data.csv")
+        output_file = os.path.join(directory, "synthetic_outputs.csv")
+        full_output_file = os.path.join(directory, "full_outputs.csv")
+        sd.write_synthetic_data_file(file, args.rows)
+
+        def run_incremental():
+            return pl.run_incremental(
+                file, sd.DATA_COLUMNS, output_file, coeff, K_index,
+                column_dtypes, compact_columns=True
+            )
+
+        print(f"{'run':<24}{'rows':>12}{'time (s)':>12}")
+        start_time = time.perf_counter()
+        number_rows = run_incremental()
+        print(f"{'first (full)':<24}{number_rows:>12,}" \
+            f"{time.perf_counter() - start_time:>12.3f}")
+        for append in range(args.appends):
+            append_rows(file, args.appended_rows, append + 1)
+            start_time = time.perf_counter()
+            number_rows = run_incremental()
+            print(f"{f'incremental {append + 1}':<24}{number_rows:>12,}" \
+                f"{time.perf_counter() - start_time:>12.3f}")
+
+        start_time = time.perf_counter()
+        number_rows = pl.run_in_memory(
+            file, sd.DATA_COLUMNS, full_output_file, coeff, K_index,
+            column_dtypes=column_dtypes, compact_columns=True
+        )
+        print(f"{'run_in_memory':<24}{number_rows:>12,}" \
+            f"{time.perf_counter() - start_time:>12.3f}")
+        with open(output_file, "rb") as f, open(full_output_file, "rb") as g:
+            if f.read() != g.read():
+                raise AssertionError("Incremental output differs")
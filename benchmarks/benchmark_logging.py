@@ -0,0 +1,85 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import argparse
+import io
+import logging
+import os
+import sys
+import timeit
+
+# Third party modules
+import numpy as np
+
+# Add 'src/' to sys.path to allow imports in benchmarks
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/"))
+)
+
+# Custom modules
+from custom_logger import ArraySummary
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def log_eager(logger: logging.Logger, K: np.ndarray):
+    """Debug log an array the way the pipeline did, with an f-string"""
+    logger.debug(f"K value found: {K}")
+
+
+def log_lazy(logger: logging.Logger, K: np.ndarray):
+    """Debug log an array lazily with a summary"""
+    logger.debug("K value found: %s", ArraySummary(K))
+
+
+def time_call(function, logger: logging.Logger, K: np.ndarray, repeats: int):
+    """Best time of one call of a logging function
+
+    Args:
+        function (callable): logging function to time
+        logger (logging.Logger): logger to log with
+        K (np.ndarray): array to log
+        repeats (int): number of times the call is timed
+
+    Returns:
+        float: best time of one call (s)
+    """
+    return min(timeit.repeat(
+        lambda: function(logger, K), number=1, repeat=repeats
+    ))
+
+
+# =============================================================================
+# Programme exectuion
+# =============================================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="overhead of debug logging arrays, before and after"
+    )
+    parser.add_argument("--rows", type=int, nargs="+",
+        default=[1_000, 100_000, 1_000_000],
+        help="sizes of the arrays logged")
+    parser.add_argument("--repeats", type=int, default=5,
+        help="number of times each call is timed")
+    args = parser.parse_args()
+
+    # Logger writing to memory, so only formatting costs are timed
+    logger = logging.getLogger("benchmark_logging")
+    logger.addHandler(logging.StreamHandler(io.StringIO()))
+    logger.propagate = False
+
+    print(f"{'rows':>12}{'level':>8}{'f-string (s)':>16}{'lazy (s)':>14}")
+    for rows in args.rows:
+        K = np.random.default_rng(0).uniform(-2.2, 2.8, rows)
+        for level in [logging.INFO, logging.DEBUG]:
+            logger.setLevel(level)
+            eager_time = time_call(log_eager, logger, K, args.repeats)
+            lazy_time = time_call(log_lazy, logger, K, args.repeats)
+            print(f"{rows:>12}{logging.getLevelName(level):>8}"
+                f"{eager_time:>16.6f}{lazy_time:>14.6f}")
@@ -0,0 +1,237 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import datetime
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+# Third party modules
+import numpy as np
+import pandas as pd
+
+# Custom modules
+import synthetic_data as sd
+import DataImportExport as die
+import ForecasterReferenceBook as frb
+import Instrumentation as instr
+import Pipeline as pl
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Configuration data for the reference book method
+CONFIG_FILE_PATH = "data/forecasters_reference_book_config.yaml"
+
+# Stages of the reference book method timed, in pipeline order
+STAGES = [
+    "import_csv_data_file",
+    "rounding",
+    "get_K_lookup",
+    "calculate_temperature_min_noon_celcius",
+    "export_csv_data_file",
+]
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def get_commit():
+    """Git commit of the working tree, None outside a git repository"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True
+        ).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_stages(data_file_path: str, output_file_path: str):
+    """Time each stage of the reference book method over a data file
+
+    Runs in its own worker process per data file, so the peak RSS is that of
+    the one data file.
+
+    Args:
+        data_file_path (str): file path of the .csv data file
+        output_file_path (str): file path of the .csv output file
+
+    Returns:
+        dict:
+            number of rows, seconds and rows per second of each stage and in
+            total, and the peak RSS (bytes)
+    """
+    # Keep the pipeline logging out of the timings
+    logging.getLogger("forecasters_reference_book_logger").setLevel(
+        logging.ERROR
+    )
+
+    config_data = die.import_yaml_configuration_file(CONFIG_FILE_PATH)
+    coeff, _ = pl.load_reference_data(config_data)
+    lookup_data = die.import_csv_data_file(
+        config_data["k_lookup"]["k_lookup_file_path"],
+        config_data["k_lookup"]["k_lookup_columns"]
+    )
+    data_columns = config_data["data"]["data_columns"]
+
+    seconds = {}
+    start_time = time.perf_counter()
+    imported_data = die.import_csv_data_file(data_file_path, data_columns)
+    seconds["import_csv_data_file"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for col in [pl.WIND_SPEED_COLUMN, pl.CLOUD_COVER_COLUMN]:
+        imported_data[col] = imported_data[col].round()
+    seconds["rounding"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    imported_data[pl.K_COLUMN] = frb.get_K_lookup(
+        imported_data[pl.WIND_SPEED_COLUMN],
+        lookup_data[pl.WIND_SPEED_MIN_COLUMN],
+        lookup_data[pl.WIND_SPEED_MAX_COLUMN],
+        imported_data[pl.CLOUD_COVER_COLUMN],
+        lookup_data[pl.CLOUD_COVER_MIN_COLUMN],
+        lookup_data[pl.CLOUD_COVER_MAX_COLUMN],
+        lookup_data[pl.K_COLUMN],
+    )
+    seconds["get_K_lookup"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    imported_data[pl.TEMP_MIN_NOON_COLUMN] = \
+        frb.calculate_temperature_min_noon_celcius(
+            imported_data[pl.TEMP_NOON_COLUMN],
+            imported_data[pl.TEMP_DEW_POINT_NOON_COLUMN],
+            imported_data[pl.K_COLUMN],
+            coeff
+        )
+    seconds["calculate_temperature_min_noon_celcius"] = \
+        time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    die.export_csv_data_file(
+        output_file_path, list(imported_data.keys()), imported_data
+    )
+    seconds["export_csv_data_file"] = time.perf_counter() - start_time
+
+    number_rows = len(imported_data[pl.K_COLUMN])
+    total_seconds = sum(seconds.values())
+    return {
+        "rows": number_rows,
+        "stages": {
+            stage: {
+                "seconds": seconds[stage],
+                "rows_per_second": number_rows / seconds[stage]
+                if seconds[stage] else None,
+            }
+            for stage in STAGES
+        },
+        "total_seconds": total_seconds,
+        "rows_per_second": number_rows / total_seconds
+        if total_seconds else None,
+        "peak_rss_bytes": instr.get_peak_rss(),
+    }
+
+
+def run_benchmarks(row_counts: list, data_directory: str, seed: int = 0):
+    """Benchmark the stages for synthetic data files of each row count
+
+    Data files are generated into data_directory as
+    synthetic_data_<rows>.csv and reused when they already exist.
+
+    Args:
+        row_counts (list): number of rows of each data file
+        data_directory (str): directory of the synthetic data files
+        seed (int): seed of the synthetic data
+
+    Returns:
+        dict: run metadata and the results of each row count
+    """
+    results = []
+    for number_rows in row_counts:
+        data_file_path = os.path.join(
+            data_directory, f"synthetic_data_{number_rows}.csv"
+        )
+        if not os.path.exists(data_file_path):
+            sd.write_synthetic_csv_data_file(data_file_path, number_rows, seed)
+        output_file_path = os.path.join(
+            data_directory, f"synthetic_outputs_{number_rows}.csv"
+        )
+
+        # A fresh worker per data file, so peak RSS is per data file
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results.append(executor.submit(
+                benchmark_stages, data_file_path, output_file_path
+            ).result())
+        os.remove(output_file_path)
+
+    return {
+        "commit": get_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+    }
+
+
+# =============================================================================
+# Programme exectuion
+# =============================================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="time each stage of the reference book method over" \
+            " synthetic data files"
+    )
+    parser.add_argument("--rows", type=float, nargs="+",
+        default=[1e3, 1e5, 1e6],
+        help="number of rows of each synthetic data file, 1e3 to 1e8")
+    parser.add_argument("--data-dir", type=str, default=None,
+        help="directory to keep and reuse the synthetic data files in," \
+            " a temporary directory if not given")
+    parser.add_argument("--seed", type=int, default=0,
+        help="seed of the synthetic data")
+    parser.add_argument("--output", type=str, default=None,
+        help="file path of the JSON results, printed if not given")
+    args = parser.parse_args()
+
+    row_counts = [int(rows) for rows in args.rows]
+    if args.data_dir is None:
+        with tempfile.TemporaryDirectory() as directory:
+            benchmark = run_benchmarks(row_counts, directory, args.seed)
+    else:
+        os.makedirs(args.data_dir, exist_ok=True)
+        benchmark = run_benchmarks(row_counts, args.data_dir, args.seed)
+
+    for result in benchmark["results"]:
+        print(
+            f"{result['rows']:>12} rows: {result['rows_per_second']:,.0f}" \
+            f" rows/s, peak RSS {result['peak_rss_bytes'] / 1e6:,.0f} MB",
+            file=sys.stderr
+        )
+    if args.output is None:
+        print(json.dumps(benchmark, indent=2))
+    else:
+        with open(args.output, "w") as file:
+            json.dump(benchmark, file, indent=2)
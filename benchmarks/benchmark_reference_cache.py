@@ -0,0 +1,86 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import argparse
+import copy
+import logging
+import os
+import sys
+import tempfile
+import time
+
+# Add 'src/' to sys.path to allow imports in benchmarks
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/"))
+)
+
+# Custom modules
+import DataImportExport as die
+import Pipeline as pl
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Configuration data for the reference book method
+CONFIG_FILE_PATH = "data/forecasters_reference_book_config.yaml"
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def time_loads(config_data: dict, number: int):
+    """Time loading the reference data once per data file of a batch
+
+    Args:
+        config_data (dict): dictonary of configuration data
+        number (int): number of data files, i.e. loads of the reference data
+
+    Returns:
+        float: total time of the loads (s)
+    """
+    start_time = time.perf_counter()
+    for _ in range(number):
+        pl.load_reference_data(config_data)
+    return time.perf_counter() - start_time
+
+
+# =============================================================================
+# Programme exectuion
+# =============================================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="start-up cost of loading the constants and K lookup for" \
+            " every data file of a batch, with and without the reference" \
+            " cache"
+    )
+    parser.add_argument("--files", type=int, default=1000,
+        help="number of data files in the batch")
+    args = parser.parse_args()
+
+    # Only time the loads, not the terminal and file logging
+    logging.disable(logging.WARNING)
+
+    config_data = die.import_yaml_configuration_file(CONFIG_FILE_PATH)
+    uncached_time = time_loads(config_data, args.files)
+
+    with tempfile.TemporaryDirectory() as cache_directory:
+        cached_config_data = copy.deepcopy(config_data)
+        cached_config_data["reference_cache"] = {
+            "cache_directory": cache_directory
+        }
+        # Fill the cache, as the first data file of a batch would
+        pl.load_reference_data(cached_config_data)
+        cached_time = time_loads(cached_config_data, args.files)
+
+    print(f"{'reference data':>16}{'total (s)':>12}{'per file (ms)':>16}")
+    for name, seconds in [("parsed", uncached_time), ("cached", cached_time)]:
+        print(
+            f"{name:>16}{seconds:>12.3f}{seconds / args.files * 1e3:>16.3f}"
+        )
+    print(f"speed-up: {uncached_time / cached_time:.1f}x")
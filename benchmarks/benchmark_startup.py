@@ -0,0 +1,114 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Command line of main.py timed, run from the root of the repository
+MAIN_COMMAND = ["src/main.py", "--help"]
+
+# Modules whose import is reported whether or not they are the slowest
+TRACKED_MODULES = ["numpy", "pandas", "yaml", "concurrent.futures.process"]
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def parse_importtime(stderr: str):
+    """Returns the cumulative import time of each module from -X importtime
+
+    Args:
+        stderr (str): standard error of python -X importtime
+
+    Returns:
+        dict: cumulative import time (s) of each top level import, keyed by
+            module name, in import order
+    """
+    import_times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        import_times[module.strip()] = int(cumulative) / 1e6
+    return import_times
+
+
+def time_startup(repeats: int):
+    """Time the start-up of main.py and the imports it makes
+
+    Args:
+        repeats (int): number of start-ups timed, the best is kept
+
+    Returns:
+        dict:
+            best wall time (s) of the start-up, and the import times of the
+            tracked and slowest modules of the best start-up
+    """
+    best_seconds = None
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime"] + MAIN_COMMAND,
+            capture_output=True,
+            check=True,
+            text=True
+        )
+        seconds = time.perf_counter() - start_time
+        if best_seconds is None or seconds < best_seconds:
+            best_seconds = seconds
+            import_times = parse_importtime(completed.stderr)
+
+    slowest = sorted(
+        import_times.items(), key=lambda item: item[1], reverse=True
+    )
+    return {
+        "command": " ".join(["python"] + MAIN_COMMAND),
+        "seconds": best_seconds,
+        "tracked_imports": {
+            module: import_times.get(module) for module in TRACKED_MODULES
+        },
+        "slowest_imports": dict(slowest[:10]),
+    }
+
+
+# =============================================================================
+# Programme exectuion
+# =============================================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="start-up time of main.py and of the modules it" \
+            " imports, with python -X importtime"
+    )
+    parser.add_argument("--repeats", type=int, default=5,
+        help="number of start-ups timed, the best is kept")
+    parser.add_argument("--output", type=str, default=None,
+        help="file path of the JSON results, printed if not given")
+    args = parser.parse_args()
+
+    # Run from the root of the repository, where main.py finds its data
+    os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    benchmark = time_startup(args.repeats)
+
+    print(f"start-up: {benchmark['seconds'] * 1e3:.1f} ms", file=sys.stderr)
+    for module, seconds in benchmark["tracked_imports"].items():
+        imported = "not imported" if seconds is None \
+            else f"{seconds * 1e3:.1f} ms"
+        print(f"{module:>28}: {imported}", file=sys.stderr)
+    if args.output is None:
+        print(json.dumps(benchmark, indent=2))
+    else:
+        with open(args.output, "w") as file:
+            json.dump(benchmark, file, indent=2)
@@ -0,0 +1,97 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import argparse
+import logging
+import os
+import sys
+import timeit
+
+# Third party modules
+import numpy as np
+
+# Add 'src/' to sys.path to allow imports in benchmarks
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/"))
+)
+
+# Custom modules
+import DataImportExport as die
+import ForecasterReferenceBook as frb
+import Pipeline as pl
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Configuration data for the reference book method
+CONFIG_FILE_PATH = "data/forecasters_reference_book_config.yaml"
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def tmin_array(coeff: list, K_index, observation: tuple):
+    """Calculate one observation with the array functions"""
+    T_12, Td_12, wind_speed, cloud_cover = (
+        np.array([value]) for value in observation
+    )
+    K = K_index.lookup(wind_speed.round(), cloud_cover.round())
+    return frb.calculate_temperature_min_noon_celcius(T_12, Td_12, K, coeff)
+
+
+def time_call(function, repeats: int, number: int):
+    """Best time of one call of a function
+
+    Args:
+        function (callable): function to time
+        repeats (int): number of times the calls are timed
+        number (int): number of calls per timing
+
+    Returns:
+        float: best time of one call (s)
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeats)) \
+        / number
+
+
+# =============================================================================
+# Programme exectuion
+# =============================================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="per call latency of single observations, array" \
+            " functions against ReferenceBook.tmin_single"
+    )
+    parser.add_argument("--number", type=int, default=10_000,
+        help="number of calls per timing")
+    parser.add_argument("--repeats", type=int, default=5,
+        help="number of times the calls are timed")
+    args = parser.parse_args()
+
+    # Only time the calculations, not the terminal and file logging
+    logging.disable(logging.INFO)
+
+    config_data = die.import_yaml_configuration_file(CONFIG_FILE_PATH)
+    coeff, K_index = pl.load_reference_data(config_data)
+    reference_book = frb.ReferenceBook(coeff, K_index)
+    observation = (22.4, 10.9, 14.56, 3.9)
+
+    array_time = time_call(
+        lambda: tmin_array(coeff, K_index, observation),
+        args.repeats,
+        max(args.number // 100, 1)
+    )
+    single_time = time_call(
+        lambda: reference_book.tmin_single(*observation),
+        args.repeats,
+        args.number
+    )
+    print(f"{'path':>14}{'latency (us)':>16}")
+    print(f"{'array':>14}{array_time * 1e6:>16.2f}")
+    print(f"{'tmin_single':>14}{single_time * 1e6:>16.2f}")
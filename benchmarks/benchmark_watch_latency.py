@@ -0,0 +1,105 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+# Custom modules
+import synthetic_data as sd
+import DirectoryWatcher as dw
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Configuration file of the reference data
+CONFIG_FILE_PATH = "data/forecasters_reference_book_config.yaml"
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def wait_for_file(file: str, timeout: float):
+    """Seconds until a file exists, polling every millisecond
+
+    Args:
+        file (str): file path waited for
+        timeout (float): seconds before giving up
+
+    Returns:
+        float: seconds waited
+    """
+    start_time = time.perf_counter()
+    while not os.path.exists(file):
+        if time.perf_counter() - start_time > timeout:
+            raise TimeoutError(f"{file} was not written in {timeout} s")
+        time.sleep(0.001)
+    return time.perf_counter() - start_time
+
+# =============================================================================
+# Programme exectuion
+# =============================================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="latency from a data file landing in a watched directory" \
+            " to its done marker"
+    )
+    parser.add_argument("--rows", type=int, default=10_000,
+        help="number of rows of each generated data file")
+    parser.add_argument("--files", type=int, default=10,
+        help="number of data files landed one after another")
+    parser.add_argument("--poll-interval", type=float,
+        default=dw.DEFAULT_POLL_INTERVAL,
+        help="seconds between scans of the watched directory")
+    args = parser.parse_args()
+
+    # Keep the pipeline logging out of the timings
+    logging.getLogger("forecasters_reference_book_logger").setLevel(
+        logging.ERROR
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        watch_directory = os.path.join(directory, "incoming")
+        output_directory = os.path.join(directory, "outputs")
+        os.makedirs(watch_directory)
+        watcher = dw.DirectoryWatcher(
+            CONFIG_FILE_PATH,
+            watch_directory,
+            output_directory,
+            args.poll_interval
+        )
+        stop_event = threading.Event()
+        thread = threading.Thread(target=watcher.run, args=(stop_event,))
+        thread.start()
+
+        latencies = []
+        try:
+            for number in range(args.files):
+                # Land each data file whole, as by a rename into place
+                staged_file = os.path.join(directory, f"station_{number}.csv")
+                sd.write_synthetic_data_file(staged_file, args.rows)
+                data_file_path = os.path.join(
+                    watch_directory, os.path.basename(staged_file)
+                )
+                os.replace(staged_file, data_file_path)
+                latencies.append(wait_for_file(
+                    watcher.get_done_marker_path(data_file_path), 60
+                ))
+        finally:
+            stop_event.set()
+            thread.join()
+
+    print(f"{args.files} files of {args.rows:,} rows, polled every" \
+        f" {args.poll_interval} s")
+    print(f"latency median {statistics.median(latencies):.3f} s," \
+        f" max {max(latencies):.3f} s")
@@ -0,0 +1,147 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import argparse
+import os
+import sys
+
+# Third party modules
+import numpy as np
+
+# Add 'src/' to sys.path to allow imports in benchmarks
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/"))
+)
+
+# Custom modules
+import DataImportExport as die
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Columns of a data file, as in data/initial_data.csv
+DATA_COLUMNS = [
+    "Temp. noon (celcius)",
+    "Temp. dew point noon (celcius)",
+    "Wind speed (knots)",
+    "Cloud cover (oktas)",
+    "Location",
+    "Date",
+]
+
+# Rows generated and written per block of a .csv data file, so files of up
+# to 1e8 rows are written in bounded memory
+GENERATE_BLOCK_SIZE = 1_000_000
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def generate_synthetic_data(number_rows: int, seed=0):
+    """Generate reproducible observations shaped like data/initial_data.csv
+
+    Args:
+        number_rows (int): number of observations to generate
+        seed (int or list): seed of the random number generator
+
+    Returns:
+        dict: 
+        Dictionary where keys are the data columns and values are NumPy 
+        arrays
+    """
+    rng = np.random.default_rng(seed)
+    T_12 = np.round(rng.uniform(-10.0, 35.0, number_rows), 1)
+    return {
+        "Temp. noon (celcius)": T_12,
+        "Temp. dew point noon (celcius)": np.round(
+            T_12 - rng.uniform(0.0, 15.0, number_rows), 1
+        ),
+        "Wind speed (knots)": np.round(rng.uniform(0.0, 51.0, number_rows), 2),
+        "Cloud cover (oktas)": np.round(rng.uniform(0.0, 8.0, number_rows), 1),
+        "Location": rng.integers(1, 500, number_rows),
+        "Date": rng.integers(1, 3650, number_rows),
+    }
+
+
+def write_synthetic_data_file(
+    file: str, 
+    number_rows: int, 
+    seed: int = 0, 
+    file_format: str = None
+):
+    """Write a reproducible synthetic data file
+
+    Args:
+        file (str): file path of the data file to write
+        number_rows (int): number of observations to generate
+        seed (int): seed of the random number generator
+        file_format (str): 
+            one of "csv", "parquet" or "feather", by file extension if not 
+            given
+    """
+    die.export_data_file(
+        file, 
+        DATA_COLUMNS, 
+        generate_synthetic_data(number_rows, seed), 
+        file_format
+    )
+
+
+def write_synthetic_csv_data_file(
+    file: str,
+    number_rows: int,
+    seed: int = 0,
+    block_size: int = GENERATE_BLOCK_SIZE
+):
+    """Write a reproducible synthetic .csv data file in blocks of rows
+
+    Each block is generated from its own seed derived from seed and the
+    block number, so the file depends on seed and block_size only and memory
+    is bounded by block_size.
+
+    Args:
+        file (str): file path of the .csv data file to write
+        number_rows (int): number of observations to generate
+        seed (int): seed of the random number generator
+        block_size (int): number of rows generated and written per block
+    """
+    for block_number, start in enumerate(
+        range(0, max(number_rows, 1), block_size)
+    ):
+        die.export_csv_data_file(
+            file,
+            DATA_COLUMNS,
+            generate_synthetic_data(
+                min(block_size, number_rows - start), [seed, block_number]
+            ),
+            append=block_number > 0
+        )
+
+
+# =============================================================================
+# Programme exectuion
+# =============================================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="write a reproducible synthetic data file shaped like" \
+            " data/initial_data.csv"
+    )
+    parser.add_argument("file", type=str,
+        help="file path of the .csv data file to write")
+    parser.add_argument("--rows", type=float, default=1e6,
+        help="number of rows to generate, 1e3 to 1e8")
+    parser.add_argument("--seed", type=int, default=0,
+        help="seed of the random number generator")
+    parser.add_argument("--block-size", type=int, default=GENERATE_BLOCK_SIZE,
+        help="number of rows generated and written per block")
+    args = parser.parse_args()
+
+    write_synthetic_csv_data_file(
+        args.file, int(args.rows), args.seed, args.block_size
+    )
@@ -0,0 +1,446 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+from concurrent.futures import as_completed, ProcessPoolExecutor
+import glob
+import os
+import time
+
+# Custom modules
+from custom_logger import get_custom_logger, get_log_queue, use_log_queue
+import DataImportExport as die
+import Instrumentation as instr
+import Pipeline as pl
+import ProgressJournal as pj
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Logging
+logger = get_custom_logger("data/logging_config.yaml")
+
+# Suffix of the output file of each data file in a batch
+OUTPUT_FILE_SUFFIX = "_outputs.csv"
+
+# Progress journal of the data files completed, in the output directory
+BATCH_JOURNAL_FILE = ".batch_journal.json"
+
+# Reference data held by each worker process, set by _initialise_worker
+_worker_coeff = None
+_worker_K_index = None
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def resolve_input_files(
+    input_glob: str = None,
+    manifest_file_path: str = None
+):
+    """Returns the data files of a batch from a glob pattern and/or manifest
+
+    Args:
+        input_glob (str): glob pattern matching the .csv data files
+        manifest_file_path (str):
+            file listing one .csv data file path per line, blank lines and
+            lines starting with # are ignored
+
+    Returns:
+        list: data file paths in sorted glob order then manifest order,
+            without duplicates
+
+    Raises:
+        FileNotFoundError: If the manifest file does not exist
+    """
+    input_files = []
+    if input_glob is not None:
+        input_files.extend(sorted(glob.glob(input_glob)))
+    if manifest_file_path is not None:
+        try:
+            with open(manifest_file_path, "r") as file:
+                for line in file:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        input_files.append(line)
+
+        except FileNotFoundError as fe:
+            logger.critical(
+                "FileNotFoundError: the batch manifest file" \
+                f" {manifest_file_path} does not exist: {fe}"
+            )
+            raise
+
+    # Remove repeated files, keeping the first occurrence
+    return list(dict.fromkeys(input_files))
+
+
+def get_output_file_path(
+    data_file_path: str, 
+    output_directory: str, 
+    compression: str = None
+):
+    """Returns the output file path of a data file in a batch
+
+    Args:
+        data_file_path (str): file path of the .csv data file
+        output_directory (str): directory the batch outputs are written to
+        compression (str): 
+            "gzip" or "zstd" compression of the output file, which adds its
+            file extension
+
+    Returns:
+        str: 
+            <output_directory>/<data file name>_outputs.csv, followed by .gz
+            or .zst if compressed
+    """
+    file_name = os.path.splitext(os.path.basename(data_file_path))[0]
+    for extension, extension_compression in die.COMPRESSION_EXTENSIONS.items():
+        if compression == extension_compression:
+            file_name += OUTPUT_FILE_SUFFIX + extension
+            break
+    else:
+        file_name += OUTPUT_FILE_SUFFIX
+    return os.path.join(output_directory, file_name)
+
+
+def _initialise_worker(
+    coeff: list,
+    K_index,
+    log_queue=None,
+    stage_metrics: bool = False
+):
+    """Hold the reference data in a worker process for all its data files
+
+    Args:
+        coeff (list):
+            A list of three coefficients used in the linear calculation
+        K_index (frb.KLookupIndex): grid index of the K lookup table
+        log_queue (multiprocessing.Queue): 
+            queue of the parent's log queue listener, if enabled
+        stage_metrics (bool): record stage metrics, as the parent does
+    """
+    global _worker_coeff, _worker_K_index
+    use_log_queue(log_queue)
+    instr.enable_stage_metrics(stage_metrics)
+    _worker_coeff = coeff
+    _worker_K_index = K_index
+
+
+def _process_data_file(
+    data_file_path: str,
+    data_columns: list,
+    output_file_path: str,
+    chunk_size: int = None,
+    column_dtypes: dict = None,
+    compact_columns: bool = False,
+    float_format: str = None,
+    compression: str = None,
+    compute_workers: int = None
+):
+    """Run the reference book method over one data file in a worker process
+
+    Errors are caught and reported in the returned summary so that one bad
+    data file does not stop the rest of the batch.
+
+    Args:
+        data_file_path (str): file path of the .csv data file
+        data_columns (list): columns of the .csv data file to import
+        output_file_path (str): file path of the .csv output file
+        chunk_size (int): stream the data file in batches of this many rows
+        column_dtypes (dict): dtype of each column of the .csv data file
+        compact_columns (bool): hold the Location and Date columns compactly
+        float_format (str): %-format of floating point output values
+        compression (str): "gzip" or "zstd" compression of the output file
+        compute_workers (int): number of threads computing the data file
+
+    Returns:
+        dict:
+            summary of the data file with keys file, output, success, 
+            resumed, rows, seconds, error and the stage metrics of the data
+            file
+    """
+    start_time = time.perf_counter()
+    instr.reset_stage_metrics()
+    summary = {
+        "file": data_file_path,
+        "output": output_file_path,
+        "success": False,
+        "resumed": False,
+        "rows": 0,
+        "seconds": 0.0,
+        "error": None,
+        "metrics": {},
+    }
+    try:
+        if chunk_size is None:
+            summary["rows"] = pl.run_in_memory(
+                data_file_path,
+                data_columns,
+                output_file_path,
+                _worker_coeff,
+                _worker_K_index,
+                column_dtypes=column_dtypes,
+                compact_columns=compact_columns,
+                output_float_format=float_format,
+                output_compression=compression,
+                compute_workers=compute_workers
+            )
+        else:
+            summary["rows"] = pl.run_chunked(
+                data_file_path,
+                data_columns,
+                output_file_path,
+                _worker_coeff,
+                _worker_K_index,
+                chunk_size,
+                column_dtypes,
+                compact_columns,
+                float_format,
+                compression,
+                compute_workers
+            )
+        summary["success"] = True
+
+    except Exception as e:
+        logger.error(f"Error: failed to process {data_file_path}: {e}")
+        summary["error"] = f"{type(e).__name__}: {e}"
+
+    summary["seconds"] = time.perf_counter() - start_time
+    summary["metrics"] = instr.get_stage_metrics()
+    return summary
+
+
+def run_batch(
+    config_data: dict,
+    input_files: list,
+    output_directory: str,
+    workers: int = None,
+    chunk_size: int = None
+):
+    """Run the reference book method over many data files in parallel
+
+    The constants and K lookup are imported once and handed to each worker
+    process when it starts, and the data files are then shared out across a
+    ProcessPoolExecutor, each written to its own output file.
+
+    Each data file completed is recorded in the progress journal 
+    BATCH_JOURNAL_FILE of the output directory, which is removed once every
+    data file has succeeded. Running a batch again with the same reference 
+    data and options resumes it, skipping the unchanged data files already
+    written.
+
+    Args:
+        config_data (dict): dictonary of configuration data
+        input_files (list): file paths of the .csv data files
+        output_directory (str): directory the outputs are written to
+        workers (int): number of worker processes, defaults to CPU count
+        chunk_size (int): stream each data file in batches of this many rows
+
+    Returns:
+        list: summary dictionary of each data file, in input_files order
+
+    Raises:
+        ValueError:
+            If data files of the same name in different directories would
+            be written to the same output file
+    """
+    compression = config_data["outputs"].get("output_compression")
+    output_file_paths = {
+        data_file_path: get_output_file_path(
+            data_file_path, output_directory, compression
+        )
+        for data_file_path in input_files
+    }
+    _check_output_file_paths(output_file_paths)
+
+    # Log function entry
+    logger.info(
+        f"Running batch of {len(input_files)} data files with" \
+        f" {workers or os.cpu_count()} workers..."
+    )
+    start_time = time.perf_counter()
+
+    # Import constants and K lookup once for all workers
+    coeff, K_index = pl.load_reference_data(config_data)
+
+    os.makedirs(output_directory, exist_ok=True)
+    data_columns = config_data["data"]["data_columns"]
+    column_dtypes = config_data["data"].get("data_column_dtypes")
+    compact_columns = config_data["data"].get("compact_columns", False)
+    float_format = config_data["outputs"].get("output_float_format")
+    compute_workers = config_data.get("compute_workers")
+    journal = pj.ProgressJournal(
+        os.path.join(output_directory, BATCH_JOURNAL_FILE),
+        {
+            "chunk_size": chunk_size,
+            "reference": pl.get_reference_digest(coeff, K_index),
+            "options": [
+                data_columns,
+                column_dtypes,
+                compact_columns,
+                float_format,
+                compression,
+            ],
+        }
+    )
+
+    # Skip the data files completed by an earlier run of the batch
+    summaries = {}
+    pending_files = []
+    for data_file_path, output_file_path in output_file_paths.items():
+        entry = journal.get(os.path.abspath(data_file_path))
+        if _is_completed(entry, data_file_path, output_file_path):
+            summaries[data_file_path] = _get_resumed_summary(
+                data_file_path, output_file_path, entry["rows"]
+            )
+        else:
+            pending_files.append((data_file_path, output_file_path))
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_initialise_worker,
+        initargs=(
+            coeff, K_index, get_log_queue(), instr.stage_metrics_enabled()
+        )
+    ) as executor:
+        futures = {
+            executor.submit(
+                _process_data_file,
+                data_file_path,
+                data_columns,
+                output_file_path,
+                chunk_size,
+                column_dtypes,
+                compact_columns,
+                float_format,
+                compression,
+                compute_workers
+            ): (data_file_path, pj.get_file_signature(data_file_path))
+            for data_file_path, output_file_path in pending_files
+        }
+        # Record each data file as it completes, in whatever order
+        for future in as_completed(futures):
+            summary = future.result()
+            data_file_path, signature = futures[future]
+            summaries[data_file_path] = summary
+            if summary["success"]:
+                journal.record(
+                    os.path.abspath(data_file_path),
+                    {
+                        "data_file": signature,
+                        "output": summary["output"],
+                        "rows": summary["rows"],
+                    }
+                )
+    summaries = [summaries[data_file_path] for data_file_path in input_files]
+    if all(summary["success"] for summary in summaries):
+        journal.remove()
+
+    # Collect the stage metrics of the workers
+    for summary in summaries:
+        instr.merge_stage_metrics(summary["metrics"])
+
+    log_batch_summary(summaries, time.perf_counter() - start_time)
+    return summaries
+
+
+def _check_output_file_paths(output_file_paths: dict):
+    """Raise a ValueError if data files share an output file
+
+    Args:
+        output_file_paths (dict): output file path of each data file
+
+    Raises:
+        ValueError: If two data files have the same output file path
+    """
+    data_files = {}
+    for data_file_path, output_file_path in output_file_paths.items():
+        data_files.setdefault(
+            os.path.abspath(output_file_path), []
+        ).append(data_file_path)
+    duplicates = {
+        output_file_path: files
+        for output_file_path, files in data_files.items()
+        if len(files) > 1
+    }
+    if duplicates:
+        logger.critical(
+            f"ValueError: data files would share an output file: {duplicates}"
+        )
+        raise ValueError(
+            "Data files of the same name would be written to the same" \
+            f" output file, rename them or run them as separate batches:" \
+            f" {duplicates}"
+        )
+
+
+def _is_completed(entry: dict, data_file_path: str, output_file_path: str):
+    """True if a journal entry records the data file as already written
+
+    Args:
+        entry (dict): journal entry of the data file, None if not recorded
+        data_file_path (str): file path of the .csv data file
+        output_file_path (str): file path of the .csv output file
+
+    Returns:
+        bool: 
+            True if the data file is unchanged since it was recorded and its
+            output file exists
+    """
+    return entry is not None \
+        and entry["data_file"] == pj.get_file_signature(data_file_path) \
+        and entry["output"] == output_file_path \
+        and os.path.exists(output_file_path)
+
+
+def _get_resumed_summary(
+    data_file_path: str, 
+    output_file_path: str, 
+    rows: int
+):
+    """Returns the summary of a data file written by an earlier run"""
+    return {
+        "file": data_file_path,
+        "output": output_file_path,
+        "success": True,
+        "resumed": True,
+        "rows": rows,
+        "seconds": 0.0,
+        "error": None,
+        "metrics": {},
+    }
+
+
+def log_batch_summary(summaries: list, seconds: float):
+    """Log the timing and success of each data file of a batch
+
+    Args:
+        summaries (list): summary dictionary of each data file
+        seconds (float): wall time of the whole batch
+    """
+    for summary in summaries:
+        if summary.get("resumed"):
+            logger.info(
+                f"{summary['file']}: resumed, {summary['rows']} rows written" \
+                f" by an earlier run -> {summary['output']}"
+            )
+        elif summary["success"]:
+            logger.info(
+                f"{summary['file']}: succeeded, {summary['rows']} rows in" \
+                f" {summary['seconds']:.3f} s -> {summary['output']}"
+            )
+        else:
+            logger.error(
+                f"{summary['file']}: failed in {summary['seconds']:.3f} s:" \
+                f" {summary['error']}"
+            )
+    number_succeeded = sum(summary["success"] for summary in summaries)
+    logger.info(
+        f"Ran batch of {len(summaries)} data files in {seconds:.3f} s:" \
+        f" {number_succeeded} succeeded," \
+        f" {len(summaries) - number_succeeded} failed"
+    )
@@ -3,14 +3,39 @@
 # =============================================================================
 
 # Python in built modules
+from concurrent.futures import ThreadPoolExecutor, wait
+import contextlib
+import functools
+import gzip
+import hashlib
+import importlib
+import importlib.util
+import io
+import itertools
+import json
 import os
+import shutil
+import tempfile
+import uuid
+from typing import TYPE_CHECKING
 
 # Third party modules
-import pandas as pd
+import numpy as np
 import yaml
 
+# pandas is imported on first use by _import_pandas, as it dominates the 
+# start-up time of runs that do not read or write .csv files
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Custom modules
-from custom_logger import get_custom_logger
+from custom_logger import ArraySummary, get_custom_logger
+from DataValidation import (
+    get_precision_dtype, 
+    REPORTED_ROWS, 
+    ValidationError
+)
+import Instrumentation as instr
 
 # =============================================================================
 # Variables
@@ -19,11 +44,195 @@ from custom_logger import get_custom_logger
 # Logging
 logger = get_custom_logger("data/logging_config.yaml")
 
+# Data file formats by file extension, any other extension is read as .csv
+FILE_FORMAT_EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+}
+FILE_FORMATS = ("csv", "parquet", "feather", "npy")
+
+# Manifest file of a column store directory of .npy files, whose directory
+# is read as the npy format, and the version of its layout
+COLUMN_STORE_MANIFEST = "manifest.json"
+COLUMN_STORE_VERSION = 1
+# Bytes reserved for the header of each .npy file of a column store, the
+# header of a 1-D array always fits
+NPY_HEADER_SIZE = 128
+# Most files imported at once by import_concurrently, reads of slow or 
+# network mounted disks overlap rather than follow one another
+IMPORT_THREADS = 8
+
+# Rows of a .csv data file read per batch when ingesting it
+INGEST_CHUNK_SIZE = 1 << 20
+
+# Column dtypes of typed .csv imports, columns without a declared dtype are
+# float64
+CSV_COLUMN_DTYPES = ("float32", "float64", "int32", "int64")
+DEFAULT_CSV_COLUMN_DTYPE = "float64"
+
+# Columns held compactly by encode_compact_columns
+LOCATION_COLUMN = "Location"
+DATE_COLUMN = "Date"
+# Dtype integer Date columns are narrowed to, values kept as they are
+COMPACT_DATE_DTYPE = np.int32
+
+# Rows of an exported .csv file formatted and written at a time, and bytes
+# buffered by the file
+EXPORT_BLOCK_ROWS = 1 << 16
+EXPORT_BUFFER_SIZE = 1 << 22
+
+# Suffix of the temporary files outputs are written to before being renamed
+TEMPORARY_SUFFIX = ".tmp"
+
+# Compressions of exported .csv files, and their file extensions
+COMPRESSIONS = ("gzip", "zstd")
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".zst": "zstd"}
+# zlib's default level, far faster than gzip's 9 for a slightly larger file
+GZIP_COMPRESSION_LEVEL = 6
+
+# Version of the reference cache file layout, part of the cache key so older
+# cache files are never read
+REFERENCE_CACHE_VERSION = 1
+# Bytes of the source file read at a time when hashing it
+HASH_BLOCK_SIZE = 1 << 20
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class DictionaryEncodedArray:
+    """Column of repeated values held as integer codes into its unique values
+
+    Station IDs repeat across the rows of a data file, so each is stored
+    once in categories, with a uint16 code per row, or uint32 for more than
+    65536 stations. Decodes to the original values exactly, with np.asarray
+    or decode.
+
+    Attributes:
+        codes (np.ndarray): index into categories of each row
+        categories (np.ndarray): sorted unique values of the column
+    """
+
+    def __init__(self, codes: np.ndarray, categories: np.ndarray):
+        """Hold the codes and categories of a column
+
+        Args:
+            codes (np.ndarray): index into categories of each row
+            categories (np.ndarray): sorted unique values of the column
+        """
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def encode(cls, values: np.ndarray):
+        """Returns the values dictionary encoded
+
+        Args:
+            values (np.ndarray): values of the column
+
+        Returns:
+            DictionaryEncodedArray: the encoded column
+        """
+        categories, codes = np.unique(values, return_inverse=True)
+        codes_dtype = np.uint16 if len(categories) <= 1 << 16 else np.uint32
+        return cls(codes.astype(codes_dtype).ravel(), categories)
+
+    @property
+    def dtype(self):
+        """dtype of the decoded values"""
+        return self.categories.dtype
+
+    @property
+    def nbytes(self):
+        """Bytes held by the codes and categories"""
+        return self.codes.nbytes + self.categories.nbytes
+
+    def __len__(self):
+        """Number of rows"""
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        """Rows of the column, encoded against the same categories"""
+        return DictionaryEncodedArray(self.codes[index], self.categories)
+
+    def __array__(self, dtype=None, copy=None):
+        """Decoded values, for np.asarray"""
+        values = self.decode()
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    def __repr__(self):
+        """Summary of the encoding"""
+        return (
+            f"DictionaryEncodedArray(rows={len(self)}," \
+            f" categories={len(self.categories)}," \
+            f" codes_dtype={self.codes.dtype})"
+        )
+
+    def decode(self):
+        """Returns the values of the column
+
+        Returns:
+            np.ndarray: values of each row, equal to those encoded
+        """
+        return self.categories.take(self.codes)
+
+    def to_pandas(self):
+        """Returns the column as a pandas Categorical without decoding it"""
+        return _import_pandas().Categorical.from_codes(
+            self.codes, self.categories
+        )
+
+class _FileRange(io.RawIOBase):
+    """Readable header and byte range of an open binary file, read in place
+
+    Lets a parser read the header of a file followed by its rows from an
+    offset up to an end offset, without the bytes of the rows being copied
+    into memory first.
+    """
+
+    def __init__(self, header: bytes, f, size: int):
+        """Read a header, then size bytes on from the position of a file
+
+        Args:
+            header (bytes): header line read first
+            f (io.BufferedReader): binary file positioned at the range
+            size (int): number of bytes of the range
+        """
+        super().__init__()
+        self._header = memoryview(header)
+        self._file = f
+        self._remaining = size
+
+    def readable(self):
+        """The range is readable"""
+        return True
+
+    def readinto(self, buffer):
+        """Read the next bytes of the header, then the range, into a buffer"""
+        buffer = memoryview(buffer).cast("B")
+        if len(self._header):
+            size = min(len(buffer), len(self._header))
+            buffer[:size] = self._header[:size]
+            self._header = self._header[size:]
+            return size
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        number_bytes = self._file.readinto(buffer[:size])
+        self._remaining -= number_bytes
+        return number_bytes
+
 # =============================================================================
 # Functions
 # =============================================================================
 
 
+@instr.instrument()
 def import_yaml_configuration_file(yaml_configuration_file_path: str):
     """import data in yaml file into configuration data dictonary
 
@@ -47,7 +256,7 @@ def import_yaml_configuration_file(yaml_configuration_file_path: str):
         # load configuration data from YAML file
         with open(yaml_configuration_file_path, "r") as file:
             config_data = yaml.safe_load(file)
-        logger.debug(f"Imported YAML configuration data: {config_data}")
+        logger.debug("Imported YAML configuration data: %s", config_data)
         logger.info(
             f"Read YAML configuration from {yaml_configuration_file_path}"
         )
@@ -75,13 +284,25 @@ def import_yaml_configuration_file(yaml_configuration_file_path: str):
             ) from e
 
 
-def import_csv_data_file(file: str, columns: list):
+@instr.instrument()
+def import_csv_data_file(
+    file: str,
+    columns: list,
+    precision: str = None,
+    compact: bool = False
+):
     """Returns columns from .csv file selected as a dictionary of the data
 
     Args:
         file (str): file path for relevant .csv file to import data from
         columns (list): 
             list of columns names contained in relevant .csv file to import
+        precision (str): 
+            "float32" or "float64" to cast the floating point columns to,
+            left as parsed if not given
+        compact (bool): 
+            hold the Location and Date columns compactly, see 
+            encode_compact_columns
 
     Returns:
         dict: 
@@ -97,29 +318,30 @@ def import_csv_data_file(file: str, columns: list):
 
     try:
         # Read the CSV file into a DataFrame
+        pd = _import_pandas()
         df = pd.read_csv(file)
         # Remove rows with any NaNs in import
+        number_rows = len(df)
         df = df.dropna()
+        instr.add_stage_counters(
+            rows_in=number_rows, nan_rows_removed=number_rows - len(df)
+        )
 
         # Ensure all specified columns exist
         missing_columns = [col for col in columns if col not in df.columns]
         if missing_columns:
             raise KeyError(f"Missing columns in .csv file: {missing_columns}")
 
-        # Initialise dictionary to store imported data
-        imported_data = {}
-        # Convert relevant columns to numeric and store them in the dictionary
-        for col in columns:
-            numeric_data = pd.to_numeric(df[col], errors="coerce")
-            # Check if numeric conversion introduced NaN values
-            if numeric_data.isnull().values.any():
-                raise ValueError(
-                        f"Column {col} contains non-numeric values" \
-                        " that could not be converted"
-                    )
-            imported_data[col] = numeric_data.to_numpy()
+        # Convert relevant columns to numeric and store them in a dictionary
+        imported_data = _apply_precision(
+            _convert_columns_to_numeric(df, columns), precision
+        )
+        if compact:
+            imported_data = encode_compact_columns(imported_data)
 
-        logger.debug(f"Imported data from {file}: {imported_data}")
+        logger.debug(
+            "Imported data from %s: %s", file, ArraySummary(imported_data)
+        )
         logger.info(f"Imported data from {file}")
         return imported_data
 
@@ -134,10 +356,7 @@ def import_csv_data_file(file: str, columns: list):
         raise
 
     except ValueError as ve:
-        logger.critical(
-            f"ValueError: Column {col} contains non-numeric" \
-            f" values that could not be converted: {ve}"
-        )
+        logger.critical(f"ValueError: {ve}")
         raise
 
     except Exception as e:
@@ -148,50 +367,1862 @@ def import_csv_data_file(file: str, columns: list):
         ) from e
 
 
-def export_csv_data_file(file: str, columns: list, export_data: dict):
-    """Exports data in a dictionary to a .csv file
+@instr.instrument()
+def import_cached_csv_data_file(
+    file: str,
+    columns: list,
+    cache_directory: str = None
+):
+    """Returns columns from a .csv file, using a cache of the parsed arrays
+
+    The parsed arrays are kept in a .npz file in cache_directory named by a
+    hash of the file contents and the columns, so the cache is invalidated
+    whenever the file changes and shared by every run and batch worker
+    reading the same file. Hashing a file is much cheaper than parsing it
+    with pandas, which is only done on a cache miss.
 
     Args:
         file (str): file path for relevant .csv file to import data from
-        columns (list): columns that will be exported to .csv file
-        export_data (dict): 
-            dictionary of keys as columns for .csv and values of data to be
-            printed to .csv file
+        columns (list): 
+            list of columns names contained in relevant .csv file to import
+        cache_directory (str): 
+            directory of the cache files, the file is imported without a 
+            cache if not given
+
+    Returns:
+        dict: 
+        Dictionary where keys are column names and values are NumPy arrays
+
     Raises:
-        PermissionError: 
-            incorrect permission to access file to create/overwrite
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file contains missing values
+        KeyError: If any specified column is not found in the .csv
     """
-    # Check columns to be exported are the same as the expected columns
-    assert sorted(columns) == sorted(export_data.keys()), (
-        f"Expected columns for export: {columns}\nColumns for export: " \
-        "{list(export_data.keys())}"
+    if cache_directory is None:
+        return import_csv_data_file(file, columns)
+
+    try:
+        cache_file = get_cache_file_path(file, columns, cache_directory)
+
+    except FileNotFoundError as fe:
+        logger.critical(
+            f"FileNotFoundError: the .csv {file} does not exist: {fe}"
+        )
+        raise
+
+    imported_data = _read_cache_file(cache_file, columns)
+    if imported_data is not None:
+        logger.info(f"Imported data from {file} cached in {cache_file}")
+        return imported_data
+
+    imported_data = import_csv_data_file(file, columns)
+    _write_cache_file(cache_file, columns, imported_data)
+    return imported_data
+
+
+def get_cache_file_path(file: str, columns: list, cache_directory: str):
+    """Returns the cache file path of the columns of a data file
+
+    Args:
+        file (str): file path of the data file
+        columns (list): columns of the data file imported
+        cache_directory (str): directory of the cache files
+
+    Returns:
+        str: 
+            <cache_directory>/<data file name>-<content hash>.npz, the hash
+            covering the file contents, columns and cache version
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    file_hash = hashlib.sha256()
+    with open(file, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            file_hash.update(block)
+    file_hash.update(repr((columns, REFERENCE_CACHE_VERSION)).encode())
+    file_name = os.path.splitext(os.path.basename(file))[0]
+    return os.path.join(
+        cache_directory, f"{file_name}-{file_hash.hexdigest()[:32]}.npz"
     )
 
-    # Check data is not empty before exporting
-    assert export_data, "DataFrame is empty, cannot export."
 
+def _read_cache_file(cache_file: str, columns: list):
+    """Returns the arrays of a cache file, None if missing or unreadable
+
+    Args:
+        cache_file (str): file path of the cache file
+        columns (list): columns the cache file holds, in order
+
+    Returns:
+        dict: 
+        Dictionary where keys are column names and values are NumPy arrays,
+        or None
+    """
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with np.load(cache_file, allow_pickle=False) as cached_data:
+            return {
+                col: cached_data[f"arr_{i}"] for i, col in enumerate(columns)
+            }
+
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache file {cache_file}: {e}")
+        return None
+
+
+def _write_cache_file(cache_file: str, columns: list, imported_data: dict):
+    """Writes the arrays of imported columns to a cache file
+
+    The arrays are written to a temporary file then renamed, so concurrent
+    runs never read a partly written cache file. Failing to write the cache
+    is logged and otherwise ignored.
+
+    Args:
+        cache_file (str): file path of the cache file
+        columns (list): columns to store, in order
+        imported_data (dict): 
+            Dictionary where keys are column names and values are NumPy 
+            arrays
+    """
+    temporary_file = None
+    try:
+        cache_directory = os.path.dirname(cache_file)
+        os.makedirs(cache_directory or ".", exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=cache_directory or ".", suffix=".npz", delete=False
+        ) as f:
+            temporary_file = f.name
+            np.savez(f, *(imported_data[col] for col in columns))
+        os.replace(temporary_file, cache_file)
+        logger.info(f"Cached imported data in {cache_file}")
+
+    except Exception as e:
+        logger.warning(f"Unable to write cache file {cache_file}: {e}")
+        if temporary_file is not None and os.path.exists(temporary_file):
+            os.remove(temporary_file)
+
+
+@instr.instrument()
+def import_typed_csv_data_file(
+    file: str,
+    columns: list,
+    column_dtypes: dict = None,
+    engine: str = None,
+    precision: str = None,
+    compact: bool = False
+):
+    """Returns columns from .csv file parsed straight to declared dtypes
+
+    Only the selected columns are parsed, each straight to its declared 
+    dtype, with the pyarrow CSV engine if pyarrow is installed, so 
+    non-numeric values are found by the parser rather than by a conversion
+    afterwards. Rows with missing values in the selected columns are
+    removed. Integer columns are parsed as float64, so missing values can be
+    removed, then cast to their integer dtype.
+
+    Args:
+        file (str): file path for relevant .csv file to import data from
+        columns (list): 
+            list of columns names contained in relevant .csv file to import
+        column_dtypes (dict): 
+            dtype of each column, one of CSV_COLUMN_DTYPES, float64 for 
+            columns not given
+        engine (str): 
+            pandas CSV engine, "pyarrow" if installed and "c" otherwise if 
+            not given
+        precision (str): 
+            "float32" or "float64" to parse the floating point columns to
+            in place of their declared dtypes
+        compact (bool): 
+            hold the Location and Date columns compactly, see 
+            encode_compact_columns
+
+    Returns:
+        dict: 
+        Dictionary where keys are column names and values are NumPy arrays
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: 
+            If the file contains non-numeric values, non-integer values in
+            an integer column, or a dtype is not supported
+        KeyError: If any specified column is not found in the .csv
+    """
     # Log function entry
-    logger.info(f"Exporting data to {file}...")
+    logger.info(f"Importing data from {file}...")
 
     try:
-        # Write data to file, overwrite if it exists
-        if os.path.exists(file):
-            logger.warning(
-                f"The .csv file {file} already exists and will be overwritten"
+        pd = _import_pandas()
+        column_dtypes = get_csv_column_dtypes(
+            columns, column_dtypes, precision
+        )
+        _check_csv_columns(file, columns)
+
+        # Parse only the selected columns, straight to numbers
+        df = pd.read_csv(
+            file,
+            usecols=columns,
+            dtype=_get_parse_dtypes(column_dtypes),
+            engine=engine or _get_csv_engine()
+        )
+        # Remove rows with any NaNs in import
+        number_rows = len(df)
+        df = df.dropna()
+        instr.add_stage_counters(
+            rows_in=number_rows, nan_rows_removed=number_rows - len(df)
+        )
+        imported_data = _cast_columns(df, columns, column_dtypes)
+        if compact:
+            imported_data = encode_compact_columns(imported_data)
+
+        logger.debug(
+            "Imported data from %s: %s", file, ArraySummary(imported_data)
+        )
+        logger.info(f"Imported data from {file}")
+        return imported_data
+
+    except FileNotFoundError as fe:
+        logger.critical(
+            f"FileNotFoundError: the .csv {file} does not exist: {fe}"
+        )
+        raise
+
+    except KeyError as ke:
+        logger.critical(f"KeyError: {ke}")
+        raise
+
+    except ValueError as ve:
+        logger.critical(f"ValueError: {ve}")
+        raise ValueError(f"Unable to parse {file}: {ve}") from ve
+
+    except Exception as e:
+        logger.error(f"Error: unexpected error occurred: {e}")
+        raise RuntimeError(
+            f"RuntimeError: unexpected error occurred in" \
+            f" import_typed_csv_data_file: {e}"
+        ) from e
+
+
+@instr.instrument()
+def import_csv_data_file_tail(
+    file: str,
+    columns: list,
+    offset: int = 0,
+    column_dtypes: dict = None,
+    precision: str = None,
+    compact: bool = False,
+    complete_lines: bool = True
+):
+    """Returns columns from the rows of a .csv file after a byte offset
+
+    Only the lines from offset are read and parsed, with the header of the
+    file, so the rows appended to a file since an earlier import are read
+    without reading the rest again. With complete_lines, a last line without
+    a newline, which may still be being written, is left for a later 
+    import. From offset 0 the whole file is imported, as by 
+    import_csv_data_file, or by import_typed_csv_data_file if column_dtypes
+    is given.
+
+    Args:
+        file (str): file path for relevant .csv file to import data from
+        columns (list): 
+            list of columns names contained in relevant .csv file to import
+        offset (int): 
+            byte offset of the first row to import, the end offset of an 
+            earlier import, or 0 for the whole file
+        column_dtypes (dict): 
+            dtype of each column, one of CSV_COLUMN_DTYPES, parsed as by
+            import_csv_data_file if not given
+        precision (str): 
+            "float32" or "float64" for the floating point columns
+        compact (bool): 
+            hold the Location and Date columns compactly, see 
+            encode_compact_columns
+        complete_lines (bool): 
+            import up to the last newline only, rather than to the end of
+            the file
+
+    Returns:
+        tuple:
+            Dictionary where keys are column names and values are NumPy 
+            arrays, and the byte offset of the end of the last line imported
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: 
+            If the file contains non-numeric values, or non-integer values 
+            in an integer column
+        KeyError: If any specified column is not found in the .csv
+    """
+    # Log function entry
+    logger.info(f"Importing data from {file} from byte {offset}...")
+
+    try:
+        pd = _import_pandas()
+        with open(file, "rb") as f:
+            header = f.readline()
+            start_offset = max(offset, len(header))
+            end_offset = os.fstat(f.fileno()).st_size
+            # Leave a last line still being written for a later import
+            if complete_lines:
+                end_offset = _find_line_end(f, start_offset, end_offset)
+            header_columns = pd.read_csv(io.BytesIO(header), nrows=0).columns
+            missing_columns = [
+                col for col in columns if col not in header_columns
+            ]
+            # Ensure all specified columns exist
+            if missing_columns:
+                raise KeyError(
+                    f"Missing columns in .csv file: {missing_columns}"
+                )
+
+            # Parse the header and rows in place from the file
+            end_offset = max(end_offset, start_offset)
+            f.seek(start_offset)
+            source = io.BufferedReader(
+                _FileRange(header, f, end_offset - start_offset)
             )
-        output_df = pd.DataFrame(export_data)
-        output_df.to_csv(file, index=False)
-        logger.info(f"Exported data to {file}")
+            if column_dtypes is None:
+                df = pd.read_csv(source)
+            else:
+                column_dtypes = get_csv_column_dtypes(
+                    columns, column_dtypes, precision
+                )
+                df = pd.read_csv(
+                    source,
+                    usecols=columns,
+                    dtype=_get_parse_dtypes(column_dtypes),
+                    engine=_get_csv_engine()
+                )
 
-    except PermissionError as pe:
+        # Remove rows with any NaNs in import
+        number_rows = len(df)
+        df = df.dropna()
+        instr.add_stage_counters(
+            rows_in=number_rows, nan_rows_removed=number_rows - len(df)
+        )
+        if column_dtypes is None:
+            imported_data = _apply_precision(
+                _convert_columns_to_numeric(df, columns), precision
+            )
+        else:
+            imported_data = _cast_columns(df, columns, column_dtypes)
+        if compact:
+            imported_data = encode_compact_columns(imported_data)
+
+        logger.debug(
+            "Imported data from %s: %s", file, ArraySummary(imported_data)
+        )
+        logger.info(
+            f"Imported data from {file} from byte {offset} to {end_offset}"
+        )
+        return imported_data, end_offset
+
+    except FileNotFoundError as fe:
         logger.critical(
-            f"PermissionError: permission denied when accessing the file: {pe}"
+            f"FileNotFoundError: the .csv {file} does not exist: {fe}"
         )
         raise
 
+    except KeyError as ke:
+        logger.critical(f"KeyError: {ke}")
+        raise
+
+    except ValueError as ve:
+        logger.critical(f"ValueError: {ve}")
+        raise ValueError(f"Unable to parse {file}: {ve}") from ve
+
     except Exception as e:
         logger.error(f"Error: unexpected error occurred: {e}")
         raise RuntimeError(
             f"RuntimeError: unexpected error occurred in" \
-            f" export_csv_data_file: {e}"
+            f" import_csv_data_file_tail: {e}"
+        ) from e
+
+
+def get_csv_column_dtypes(
+    columns: list,
+    column_dtypes: dict = None,
+    precision: str = None
+):
+    """Returns the dtype of each column of a typed .csv import
+
+    Args:
+        columns (list): columns of the .csv file imported
+        column_dtypes (dict): 
+            declared dtype of the columns, e.g. from the configuration
+        precision (str): 
+            "float32" or "float64" for the floating point columns, in place
+            of their declared dtypes
+
+    Returns:
+        dict: dtype of each column, float64 for columns not declared
+
+    Raises:
+        ValueError: If a dtype is not one of CSV_COLUMN_DTYPES
+    """
+    column_dtypes = column_dtypes or {}
+    dtypes = {
+        col: column_dtypes.get(col, DEFAULT_CSV_COLUMN_DTYPE)
+        for col in columns
+    }
+    unsupported_dtypes = {
+        col: dtype for col, dtype in dtypes.items()
+        if dtype not in CSV_COLUMN_DTYPES
+    }
+    if unsupported_dtypes:
+        raise ValueError(
+            f"Unsupported column dtypes {unsupported_dtypes}, expected one" \
+            f" of {CSV_COLUMN_DTYPES}"
+        )
+    if precision is not None:
+        float_dtype = get_precision_dtype(precision).name
+        dtypes = {
+            col: float_dtype if dtype.startswith("float") else dtype
+            for col, dtype in dtypes.items()
+        }
+    return dtypes
+
+
+def _find_line_end(f, start_offset: int, end_offset: int):
+    """Returns the offset after the last newline of a byte range of a file
+
+    The range is searched backwards from its end a block at a time, so only
+    the bytes of the last line are read.
+
+    Args:
+        f (io.BufferedReader): binary file to search
+        start_offset (int): byte offset of the start of the range
+        end_offset (int): byte offset of the end of the range
+
+    Returns:
+        int: offset after the last newline, start_offset if there is none
+    """
+    block_end = end_offset
+    while block_end > start_offset:
+        block_start = max(block_end - HASH_BLOCK_SIZE, start_offset)
+        f.seek(block_start)
+        newline = f.read(block_end - block_start).rfind(b"\n")
+        if newline >= 0:
+            return block_start + newline + 1
+        block_end = block_start
+    return start_offset
+
+
+def _check_csv_columns(file: str, columns: list):
+    """Check the header of a .csv file holds the columns
+
+    Args:
+        file (str): file path of the .csv file
+        columns (list): columns the .csv file should hold
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        KeyError: If any specified column is not found in the .csv
+    """
+    header = _import_pandas().read_csv(file, nrows=0).columns
+    missing_columns = [col for col in columns if col not in header]
+    if missing_columns:
+        raise KeyError(f"Missing columns in .csv file: {missing_columns}")
+
+
+def _get_parse_dtypes(column_dtypes: dict):
+    """Returns the dtypes columns are parsed to, float64 for integer dtypes"""
+    return {
+        col: dtype if dtype.startswith("float") else "float64"
+        for col, dtype in column_dtypes.items()
+    }
+
+
+def _get_csv_engine():
+    """Returns the pyarrow CSV engine if pyarrow is installed, else C"""
+    return "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+
+
+def _cast_columns(df: "pd.DataFrame", columns: list, column_dtypes: dict):
+    """Returns parsed columns of a DataFrame cast to their dtypes
+
+    Args:
+        df (pd.DataFrame): DataFrame of parsed columns without missing values
+        columns (list): list of columns names to cast
+        column_dtypes (dict): dtype of each column
+
+    Returns:
+        dict: 
+        Dictionary where keys are column names and values are NumPy arrays
+
+    Raises:
+        ValueError: If an integer column holds values that are not integers
+    """
+    imported_data = {}
+    for col in columns:
+        data = df[col].to_numpy()
+        if not column_dtypes[col].startswith("float"):
+            non_integer_rows = df.index[data != np.trunc(data)].tolist()
+            if non_integer_rows:
+                more_rows = len(non_integer_rows) > REPORTED_ROWS
+                raise ValueError(
+                    f"Column {col} of dtype {column_dtypes[col]} contains" \
+                    " non-integer values, in rows" \
+                    f" {non_integer_rows[:REPORTED_ROWS]}" \
+                    f"{' ...' if more_rows else ''}"
+                )
+        imported_data[col] = data.astype(column_dtypes[col], copy=False)
+    return imported_data
+
+
+def import_data_file(
+    file: str,
+    columns: list,
+    file_format: str = None,
+    column_dtypes: dict = None,
+    precision: str = None,
+    compact: bool = False
+):
+    """Returns columns from a data file as a dictionary of the data
+
+    The file format is file_format if given, e.g. from the configuration, and
+    otherwise chosen by file extension, defaulting to .csv. Parquet and 
+    Arrow/Feather files need pyarrow, and only the selected columns are read
+    from disk. .csv files are parsed straight to column_dtypes if given, see
+    import_typed_csv_data_file. Column store directories are memory mapped,
+    see import_column_store.
+
+    Args:
+        file (str): file path for relevant data file to import data from
+        columns (list): 
+            list of columns names contained in relevant data file to import
+        file_format (str): one of "csv", "parquet", "feather" or "npy"
+        column_dtypes (dict): dtype of each column of a .csv file
+        precision (str): 
+            "float32" or "float64" for the floating point columns, left as
+            imported if not given
+        compact (bool): 
+            hold the Location and Date columns compactly, see 
+            encode_compact_columns
+
+    Returns:
+        dict: 
+        Dictionary where keys are column names and values are NumPy arrays
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file contains non-numeric values, or the format
+            is not supported
+        KeyError: If any specified column is not found in the file
+        ImportError: If pyarrow is needed for the format but not installed
+    """
+    file_format = get_file_format(file, file_format)
+    if file_format == "npy":
+        return import_column_store(file, columns, precision, compact)
+    if file_format == "csv" and column_dtypes is not None:
+        return import_typed_csv_data_file(
+            file, columns, column_dtypes, precision=precision, compact=compact
+        )
+    if file_format == "csv":
+        return import_csv_data_file(file, columns, precision, compact)
+    imported_data = _apply_precision(
+        import_columnar_data_file(file, columns, file_format), precision
+    )
+    return encode_compact_columns(imported_data) if compact \
+        else imported_data
+
+
+def import_data_files(
+    files: str | list,
+    columns: list,
+    file_format: str = None,
+    column_dtypes: dict = None,
+    precision: str = None,
+    compact: bool = False
+):
+    """Returns columns from one data file, or several concatenated in order
+
+    Several data files are imported concurrently, see import_concurrently,
+    each as by import_data_file, and their columns are concatenated in the
+    order of files. The Location and Date columns are then held compactly
+    over the concatenated rows, so a Location dictionary spans all the
+    files.
+
+    Args:
+        files (str | list): file path, or file paths, of the data files
+        columns (list): 
+            list of columns names contained in every data file to import
+        file_format (str): one of "csv", "parquet", "feather" or "npy"
+        column_dtypes (dict): dtype of each column of a .csv file
+        precision (str): 
+            "float32" or "float64" for the floating point columns, left as
+            imported if not given
+        compact (bool): 
+            hold the Location and Date columns compactly, see 
+            encode_compact_columns
+
+    Returns:
+        dict: 
+        Dictionary where keys are column names and values are NumPy arrays
+
+    Raises:
+        ValueError: If files is an empty list, and as import_data_file
+        FileNotFoundError, KeyError, ImportError: As import_data_file
+    """
+    if isinstance(files, (str, os.PathLike)):
+        return import_data_file(
+            files, columns, file_format, column_dtypes, precision, compact
+        )
+    files = list(files)
+    if not files:
+        raise ValueError("No data files to import")
+    if len(files) == 1:
+        return import_data_file(
+            files[0], columns, file_format, column_dtypes, precision, compact
+        )
+
+    imported_files = import_concurrently([
+        functools.partial(
+            import_data_file,
+            file,
+            columns,
+            file_format,
+            column_dtypes,
+            precision
+        )
+        for file in files
+    ])
+    imported_data = {
+        col: np.concatenate([
+            np.asarray(imported_file[col]) for imported_file in imported_files
+        ])
+        for col in imported_files[0]
+    }
+    logger.info(f"Concatenated {len(files)} data files")
+    return encode_compact_columns(imported_data) if compact \
+        else imported_data
+
+
+def import_concurrently(imports: list, threads: int = None):
+    """Returns the results of imports run concurrently on a thread pool
+
+    Each import is waited for, so this returns once the slowest is done, 
+    and an import that fails has already logged its own error. The first
+    error in the order of imports is then raised, as it would have been 
+    had they run one after another.
+
+    Args:
+        imports (list): functions taking no arguments, each importing a file
+        threads (int): 
+            most imports running at once, IMPORT_THREADS if not given
+
+    Returns:
+        list: result of each import, in the order of imports
+
+    Raises:
+        Exception: the error of the first import that failed
+    """
+    if len(imports) <= 1:
+        return [function() for function in imports]
+    threads = min(threads or IMPORT_THREADS, len(imports))
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(function) for function in imports]
+        wait(futures)
+    for future in futures:
+        if future.exception() is not None:
+            raise future.exception()
+    return [future.result() for future in futures]
+
+
+@instr.instrument()
+def import_columnar_data_file(file: str, columns: list, file_format: str):
+    """Returns columns from a Parquet or Arrow/Feather file as a dictionary
+
+    Args:
+        file (str): file path for relevant data file to import data from
+        columns (list): 
+            list of columns names contained in relevant data file to import
+        file_format (str): either "parquet" or "feather"
+
+    Returns:
+        dict: 
+        Dictionary where keys are column names and values are NumPy arrays
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file contains non-numeric values
+        KeyError: If any specified column is not found in the file
+        ImportError: If pyarrow is not installed
+    """
+    # Log function entry
+    logger.info(f"Importing data from {file}...")
+
+    try:
+        pa = _import_pyarrow(file_format)
+        if not os.path.exists(file):
+            raise FileNotFoundError(f"No such file: {file}")
+
+        # Read the schema to ensure all specified columns exist
+        if file_format == "parquet":
+            schema = pa.parquet.read_schema(file)
+        else:
+            with pa.memory_map(file, "r") as source:
+                schema = pa.ipc.open_file(source).schema
+        missing_columns = [col for col in columns if col not in schema.names]
+        if missing_columns:
+            raise KeyError(f"Missing columns in {file}: {missing_columns}")
+
+        # Read only the selected columns into a DataFrame
+        if file_format == "parquet":
+            table = pa.parquet.read_table(file, columns=columns)
+        else:
+            table = pa.feather.read_table(file, columns=columns)
+        # Remove rows with any NaNs in import
+        df = table.to_pandas().dropna()
+        instr.add_stage_counters(
+            rows_in=table.num_rows, nan_rows_removed=table.num_rows - len(df)
+        )
+
+        # Convert relevant columns to numeric and store them in a dictionary
+        imported_data = _convert_columns_to_numeric(df, columns)
+
+        logger.debug(
+            "Imported data from %s: %s", file, ArraySummary(imported_data)
+        )
+        logger.info(f"Imported data from {file}")
+        return imported_data
+
+    except FileNotFoundError as fe:
+        logger.critical(
+            f"FileNotFoundError: the {file_format} file {file} does not" \
+            f" exist: {fe}"
+        )
+        raise
+
+    except ImportError as ie:
+        logger.critical(f"ImportError: {ie}")
+        raise
+
+    except KeyError as ke:
+        logger.critical(f"KeyError: {ke}")
+        raise
+
+    except ValueError as ve:
+        logger.critical(f"ValueError: {ve}")
+        raise
+
+    except Exception as e:
+        logger.error(f"Error: unexpected error occurred: {e}")
+        raise RuntimeError(
+            f"RuntimeError: unexpected error occurred in" \
+            f" import_columnar_data_file: {e}"
+        ) from e
+
+
+@instr.instrument()
+def ingest_csv_data_file(
+    file: str,
+    store_directory: str,
+    columns: list,
+    column_dtypes: dict = None,
+    precision: str = None,
+    compact: bool = False,
+    chunk_size: int = INGEST_CHUNK_SIZE
+):
+    """Converts a .csv data file into a column store of .npy files
+
+    The column store is a directory of one .npy file per column and a
+    COLUMN_STORE_MANIFEST, which import_column_store memory maps with no 
+    parsing or copying. The .csv file is read in batches of chunk_size rows
+    with import_csv_data_file_chunks, so memory stays bounded, and each 
+    batch is appended to the .npy files, whose headers are written once the
+    number of rows is known. Rows with missing values are removed as on 
+    import. The store is written to a temporary directory that replaces 
+    store_directory once complete.
+
+    Args:
+        file (str): file path for relevant .csv file to import data from
+        store_directory (str): directory of the column store to write
+        columns (list): 
+            list of columns names contained in relevant .csv file to import
+        column_dtypes (dict): 
+            dtype of each column, see import_csv_data_file_chunks
+        precision (str): 
+            "float32" or "float64" for the floating point columns, imports 
+            at the same precision are then zero-copy
+        compact (bool): 
+            store the Location column dictionary encoded and narrow integer
+            Date columns to int32, see encode_compact_columns
+        chunk_size (int): number of rows of the .csv file read per batch
+
+    Returns:
+        int: number of rows stored
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file contains non-numeric values
+        KeyError: If any specified column is not found in the file
+    """
+    # Log function entry
+    logger.info(f"Ingesting {file} into column store {store_directory}...")
+
+    parent_directory, store_name = os.path.split(
+        os.path.abspath(store_directory)
+    )
+    os.makedirs(parent_directory, exist_ok=True)
+    temporary_directory = tempfile.mkdtemp(
+        dir=parent_directory, prefix=f".{store_name}.", suffix=TEMPORARY_SUFFIX
+    )
+    try:
+        column_files = {
+            col: f"column_{number}.npy" for number, col in enumerate(columns)
+        }
+        column_dtypes_stored = {}
+        number_rows = 0
+        with contextlib.ExitStack() as stack:
+            files = {}
+            for col, column_file in column_files.items():
+                files[col] = stack.enter_context(
+                    open(os.path.join(temporary_directory, column_file), "wb")
+                )
+                # Reserve the header, written once the rows are known
+                files[col].write(bytes(NPY_HEADER_SIZE))
+            for chunk in import_csv_data_file_chunks(
+                file, columns, chunk_size, column_dtypes, precision
+            ):
+                for col in columns:
+                    data = np.ascontiguousarray(chunk[col])
+                    column_dtypes_stored.setdefault(col, data.dtype)
+                    files[col].write(data.tobytes())
+                number_rows += len(chunk[columns[0]])
+            for col in columns:
+                dtype = column_dtypes_stored.get(col, np.dtype(
+                    get_csv_column_dtypes(columns, column_dtypes, precision)[
+                        col
+                    ]
+                ))
+                column_dtypes_stored[col] = dtype
+                _write_npy_header(files[col], dtype, number_rows)
+
+        manifest_columns = []
+        for col in columns:
+            manifest_columns.append(
+                {
+                    "name": col,
+                    "file": column_files[col],
+                    "dtype": column_dtypes_stored[col].name,
+                }
+            )
+        if compact:
+            _compact_column_store(temporary_directory, manifest_columns)
+
+        stat = os.stat(file)
+        with open(
+            os.path.join(temporary_directory, COLUMN_STORE_MANIFEST), "w"
+        ) as f:
+            json.dump(
+                {
+                    "version": COLUMN_STORE_VERSION,
+                    "rows": number_rows,
+                    "source": {
+                        "file": os.path.abspath(file),
+                        "signature": [stat.st_mtime_ns, stat.st_size],
+                    },
+                    "columns": manifest_columns,
+                },
+                f,
+                indent=2
+            )
+
+        # Swap the complete store in for any previous one
+        if os.path.exists(store_directory):
+            logger.warning(
+                f"The column store {store_directory} already exists and will" \
+                " be overwritten"
+            )
+            shutil.rmtree(store_directory)
+        os.replace(temporary_directory, store_directory)
+        logger.info(
+            f"Ingested {number_rows} rows of {file} into column store" \
+            f" {store_directory}"
+        )
+        return number_rows
+
+    except BaseException:
+        shutil.rmtree(temporary_directory, ignore_errors=True)
+        raise
+
+
+def _write_npy_header(f, dtype: np.dtype, number_rows: int):
+    """Write the .npy header of a column over the bytes reserved for it
+
+    Args:
+        f (file object): .npy file starting with NPY_HEADER_SIZE bytes free
+        dtype (np.dtype): dtype of the column
+        number_rows (int): number of rows of the column
+
+    Raises:
+        ValueError: If the header does not fit the bytes reserved
+    """
+    f.seek(0)
+    np.lib.format.write_array_header_1_0(
+        f,
+        {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": (number_rows,),
+        }
+    )
+    if f.tell() != NPY_HEADER_SIZE:
+        raise ValueError(
+            f"The .npy header of {number_rows} rows of {dtype} takes" \
+            f" {f.tell()} bytes rather than {NPY_HEADER_SIZE}"
+        )
+
+
+def _compact_column_store(store_directory: str, manifest_columns: list):
+    """Store the Location and Date columns of a column store compactly
+
+    Args:
+        store_directory (str): directory of the column store
+        manifest_columns (list): 
+            manifest entry of each column, updated with the compact files
+    """
+    entries = {
+        entry["name"]: entry for entry in manifest_columns
+        if entry["name"] in [LOCATION_COLUMN, DATE_COLUMN]
+    }
+    compact_data = encode_compact_columns(
+        {
+            col: _load_npy_column(store_directory, entry["file"])
+            for col, entry in entries.items()
+        }
+    )
+    replaced_files = []
+    for col, data in compact_data.items():
+        entry = entries[col]
+        stem = os.path.splitext(entry["file"])[0]
+        if isinstance(data, DictionaryEncodedArray):
+            replaced_files.append(entry.pop("file"))
+            entry["codes_file"] = f"{stem}_codes.npy"
+            entry["categories_file"] = f"{stem}_categories.npy"
+            np.save(
+                os.path.join(store_directory, entry["codes_file"]), data.codes
+            )
+            np.save(
+                os.path.join(store_directory, entry["categories_file"]), 
+                data.categories
+            )
+        elif data.dtype.name != entry["dtype"]:
+            replaced_files.append(entry["file"])
+            entry["file"] = f"{stem}_{data.dtype.name}.npy"
+            entry["dtype"] = data.dtype.name
+            np.save(os.path.join(store_directory, entry["file"]), data)
+
+    # Release the memory maps before removing the files they map
+    del compact_data
+    for column_file in replaced_files:
+        os.remove(os.path.join(store_directory, column_file))
+
+
+@instr.instrument()
+def import_column_store(
+    store_directory: str,
+    columns: list,
+    precision: str = None,
+    compact: bool = False
+):
+    """Returns columns of a column store, memory mapped from its .npy files
+
+    The arrays are read-only views of the page cache, so nothing is parsed
+    or copied, unless a column is cast to precision, a dictionary encoded 
+    column is decoded, or an uncompacted store is compacted.
+
+    Args:
+        store_directory (str): 
+            directory of the column store written by ingest_csv_data_file
+        columns (list): list of columns names of the column store to import
+        precision (str): 
+            "float32" or "float64" for the floating point columns, left as
+            stored if not given
+        compact (bool): 
+            hold the Location and Date columns compactly, see 
+            encode_compact_columns
+
+    Returns:
+        dict: 
+        Dictionary where keys are column names and values are NumPy arrays
+
+    Raises:
+        FileNotFoundError: If the column store does not exist
+        ValueError: If the manifest is of another version
+        KeyError: If any specified column is not found in the column store
+    """
+    # Log function entry
+    logger.info(f"Importing data from column store {store_directory}...")
+
+    try:
+        manifest = read_column_store_manifest(store_directory)
+        stored_columns = {
+            entry["name"]: entry for entry in manifest["columns"]
+        }
+        missing_columns = [
+            col for col in columns if col not in stored_columns
+        ]
+        if missing_columns:
+            raise KeyError(
+                f"Missing columns in {store_directory}: {missing_columns}"
+            )
+
+        imported_data = {}
+        for col in columns:
+            entry = stored_columns[col]
+            if "codes_file" in entry:
+                data = DictionaryEncodedArray(
+                    _load_npy_column(store_directory, entry["codes_file"]),
+                    _load_npy_column(
+                        store_directory, entry["categories_file"]
+                    )
+                )
+                if not compact:
+                    data = data.decode()
+            else:
+                data = _load_npy_column(store_directory, entry["file"])
+            imported_data[col] = data
+        instr.add_stage_counters(rows_in=manifest["rows"])
+
+        imported_data = _apply_precision(imported_data, precision)
+        if compact:
+            imported_data = encode_compact_columns(imported_data)
+        logger.info(f"Imported data from column store {store_directory}")
+        return imported_data
+
+    except FileNotFoundError as fe:
+        logger.critical(
+            f"FileNotFoundError: the column store {store_directory} does" \
+            f" not exist: {fe}"
+        )
+        raise
+
+    except KeyError as ke:
+        logger.critical(f"KeyError: {ke}")
+        raise
+
+    except ValueError as ve:
+        logger.critical(f"ValueError: {ve}")
+        raise
+
+    except Exception as e:
+        logger.error(f"Error: unexpected error occurred: {e}")
+        raise RuntimeError(
+            f"RuntimeError: unexpected error occurred in" \
+            f" import_column_store: {e}"
+        ) from e
+
+
+def read_column_store_manifest(store_directory: str):
+    """Returns the manifest of a column store
+
+    Args:
+        store_directory (str): directory of the column store
+
+    Returns:
+        dict: 
+            manifest with keys version, rows, source (the file path and 
+            [modification time, size] of the .csv data file ingested) and 
+            columns (the name, dtype and .npy files of each column)
+
+    Raises:
+        FileNotFoundError: If the column store does not exist
+        ValueError: If the manifest is of another version
+    """
+    with open(os.path.join(store_directory, COLUMN_STORE_MANIFEST), "r") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != COLUMN_STORE_VERSION:
+        raise ValueError(
+            f"Column store {store_directory} is version" \
+            f" {manifest.get('version')}, expected {COLUMN_STORE_VERSION}," \
+            " ingest it again"
+        )
+    return manifest
+
+
+def _load_npy_column(store_directory: str, column_file: str):
+    """Returns a .npy column file of a column store memory mapped read-only"""
+    return np.load(os.path.join(store_directory, column_file), mmap_mode="r")
+
+
+def import_csv_data_file_chunks(
+    file: str,
+    columns: list,
+    chunk_size: int,
+    column_dtypes: dict = None,
+    precision: str = None,
+    compact: bool = False
+):
+    """Yields columns from .csv file selected in dictionaries of row batches
+
+    Memory stays bounded by the batch size of chunk_size rows, and the file
+    is read once. Without column_dtypes the dtype of each column is that of
+    the first batch, and later batches are cast to it. A later batch with
+    values an integer column of the first batch cannot hold, e.g. 2.5, 
+    turns that column to floating point from that batch on, with a warning.
+    Batches then match import_csv_data_file value for value, and dtype for
+    dtype if the dtypes of the first batch hold over the whole file. With 
+    column_dtypes only the selected columns are parsed, straight to those 
+    dtypes as import_typed_csv_data_file does.
+
+    Args:
+        file (str): file path for relevant .csv file to import data from
+        columns (list): 
+            list of columns names contained in relevant .csv file to import
+        chunk_size (int): number of rows of the .csv file read per batch
+        column_dtypes (dict): 
+            dtype of each column, one of CSV_COLUMN_DTYPES, float64 for 
+            columns not given
+        precision (str): 
+            "float32" or "float64" for the floating point columns, in place
+            of their resolved or declared dtypes
+        compact (bool): 
+            hold the Location and Date columns compactly, see 
+            encode_compact_columns
+
+    Yields:
+        dict: 
+        Dictionary where keys are column names and values are NumPy arrays
+        of a batch of rows
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file contains non-numeric values
+        KeyError: If any specified column is not found in the .csv
+    """
+    # Check the batch size is usable
+    if chunk_size <= 0:
+        raise ValidationError(f"Chunk size must be positive: {chunk_size}")
+
+    # Log function entry
+    logger.info(f"Importing data from {file} in chunks of {chunk_size}...")
+
+    try:
+        pd = _import_pandas()
+        _check_csv_columns(file, columns)
+        if column_dtypes is None:
+            # Resolved from the first batch
+            resolved_dtypes = None
+            float_dtype = get_precision_dtype(precision or "float64")
+            read_options = {}
+        else:
+            # Parse only the selected columns, straight to numbers
+            resolved_dtypes = get_csv_column_dtypes(
+                columns, column_dtypes, precision
+            )
+            read_options = {
+                "usecols": columns,
+                "dtype": _get_parse_dtypes(resolved_dtypes),
+            }
+
+        # Yield batches with their columns cast to the resolved dtypes, 
+        # recording the reading of each batch as a stage
+        chunks = pd.read_csv(file, chunksize=chunk_size, **read_options)
+        for chunk_number in itertools.count():
+            with instr.stage("import_csv_data_file_chunks") as counters:
+                df = next(chunks, None)
+                if df is not None:
+                    complete_df = df.dropna()
+                    if column_dtypes is None:
+                        numeric_data = _convert_columns_to_numeric(
+                            complete_df, columns
+                        )
+                        if resolved_dtypes is None:
+                            resolved_dtypes = {
+                                col: float_dtype 
+                                if np.issubdtype(data.dtype, np.floating)
+                                else data.dtype
+                                for col, data in numeric_data.items()
+                            }
+                            logger.debug(
+                                "Resolved dtypes for %s: %s", 
+                                file, resolved_dtypes
+                            )
+                        imported_data = _cast_chunk_columns(
+                            numeric_data, resolved_dtypes, float_dtype, file
+                        )
+                    else:
+                        imported_data = _cast_columns(
+                            complete_df, columns, resolved_dtypes
+                        )
+                    if compact:
+                        imported_data = encode_compact_columns(imported_data)
+                    counters.update(
+                        rows_in=len(df),
+                        rows_out=len(complete_df),
+                        nan_rows_removed=len(df) - len(complete_df),
+                    )
+            if df is None:
+                break
+            logger.debug(
+                "Imported chunk %s from %s: %s", 
+                chunk_number, file, ArraySummary(imported_data)
+            )
+            yield imported_data
+
+        logger.info(f"Imported data from {file} in chunks of {chunk_size}")
+
+    except FileNotFoundError as fe:
+        logger.critical(
+            f"FileNotFoundError: the .csv {file} does not exist: {fe}"
+        )
+        raise
+
+    except KeyError as ke:
+        logger.critical(f"KeyError: {ke}")
+        raise
+
+    except ValueError as ve:
+        logger.critical(f"ValueError: {ve}")
+        raise
+
+    except Exception as e:
+        logger.error(f"Error: unexpected error occurred: {e}")
+        raise RuntimeError(
+            f"RuntimeError: unexpected error occurred in" \
+            f" import_csv_data_file_chunks: {e}"
+        ) from e
+
+
+def get_file_format(file: str, file_format: str = None):
+    """Returns the format of a data file
+
+    Args:
+        file (str): file path of the data file
+        file_format (str): 
+            format to use if given, otherwise chosen by file extension
+
+    Returns:
+        str: 
+            one of "csv", "parquet", "feather" or "npy", the format of a 
+            column store directory
+
+    Raises:
+        ValueError: If file_format is not a supported format
+    """
+    if file_format is None:
+        if os.path.isfile(os.path.join(file, COLUMN_STORE_MANIFEST)):
+            return "npy"
+        extension = os.path.splitext(file)[1].lower()
+        return FILE_FORMAT_EXTENSIONS.get(extension, "csv")
+    if file_format not in FILE_FORMATS:
+        raise ValueError(
+            f"Unsupported data file format {file_format}, expected one of" \
+            f" {FILE_FORMATS}"
+        )
+    return file_format
+
+
+def _import_pandas():
+    """Import pandas on first use
+
+    Returns:
+        module: the pandas module
+    """
+    return importlib.import_module("pandas")
+
+
+def _import_pyarrow(file_format: str):
+    """Import pyarrow with the submodules for Parquet and Arrow/Feather
+
+    Args:
+        file_format (str): data file format that needs pyarrow
+
+    Returns:
+        module: the pyarrow module
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    try:
+        pa = importlib.import_module("pyarrow")
+        importlib.import_module("pyarrow.parquet")
+        importlib.import_module("pyarrow.feather")
+        return pa
+
+    except ImportError as ie:
+        raise ImportError(
+            f"pyarrow is required for {file_format} data files, install it" \
+            f" with pip install pyarrow: {ie}"
+        ) from ie
+
+
+def encode_compact_columns(imported_data: dict):
+    """Returns imported columns with Location and Date held compactly
+
+    Location is dictionary encoded into a DictionaryEncodedArray, and 
+    integer Date columns are narrowed to int32, the date values themselves
+    unchanged, with no parsing of calendar dates or offset from an epoch.
+    Both hold the imported values exactly, and are exported unchanged. 
+    Other columns, and Date columns that are not integers or fall outside
+    the int32 range, e.g. floating point dates with missing values, are 
+    left as they are.
+
+    Args:
+        imported_data (dict): 
+            Dictionary where keys are column names and values are NumPy 
+            arrays
+
+    Returns:
+        dict: the dictionary, with its Location and Date columns replaced
+    """
+    location = imported_data.get(LOCATION_COLUMN)
+    if isinstance(location, np.ndarray):
+        imported_data[LOCATION_COLUMN] = DictionaryEncodedArray.encode(
+            location
+        )
+    date = imported_data.get(DATE_COLUMN)
+    if isinstance(date, np.ndarray) and date.size \
+        and np.issubdtype(date.dtype, np.integer) \
+        and date.dtype != COMPACT_DATE_DTYPE:
+        limits = np.iinfo(COMPACT_DATE_DTYPE)
+        if limits.min <= date.min() and date.max() <= limits.max:
+            imported_data[DATE_COLUMN] = date.astype(COMPACT_DATE_DTYPE)
+    return imported_data
+
+
+def _get_export_columns(export_data: dict):
+    """Returns export columns with dictionary encoded columns decoded
+
+    Args:
+        export_data (dict): 
+            Dictionary where keys are column names and values are arrays
+
+    Returns:
+        dict: the columns, ready for pd.DataFrame
+    """
+    return {
+        col: data.decode()
+        if isinstance(data, DictionaryEncodedArray) else data
+        for col, data in export_data.items()
+    }
+
+
+def _apply_precision(imported_data: dict, precision: str = None):
+    """Returns imported columns with floating point columns cast to precision
+
+    Args:
+        imported_data (dict): 
+            Dictionary where keys are column names and values are NumPy 
+            arrays
+        precision (str): 
+            "float32" or "float64", the columns are returned as given if not
+            given
+
+    Returns:
+        dict: the dictionary, with its floating point arrays cast
+
+    Raises:
+        ValueError: If precision is not a supported precision
+    """
+    if precision is None:
+        return imported_data
+    dtype = get_precision_dtype(precision)
+    for col, data in imported_data.items():
+        if np.issubdtype(data.dtype, np.floating):
+            imported_data[col] = data.astype(dtype, copy=False)
+    return imported_data
+
+
+def _cast_chunk_columns(
+    numeric_data: dict, 
+    chunk_dtypes: dict, 
+    float_dtype: np.dtype, 
+    file: str
+):
+    """Returns a batch of columns cast to the dtypes of the first batch
+
+    An integer column of the first batch holding values of the batch that 
+    are not integers is turned to float_dtype, in chunk_dtypes too, so that
+    later batches are cast to it, see import_csv_data_file_chunks.
+
+    Args:
+        numeric_data (dict): 
+            Dictionary where keys are column names and values are NumPy 
+            arrays of a batch of rows
+        chunk_dtypes (dict): dtype of each column, updated in place
+        float_dtype (np.dtype): dtype an integer column is turned to
+        file (str): file path of the .csv file, to log
+
+    Returns:
+        dict: 
+        Dictionary where keys are column names and values are NumPy arrays
+    """
+    cast_data = {}
+    for col, data in numeric_data.items():
+        cast_data[col] = data.astype(chunk_dtypes[col], copy=False)
+        if np.issubdtype(chunk_dtypes[col], np.integer) \
+            and np.issubdtype(data.dtype, np.floating) \
+            and not np.array_equal(cast_data[col], data):
+            logger.warning(
+                f"Column {col} of {file} holds values that are not" \
+                f" integers after the first chunk, imported as {float_dtype}" \
+                " from here on, declare data_column_dtypes to import it as" \
+                " one dtype"
+            )
+            chunk_dtypes[col] = float_dtype
+            cast_data[col] = data.astype(float_dtype, copy=False)
+    return cast_data
+
+
+def _convert_columns_to_numeric(df: "pd.DataFrame", columns: list):
+    """Returns columns of a DataFrame converted to numeric NumPy arrays
+
+    Args:
+        df (pd.DataFrame): DataFrame holding the imported .csv data
+        columns (list): list of columns names to convert
+
+    Returns:
+        dict: 
+        Dictionary where keys are column names and values are NumPy arrays
+
+    Raises:
+        ValueError: If a column contains values that are not numeric
+    """
+    pd = _import_pandas()
+    numeric_df = df[columns].apply(pd.to_numeric, errors="coerce")
+
+    # Check if numeric conversion introduced NaN values, in one pass over
+    # all the columns
+    non_numeric = numeric_df.isnull().to_numpy()
+    if non_numeric.any():
+        non_numeric_columns = [
+            col for col, any_non_numeric in zip(
+                columns, non_numeric.any(axis=0)
+            ) if any_non_numeric
+        ]
+        non_numeric_rows = df.index[non_numeric.any(axis=1)].tolist()
+        raise ValueError(
+                f"Columns {non_numeric_columns} contain non-numeric values" \
+                " that could not be converted, in rows" \
+                f" {non_numeric_rows[:REPORTED_ROWS]}" \
+                f"{' ...' if len(non_numeric_rows) > REPORTED_ROWS else ''}"
+            )
+    return {col: numeric_df[col].to_numpy() for col in columns}
+
+
+@instr.instrument()
+def export_csv_data_file(
+    file: str, 
+    columns: list, 
+    export_data: dict, 
+    append: bool = False,
+    float_format: str = None,
+    compression: str = None
+):
+    """Exports data in a dictionary to a .csv file
+
+    The arrays are formatted and written in blocks of EXPORT_BLOCK_ROWS rows,
+    without building a DataFrame. With the default float_format the bytes 
+    are those pandas' to_csv writes. Unless appending, the file is written 
+    to a temporary file and renamed over file, so a run that dies part way
+    leaves any existing file as it was.
+
+    Args:
+        file (str): file path for relevant .csv file to import data from
+        columns (list): columns that will be exported to .csv file
+        export_data (dict): 
+            dictionary of keys as columns for .csv and values of data to be
+            printed to .csv file
+        append (bool): 
+            append the rows without a header to the end of an existing .csv
+            file rather than overwriting it, for data exported in batches
+        float_format (str): 
+            %-format of floating point values, e.g. "%.4f", shortest round
+            trip representation if not given
+        compression (str): 
+            "gzip" or "zstd", by file extension if not given, see 
+            get_compression
+    Raises:
+        PermissionError: 
+            incorrect permission to access file to create/overwrite
+        ValueError: If the compression is not supported
+        ImportError: If zstandard is needed for zstd but not installed
+    """
+    # Check columns to be exported are the same as the expected columns
+    if sorted(columns) != sorted(export_data.keys()):
+        raise ValidationError(
+            f"Expected columns for export: {columns}\nColumns for export: " \
+            f"{list(export_data.keys())}"
+        )
+
+    # Check data is not empty before exporting
+    if not export_data:
+        raise ValidationError("DataFrame is empty, cannot export.")
+
+    compression = get_compression(file, compression)
+
+    # Log function entry
+    logger.info(f"Exporting data to {file}...")
+
+    try:
+        # Write data to file, overwrite if it exists unless appending
+        if not append and os.path.exists(file):
+            logger.warning(
+                f"The .csv file {file} already exists and will be overwritten"
+            )
+        if append:
+            _write_csv_file(file, "ab", export_data, float_format, compression)
+        else:
+            # Write a new file whole or not at all
+            with atomic_output_file(file) as temporary_file:
+                _write_csv_file(
+                    temporary_file, 
+                    "wb", 
+                    export_data, 
+                    float_format, 
+                    compression
+                )
+        logger.info(f"Exported data to {file}")
+
+    except PermissionError as pe:
+        logger.critical(
+            f"PermissionError: permission denied when accessing the file: {pe}"
+        )
+        raise
+
+    except ImportError as ie:
+        logger.critical(f"ImportError: {ie}")
+        raise
+
+    except Exception as e:
+        logger.error(f"Error: unexpected error occurred: {e}")
+        raise RuntimeError(
+            f"RuntimeError: unexpected error occurred in" \
+            f" export_csv_data_file: {e}"
+        ) from e
+
+
+def _write_csv_file(
+    file: str, 
+    mode: str, 
+    export_data: dict, 
+    float_format: str = None, 
+    compression: str = None
+):
+    """Write the .csv text of the columns to a file, see export_csv_data_file
+
+    Args:
+        file (str): file path of the .csv file
+        mode (str): "wb" to write a header and the rows, "ab" to append rows
+        export_data (dict): 
+            Dictionary where keys are column names and values are arrays
+        float_format (str): %-format of floating point values
+        compression (str): "gzip", "zstd" or None
+    """
+    with _open_export_file(file, mode, compression) as f:
+        for block in _format_csv_blocks(
+            export_data, float_format, header=mode == "wb"
+        ):
+            f.write(block.encode("utf-8"))
+
+
+@contextlib.contextmanager
+def atomic_output_file(file: str):
+    """Yields a temporary file path that is renamed to file on success
+
+    The temporary file is in the directory of file, so the rename replaces
+    file in one step, and is removed if the block raises. Readers therefore
+    see either the previous file or the complete new one, never a partly
+    written file. An existing file keeps its permissions.
+
+    Args:
+        file (str): file path of the file to write
+
+    Yields:
+        str: file path of the temporary file to write to
+
+    Raises:
+        PermissionError: If an existing file is not writable
+    """
+    mode = None
+    if os.path.exists(file):
+        if not os.access(file, os.W_OK):
+            raise PermissionError(f"Permission denied: '{file}'")
+        mode = os.stat(file).st_mode
+    directory, file_name = os.path.split(file)
+    temporary_file = os.path.join(
+        directory, f".{file_name}.{uuid.uuid4().hex[:8]}{TEMPORARY_SUFFIX}"
+    )
+    # Created like open does, with permissions from the umask
+    os.close(
+        os.open(temporary_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+    )
+    try:
+        yield temporary_file
+        if mode is not None:
+            os.chmod(temporary_file, mode)
+        os.replace(temporary_file, file)
+
+    except BaseException:
+        if os.path.exists(temporary_file):
+            os.remove(temporary_file)
+        raise
+
+
+def get_compression(file: str, compression: str = None):
+    """Returns the compression of an exported .csv file
+
+    Args:
+        file (str): file path of the .csv file
+        compression (str): 
+            "gzip" or "zstd", if not given chosen by file extension, .gz or
+            .zst, and otherwise None for an uncompressed file
+
+    Returns:
+        str: "gzip", "zstd" or None
+
+    Raises:
+        ValueError: If the compression is not supported
+    """
+    if compression is None:
+        extension = os.path.splitext(file)[1].lower()
+        return COMPRESSION_EXTENSIONS.get(extension)
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Unsupported compression {compression}, expected one of" \
+            f" {COMPRESSIONS}"
+        )
+    return compression
+
+
+def _open_export_file(file: str, mode: str, compression: str = None):
+    """Open a file for binary writing, compressing what is written
+
+    Appending to a compressed file adds a gzip member or zstd frame, which
+    decompress to the rows of both writes.
+
+    Args:
+        file (str): file path of the file
+        mode (str): "wb" or "ab"
+        compression (str): "gzip", "zstd" or None
+
+    Returns:
+        file object: the file, to be closed by the caller
+    """
+    if compression == "gzip":
+        return gzip.open(file, mode, compresslevel=GZIP_COMPRESSION_LEVEL)
+    if compression == "zstd":
+        zstd = _import_zstandard()
+        return zstd.ZstdCompressor().stream_writer(open(file, mode))
+    return open(file, mode, buffering=EXPORT_BUFFER_SIZE)
+
+
+def _import_zstandard():
+    """Import zstandard for zstd compressed .csv files
+
+    Returns:
+        module: the zstandard module
+
+    Raises:
+        ImportError: If zstandard is not installed
+    """
+    try:
+        return importlib.import_module("zstandard")
+
+    except ImportError as ie:
+        raise ImportError(
+            f"zstandard is required for zstd compressed files, install it" \
+            f" with pip install zstandard: {ie}"
+        ) from ie
+
+
+def _format_csv_blocks(
+    export_data: dict, 
+    float_format: str = None, 
+    header: bool = True
+):
+    """Yields the .csv text of the columns, EXPORT_BLOCK_ROWS rows at a time
+
+    Quoting and missing values follow pandas' to_csv: fields with a comma, 
+    quote or line break are quoted, NaN is written as an empty field.
+
+    Args:
+        export_data (dict): 
+            Dictionary where keys are column names and values are arrays
+        float_format (str): %-format of floating point values
+        header (bool): start with a line of the column names
+
+    Yields:
+        str: lines of the .csv file
+    """
+    columns = {
+        col: data if isinstance(data, DictionaryEncodedArray) 
+        else np.asarray(data)
+        for col, data in export_data.items()
+    }
+    number_rows = {len(data) for data in columns.values()}
+    if len(number_rows) > 1:
+        raise ValueError("All columns must have the same number of rows")
+    number_rows = number_rows.pop()
+    # A line of a single empty field is quoted, so it is not a blank line
+    single_column = len(columns) == 1
+
+    if header:
+        yield ",".join(_quote_csv_field(str(col)) for col in columns) \
+            + os.linesep
+    for start in range(0, number_rows, EXPORT_BLOCK_ROWS):
+        fields = [
+            _format_csv_column(
+                data[start:start + EXPORT_BLOCK_ROWS], float_format
+            )
+            for data in columns.values()
+        ]
+        lines = list(map(",".join, zip(*fields)))
+        if single_column:
+            lines = [line or '""' for line in lines]
+        yield os.linesep.join(lines) + os.linesep
+
+
+def _format_csv_column(data, float_format: str = None):
+    """Returns the .csv fields of a column
+
+    Args:
+        data (np.ndarray | DictionaryEncodedArray): values of the column
+        float_format (str): %-format of floating point values
+
+    Returns:
+        list: field of each value
+    """
+    # Format each category once and look the fields up by code
+    if isinstance(data, DictionaryEncodedArray):
+        fields = np.array(
+            _format_csv_column(data.categories, float_format), dtype=object
+        )
+        return fields.take(data.codes).tolist()
+
+    if np.issubdtype(data.dtype, np.floating):
+        if float_format is not None:
+            fields = list(map(float_format.__mod__, data.tolist()))
+        elif data.dtype == np.float64:
+            # repr of a float is its shortest round trip representation
+            fields = list(map(repr, data.tolist()))
+        else:
+            # numpy formats float32 by its own shortest representation
+            fields = data.astype(str).tolist()
+        for row in np.flatnonzero(np.isnan(data)).tolist():
+            fields[row] = ""
+        return fields
+
+    if np.issubdtype(data.dtype, np.integer) \
+        or np.issubdtype(data.dtype, np.bool_):
+        return list(map(str, data.tolist()))
+
+    return [
+        "" if value is None or value != value 
+        else _quote_csv_field(str(value))
+        for value in data.tolist()
+    ]
+
+
+def _quote_csv_field(field: str):
+    """Returns a .csv field, quoted if it has a comma, quote or line break"""
+    if any(character in field for character in ',"\r\n'):
+        return '"' + field.replace('"', '""') + '"'
+    return field
+
+
+@instr.instrument()
+def export_data_file(
+    file: str, 
+    columns: list, 
+    export_data: dict, 
+    file_format: str = None,
+    float_format: str = None,
+    compression: str = None
+):
+    """Exports data in a dictionary to a data file
+
+    The file format is file_format if given, e.g. from the configuration, and
+    otherwise chosen by file extension, defaulting to .csv. Parquet and 
+    Arrow/Feather files need pyarrow. The file is replaced whole once 
+    written, see atomic_output_file.
+
+    Args:
+        file (str): file path for relevant data file to export data to
+        columns (list): columns that will be exported to the data file
+        export_data (dict): 
+            dictionary of keys as columns and values of data to be written to
+            the data file
+        file_format (str): one of "csv", "parquet" or "feather"
+        float_format (str): 
+            %-format of floating point values of .csv files, see 
+            export_csv_data_file
+        compression (str): 
+            "gzip" or "zstd" compression of .csv files, see 
+            export_csv_data_file
+
+    Raises:
+        PermissionError: 
+            incorrect permission to access file to create/overwrite
+        ValueError: If the format is not supported, or is npy
+        ImportError: If pyarrow is needed for the format but not installed
+    """
+    file_format = get_file_format(file, file_format)
+    if file_format == "csv":
+        return export_csv_data_file(
+            file, 
+            columns, 
+            export_data, 
+            float_format=float_format, 
+            compression=compression
+        )
+    if file_format == "npy":
+        raise ValueError(
+            "Column stores are only written from .csv data files by" \
+            f" ingest_csv_data_file, not exported: {file}"
+        )
+
+    # Check columns to be exported are the same as the expected columns
+    if sorted(columns) != sorted(export_data.keys()):
+        raise ValidationError(
+            f"Expected columns for export: {columns}\nColumns for export: " \
+            f"{list(export_data.keys())}"
+        )
+
+    # Check data is not empty before exporting
+    if not export_data:
+        raise ValidationError("DataFrame is empty, cannot export.")
+
+    # Log function entry
+    logger.info(f"Exporting data to {file}...")
+
+    try:
+        _import_pyarrow(file_format)
+        # Write data to file, overwrite if it exists
+        if os.path.exists(file):
+            logger.warning(
+                f"The {file_format} file {file} already exists and will be" \
+                " overwritten"
+            )
+        output_df = _import_pandas().DataFrame(
+            _get_export_columns(export_data)
+        )
+        with atomic_output_file(file) as temporary_file:
+            if file_format == "parquet":
+                output_df.to_parquet(temporary_file, index=False)
+            else:
+                output_df.to_feather(temporary_file)
+        logger.info(f"Exported data to {file}")
+
+    except PermissionError as pe:
+        logger.critical(
+            f"PermissionError: permission denied when accessing the file: {pe}"
+        )
+        raise
+
+    except ImportError as ie:
+        logger.critical(f"ImportError: {ie}")
+        raise
+
+    except Exception as e:
+        logger.error(f"Error: unexpected error occurred: {e}")
+        raise RuntimeError(
+            f"RuntimeError: unexpected error occurred in" \
+            f" export_data_file: {e}"
         ) from e
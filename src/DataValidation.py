@@ -0,0 +1,223 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Third party modules
+import numpy as np
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Rows of the columns checked together per block, sized so the block of all
+# columns stays in cache
+VALIDATION_BLOCK_SIZE = 16384
+
+# Number of offending row indices shown in a validation report
+REPORTED_ROWS = 10
+
+# Floating point precisions of the compute mode
+PRECISIONS = ("float32", "float64")
+DEFAULT_PRECISION = "float64"
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class ValidationError(AssertionError):
+    """Raised when data fails a validation check
+
+    Raised explicitly rather than by assert statements, so the checks still
+    run under python -O. Subclasses AssertionError so callers catching the
+    errors of the original assert statements keep working.
+    """
+
+
+class ValidationReport:
+    """Compact report of the rows of a batch failing physical bounds checks
+
+    Attributes:
+        number_rows (int): number of rows checked
+        invalid_rows (np.ndarray): indices of the rows failing any check
+        column_counts (dict):
+            number of rows failing the check of each column, keyed by column
+            name
+    """
+
+    def __init__(
+        self,
+        number_rows: int,
+        invalid_rows: np.ndarray,
+        column_counts: dict
+    ):
+        """Hold the outcome of the checks
+
+        Args:
+            number_rows (int): number of rows checked
+            invalid_rows (np.ndarray): indices of the rows failing any check
+            column_counts (dict):
+                number of rows failing the check of each column
+        """
+        self.number_rows = number_rows
+        self.invalid_rows = invalid_rows
+        self.column_counts = column_counts
+
+    def __bool__(self):
+        """True if every row passed the checks"""
+        return len(self.invalid_rows) == 0
+
+    def __str__(self):
+        """Counts per column and the first offending row indices"""
+        if self:
+            return f"All {self.number_rows} rows valid"
+        counts = ", ".join(
+            f"{col}: {count}"
+            for col, count in self.column_counts.items() if count
+        )
+        rows = ", ".join(
+            str(row) for row in self.invalid_rows[:REPORTED_ROWS]
+        )
+        if len(self.invalid_rows) > REPORTED_ROWS:
+            rows += ", ..."
+        return (
+            f"{len(self.invalid_rows)} of {self.number_rows} rows invalid" \
+            f" ({counts}), rows [{rows}]"
+        )
+
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def validate_lower_bounds(columns: dict, lower_bounds: dict):
+    """Check columns are finite and above their lower bounds in one pass
+
+    The columns are copied block by block into a small (columns x rows)
+    buffer, and every check of the block is done with one comparison against
+    the stacked lower bounds and one against infinity, so each column is read
+    from memory once however many checks there are. NaN fails every check.
+
+    Args:
+        columns (dict):
+            arrays of equal length to check, keyed by column name
+        lower_bounds (dict):
+            (lower bound, inclusive) of each column, keyed by column name
+
+    Returns:
+        ValidationReport: the rows failing any check
+
+    Raises:
+        ValidationError: If the columns are not all the same length
+    """
+    names = list(columns)
+    lengths = {name: len(columns[name]) for name in names}
+    if len(set(lengths.values())) > 1:
+        raise ValidationError(
+            f"Columns must have the same length: {lengths}"
+        )
+    number_rows = next(iter(lengths.values()), 0)
+
+    # Inclusive lower bounds, with exclusive bounds moved up to the next float
+    # of the column's precision, so a float32 column is checked against the
+    # float32 bound as when compared directly
+    lower = np.array([
+        _get_inclusive_lower_bound(*lower_bounds[name], columns[name].dtype)
+        for name in names
+    ], dtype=np.float64)[:, None]
+
+    block_size = min(VALIDATION_BLOCK_SIZE, max(number_rows, 1))
+    block = np.empty((len(names), block_size))
+    valid = np.empty((len(names), block_size), dtype=bool)
+    finite = np.empty((len(names), block_size), dtype=bool)
+    invalid_rows = []
+    column_counts = np.zeros(len(names), dtype=np.int64)
+    for start in range(0, number_rows, block_size):
+        stop = min(start + block_size, number_rows)
+        size = stop - start
+        for i, name in enumerate(names):
+            block[i, :size] = columns[name][start:stop]
+        np.greater_equal(block[:, :size], lower, out=valid[:, :size])
+        np.less(block[:, :size], np.inf, out=finite[:, :size])
+        valid[:, :size] &= finite[:, :size]
+
+        # Only look for the offending rows of blocks with any
+        if not valid[:, :size].all():
+            invalid = ~valid[:, :size]
+            column_counts += invalid.sum(axis=1)
+            invalid_rows.append(np.flatnonzero(invalid.any(axis=0)) + start)
+
+    return ValidationReport(
+        number_rows,
+        np.concatenate(invalid_rows) if invalid_rows
+        else np.empty(0, dtype=np.intp),
+        dict(zip(names, column_counts.tolist()))
+    )
+
+
+def _get_inclusive_lower_bound(
+    bound: float,
+    inclusive: bool,
+    dtype: np.dtype
+):
+    """Inclusive lower bound of a column, at its floating point precision
+
+    Args:
+        bound (float): lower bound of the column
+        inclusive (bool): True if the bound itself is valid
+        dtype (np.dtype): dtype of the column, float64 unless floating
+
+    Returns:
+        np.ndarray: the inclusive lower bound, of the column's precision
+    """
+    if not np.issubdtype(dtype, np.floating):
+        dtype = np.float64
+    bound = np.asarray(bound, dtype=dtype)
+    return bound if inclusive else np.nextafter(bound, np.array(np.inf, dtype))
+
+
+def check_lower_bounds(columns: dict, lower_bounds: dict):
+    """Raise a ValidationError if columns fail validate_lower_bounds
+
+    Args:
+        columns (dict):
+            arrays of equal length to check, keyed by column name
+        lower_bounds (dict):
+            (lower bound, inclusive) of each column, keyed by column name
+
+    Raises:
+        ValidationError:
+            If any value is not finite or not above its lower bound, with
+            the report of the offending rows
+    """
+    report = validate_lower_bounds(columns, lower_bounds)
+    if not report:
+        bounds = ", ".join(
+            f"{name} {'>=' if inclusive else '>'} {bound}"
+            for name, (bound, inclusive) in lower_bounds.items()
+        )
+        raise ValidationError(
+            f"Non-physical values, expected finite {bounds}: {report}"
+        )
+
+
+def get_precision_dtype(precision: str = None):
+    """Returns the floating point dtype of a compute precision
+
+    Args:
+        precision (str): one of PRECISIONS, DEFAULT_PRECISION if not given
+
+    Returns:
+        np.dtype: the floating point dtype
+
+    Raises:
+        ValueError: If precision is not a supported precision
+    """
+    precision = DEFAULT_PRECISION if precision is None else str(precision)
+    if precision not in PRECISIONS:
+        raise ValueError(
+            f"Unsupported precision {precision}, expected one of" \
+            f" {PRECISIONS}"
+        )
+    return np.dtype(precision)
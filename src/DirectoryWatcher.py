@@ -0,0 +1,348 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import fnmatch
+import json
+import os
+import threading
+import time
+
+# Custom modules
+from custom_logger import get_custom_logger
+import BatchRunner as br
+import DataImportExport as die
+import Pipeline as pl
+import ProgressJournal as pj
+import ReferenceRegistry as rr
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Logging
+logger = get_custom_logger("data/logging_config.yaml")
+
+# Seconds between scans of the watched directory
+DEFAULT_POLL_INTERVAL = 0.2
+
+# Data files picked up from the watched directory
+DEFAULT_WATCH_PATTERN = "*.csv"
+
+# Suffix of the done marker written next to the output of each data file
+DONE_MARKER_SUFFIX = ".done"
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class DirectoryWatcher:
+    """Long-running processing of data files as they land in a directory
+
+    The constants and K lookup are loaded once and held in a
+    ReferenceRegistry, and picked up again only when their files change, so
+    each data file costs its own import, computation and export alone. The
+    watched directory is polled every poll_interval seconds, and a data file
+    is processed once its modification time and size are unchanged between
+    two scans, so files still being written are left until complete. Each
+    output is written as by a batch run, followed by a JSON done marker
+    <output file>.done recording the data file it was computed from.
+
+    Data files with a done marker of their current modification time and
+    size are skipped, also after a restart, and data files that change are
+    processed again. A data file that fails is logged and retried only once
+    it changes. Reference files that fail to reload are logged and the
+    loaded reference data kept, and reloaded again on the next scan.
+
+    Attributes:
+        config_file_path (str): file path to yaml configuration file
+        watch_directory (str): directory polled for data files
+        output_directory (str): directory the outputs are written to
+        poll_interval (float): seconds between scans
+        pattern (str): file name pattern of the data files
+        chunk_size (int): stream each data file in batches of this many rows
+        compute_workers (int):
+            number of threads computing each data file, that of the
+            configuration if not given
+        registry (rr.ReferenceRegistry):
+            registry holding the reference data of the configuration
+    """
+
+    def __init__(
+        self,
+        config_file_path: str,
+        watch_directory: str,
+        output_directory: str,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        pattern: str = DEFAULT_WATCH_PATTERN,
+        chunk_size: int = None,
+        compute_workers: int = None,
+        registry: rr.ReferenceRegistry = None
+    ):
+        """Load the reference data of the configuration
+
+        Args:
+            config_file_path (str): file path to yaml configuration file
+            watch_directory (str): directory polled for data files
+            output_directory (str): directory the outputs are written to
+            poll_interval (float): seconds between scans
+            pattern (str): file name pattern of the data files
+            chunk_size (int):
+                stream each data file in batches of this many rows
+            compute_workers (int): number of threads computing each data file
+            registry (rr.ReferenceRegistry):
+                registry to hold the reference data in, a new one if not
+                given
+
+        Raises:
+            ValueError:
+                If poll_interval is not positive, or the outputs would be
+                written to the watched directory
+        """
+        if poll_interval <= 0:
+            raise ValueError(
+                f"poll_interval must be positive, got {poll_interval}"
+            )
+        if os.path.abspath(output_directory) \
+            == os.path.abspath(watch_directory):
+            raise ValueError(
+                "The output directory must differ from the watched" \
+                f" directory {watch_directory}"
+            )
+        self.config_file_path = config_file_path
+        self.watch_directory = watch_directory
+        self.output_directory = output_directory
+        self.poll_interval = poll_interval
+        self.pattern = pattern
+        self.chunk_size = chunk_size
+        self.compute_workers = compute_workers
+        self.registry = registry or rr.ReferenceRegistry(max_entries=1)
+        # Data file signatures seen on the last scan, done and failed
+        self._pending = {}
+        self._done = {}
+        self._failed = {}
+        self.registry.get(config_file_path)
+        os.makedirs(output_directory, exist_ok=True)
+
+    def run(self, stop_event: threading.Event = None, max_scans: int = None):
+        """Scan the watched directory until stopped
+
+        Args:
+            stop_event (threading.Event):
+                event stopping the watcher once set, e.g. by a signal handler
+            max_scans (int): number of scans before stopping, if given
+
+        Returns:
+            int: number of data files processed
+        """
+        stop_event = stop_event or threading.Event()
+        logger.info(
+            f"Watching {self.watch_directory} for {self.pattern} every" \
+            f" {self.poll_interval} s..."
+        )
+        number_processed = 0
+        number_scans = 0
+        while not stop_event.is_set():
+            number_processed += len(self.scan())
+            number_scans += 1
+            if max_scans is not None and number_scans >= max_scans:
+                break
+            stop_event.wait(self.poll_interval)
+        logger.info(
+            f"Stopped watching {self.watch_directory}, processed" \
+            f" {number_processed} data files"
+        )
+        return number_processed
+
+    def scan(self):
+        """Process the data files of the watched directory that are ready
+
+        Returns:
+            list:
+                summary dictionary of each data file processed, as of a batch
+                run
+        """
+        try:
+            self.registry.reload_if_changed()
+
+        except Exception as e:
+            # The loaded reference data stays until a reload succeeds
+            logger.error(
+                "Error: failed to reload the reference data of" \
+                f" {self.config_file_path}, keeping the loaded reference" \
+                f" data and retrying on the next scan: {e}"
+            )
+        summaries = []
+        pending = {}
+        for data_file_path in self._list_data_files():
+            signature = pj.get_file_signature(data_file_path)
+            if signature is None \
+                or self._is_done(data_file_path, signature) \
+                or self._failed.get(data_file_path) == signature:
+                continue
+            # Wait for a scan with the same size and modification time
+            if self._pending.get(data_file_path) != signature:
+                pending[data_file_path] = signature
+                continue
+            summaries.append(self.process(data_file_path, signature))
+        self._pending = pending
+        return summaries
+
+    def process(self, data_file_path: str, signature: list = None):
+        """Run the reference book method over a data file and mark it done
+
+        Args:
+            data_file_path (str): file path of the .csv data file
+            signature (list):
+                [modification time, size] of the data file when found ready
+
+        Returns:
+            dict:
+                summary of the data file with keys file, output, success,
+                rows, seconds and error
+        """
+        start_time = time.perf_counter()
+        reference_data = self.registry.get(self.config_file_path)
+        config_data = reference_data.config_data
+        compression = config_data["outputs"].get("output_compression")
+        compute_workers = self.compute_workers \
+            if self.compute_workers is not None \
+            else config_data.get("compute_workers")
+        output_file_path = br.get_output_file_path(
+            data_file_path, self.output_directory, compression
+        )
+        signature = signature or pj.get_file_signature(data_file_path)
+        summary = {
+            "file": data_file_path,
+            "output": output_file_path,
+            "success": False,
+            "rows": 0,
+            "seconds": 0.0,
+            "error": None,
+        }
+        logger.info(f"Processing {data_file_path}...")
+        try:
+            if self.chunk_size is None:
+                summary["rows"] = pl.run_in_memory(
+                    data_file_path,
+                    config_data["data"]["data_columns"],
+                    output_file_path,
+                    reference_data.coeff,
+                    reference_data.K_index,
+                    column_dtypes=config_data["data"].get(
+                        "data_column_dtypes"
+                    ),
+                    compact_columns=config_data["data"].get(
+                        "compact_columns", False
+                    ),
+                    output_float_format=config_data["outputs"].get(
+                        "output_float_format"
+                    ),
+                    output_compression=compression,
+                    compute_workers=compute_workers
+                )
+            else:
+                summary["rows"] = pl.run_chunked(
+                    data_file_path,
+                    config_data["data"]["data_columns"],
+                    output_file_path,
+                    reference_data.coeff,
+                    reference_data.K_index,
+                    self.chunk_size,
+                    config_data["data"].get("data_column_dtypes"),
+                    config_data["data"].get("compact_columns", False),
+                    config_data["outputs"].get("output_float_format"),
+                    compression,
+                    compute_workers
+                )
+            summary["success"] = True
+
+        except Exception as e:
+            logger.error(f"Error: failed to process {data_file_path}: {e}")
+            summary["error"] = f"{type(e).__name__}: {e}"
+            self._failed[data_file_path] = signature
+
+        summary["seconds"] = time.perf_counter() - start_time
+        if summary["success"]:
+            self._write_done_marker(summary, signature)
+            self._done[data_file_path] = signature
+            self._failed.pop(data_file_path, None)
+            logger.info(
+                f"Processed {data_file_path} ({summary['rows']} rows) in" \
+                f" {summary['seconds']:.3f} s"
+            )
+        return summary
+
+    def get_done_marker_path(self, data_file_path: str):
+        """Returns the file path of the done marker of a data file"""
+        compression = self.registry.get(
+            self.config_file_path
+        ).config_data["outputs"].get("output_compression")
+        return br.get_output_file_path(
+            data_file_path, self.output_directory, compression
+        ) + DONE_MARKER_SUFFIX
+
+    def _list_data_files(self):
+        """Returns the data files of the watched directory, in name order"""
+        try:
+            entries = sorted(
+                os.scandir(self.watch_directory), key=lambda e: e.name
+            )
+
+        except FileNotFoundError:
+            logger.warning(
+                f"The watched directory {self.watch_directory} does not exist"
+            )
+            return []
+
+        # Hidden files include the temporary files of atomic writes
+        return [
+            entry.path for entry in entries
+            if not entry.name.startswith(".")
+            and fnmatch.fnmatch(entry.name, self.pattern)
+            and entry.is_file()
+        ]
+
+    def _is_done(self, data_file_path: str, signature: list):
+        """True if the data file was processed at its current signature"""
+        if data_file_path not in self._done:
+            self._done[data_file_path] = _read_done_marker(
+                self.get_done_marker_path(data_file_path)
+            )
+        return self._done[data_file_path] == signature
+
+    def _write_done_marker(self, summary: dict, signature: list):
+        """Write the done marker of a data file once its output is written"""
+        marker_file = summary["output"] + DONE_MARKER_SUFFIX
+        with die.atomic_output_file(marker_file) as temporary_file:
+            with open(temporary_file, "w") as f:
+                json.dump(
+                    {
+                        "file": os.path.abspath(summary["file"]),
+                        "data_file": signature,
+                        "output": summary["output"],
+                        "rows": summary["rows"],
+                    },
+                    f,
+                    indent=2
+                )
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def _read_done_marker(marker_file: str):
+    """Returns the data file signature of a done marker, None if unreadable"""
+    try:
+        with open(marker_file, "r") as f:
+            return json.load(f).get("data_file")
+
+    except FileNotFoundError:
+        return None
+
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Ignoring unreadable done marker {marker_file}: {e}")
+        return None
@@ -0,0 +1,29 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import os
+
+# Imports nothing from the project, so any module can use it, custom_logger
+# included
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def get_file_signature(file: str):
+    """[modification time, size] of a file, None if it does not exist"""
+    try:
+        stat = os.stat(file)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    except FileNotFoundError:
+        return None
+
+
+def get_file_identity(file: str):
+    """[device, inode] of a file, which a file replaced by another changes"""
+    stat = os.stat(file)
+    return [stat.st_dev, stat.st_ino]
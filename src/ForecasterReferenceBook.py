@@ -2,11 +2,28 @@
 # Modules
 # =============================================================================
 
+# Python in built modules
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+import math
+import threading
+
 # Third party modules
 import numpy as np
 
 # Custom modules
-from custom_logger import get_custom_logger
+from custom_logger import (
+    ArraySummary, 
+    get_custom_logger, 
+    summarise_array
+)
+from DataValidation import (
+    check_lower_bounds, 
+    get_precision_dtype, 
+    validate_lower_bounds,
+    ValidationError
+)
+import Instrumentation as instr
 
 # =============================================================================
 # Variables
@@ -21,11 +38,451 @@ NUMBER_COEFF = 3
 MIN_WIND_SPEED = 0
 MIN_CLOUD_COVER = 0
 
+# Rows of observations processed per block by the K lookup, so the bin
+# index temporaries stay in cache
+LOOKUP_BLOCK_SIZE = 16384
+
+# Data columns
+TEMP_NOON_COLUMN = "Temp. noon (celcius)"
+TEMP_DEW_POINT_NOON_COLUMN = "Temp. dew point noon (celcius)"
+WIND_SPEED_COLUMN = "Wind speed (knots)"
+CLOUD_COVER_COLUMN = "Cloud cover (oktas)"
+K_COLUMN = "K ()"
+TEMP_MIN_NOON_COLUMN = "Temp. min. noon (celcius)"
+# Scratch buffer of compute_tmin for the intermediate products
+SCRATCH_BUFFER = "scratch"
+
+# Rows of each slice of a batch computed by one thread of a parallel 
+# compute_tmin, so the slices of every column a thread works on stay in cache
+PARALLEL_SLICE_ROWS = 1 << 15
+
+# Thread pools of parallel compute_tmin calls, by number of workers, kept
+# for the life of the process so batches do not start threads each call
+_compute_executors = {}
+_compute_executors_lock = threading.Lock()
+
+# Physical lower bounds of the observations, (lower bound, inclusive)
+WIND_SPEED_BOUND = {WIND_SPEED_COLUMN: (MIN_WIND_SPEED, True)}
+CLOUD_COVER_BOUND = {CLOUD_COVER_COLUMN: (MIN_CLOUD_COVER, True)}
+TEMP_NOON_BOUND = {TEMP_NOON_COLUMN: (T_ABS, False)}
+TEMP_DEW_POINT_NOON_BOUND = {TEMP_DEW_POINT_NOON_COLUMN: (T_ABS, False)}
+OBSERVATION_LOWER_BOUNDS = {
+    **WIND_SPEED_BOUND,
+    **CLOUD_COVER_BOUND,
+    **TEMP_NOON_BOUND,
+    **TEMP_DEW_POINT_NOON_BOUND,
+}
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class KLookupIndex:
+    """Precompiled grid index of a K lookup table
+
+    The wind speed and cloud cover ranges of the K lookup table are turned
+    into sorted bin edges on each axis, and the K value of every (wind bin,
+    cloud cover bin) cell is resolved once when the index is built. K values
+    are then found with np.searchsorted on both axes and a gather from the
+    2-D grid, so lookups are O(N) with no per-observation by per-table-row
+    temporaries.
+
+    Each axis has one bin per edge value and one per open interval below,
+    between and above the edges, so the closed range bounds are honoured
+    exactly. Where ranges share a boundary (e.g. cloud cover of 2 oktas) the
+    first matching table row wins, and values matching no row take the K value
+    of the first row, as with the original match matrix lookup.
+
+    The bin edges and K values are held at the compute precision, so float32
+    observations are looked up without casting and K is found as float32.
+
+    Attributes:
+        dtype (np.dtype): floating point dtype of the edges and K values
+        wind_edges (np.ndarray): sorted unique wind speed range bounds
+        cover_edges (np.ndarray): sorted unique cloud cover range bounds
+        row_grid (np.ndarray): 
+            index of the K lookup table row used for each grid cell
+        K_grid (np.ndarray): K value for each grid cell
+    """
+
+    def __init__(
+        self,
+        min_wind: np.ndarray,
+        max_wind: np.ndarray,
+        min_cover: np.ndarray,
+        max_cover: np.ndarray,
+        K_values: np.ndarray,
+        precision: str = None
+    ):
+        """Build the grid index from the K lookup table arrays
+
+        Args:
+            min_wind (np.ndarray): 
+                lower bound of wind range for K value interval
+            max_wind (np.ndarray): 
+                upper bound of wind range for K value interval
+            min_cover (np.ndarray): 
+                lower bound of cloud cover range for K value interval
+            max_cover (np.ndarray): 
+                upper bound of cloud cover range for K value interval
+            K_values (np.ndarray): 
+                K values from which to choose appropriate K value
+            precision (str): 
+                "float32" or "float64", the dtype of the bin edges and K 
+                values, float64 if not given
+        """
+        self.dtype = get_precision_dtype(precision)
+        # Check if all K lookup values of table input arrays have the same 
+        # length
+        lengths = {
+            len(arr) for arr in [min_wind, max_wind, min_cover, max_cover]
+        }
+        if len(lengths) != 1:
+            raise ValidationError(
+                "All K lookup table input arrays must have the same length\n"
+                f"min_wind: {len(min_wind)} elements\n"
+                f"max_wind: {len(max_wind)} elements\n"
+                f"min_cover: {len(min_cover)} elements\n"
+                f"max_cover: {len(max_cover)} elements"
+            )
+        # Check max wind speeds should always be greater than min wind speeds
+        # for K lookup table arrays
+        if not np.all(max_wind >= min_wind):
+            raise ValidationError(
+                "Max wind speed should be greater than Min wind speed in K"
+                " lookup table arrays\n"
+                f"Wind speed min. (knots) data: {summarise_array(min_wind)}\n"
+                f"Wind speed max. (knots) data: {summarise_array(max_wind)}"
+            )
+        # Check max cloud cover should always be greater than min cloud cover
+        # for K lookup table arrays
+        if not np.all(max_cover >= min_cover):
+            raise ValidationError(
+                "Max cloud cover should be greater than Min cloud cover in K"
+                " lookup table arrays\n"
+                "Cloud cover min. (oktas) data:"
+                f" {summarise_array(min_cover)}\n"
+                "Cloud cover max. (oktas) data:"
+                f" {summarise_array(max_cover)}"
+            )
+
+        wind_edges = _get_bin_edges(min_wind, max_wind)
+        cover_edges = _get_bin_edges(min_cover, max_cover)
+
+        # Resolve the first matching table row for a representative point of
+        # every grid cell, only (wind bins x cloud bins x table rows) in size
+        wind_points = _get_bin_points(wind_edges)[:, None, None]
+        cover_points = _get_bin_points(cover_edges)[None, :, None]
+        matches = (
+            (wind_points >= min_wind)
+            & (wind_points <= max_wind)
+            & (cover_points >= min_cover)
+            & (cover_points <= max_cover)
+        )
+        self.row_grid = matches.argmax(axis=2)
+        K_grid = np.asarray(K_values, dtype=np.float64)[self.row_grid]
+        self.wind_edges = wind_edges.astype(self.dtype, copy=False)
+        self.cover_edges = cover_edges.astype(self.dtype, copy=False)
+        self.K_grid = K_grid.astype(self.dtype, copy=False)
+
+        # Python copies of the index for single observation lookups, holding
+        # the values of the index at its dtype
+        self._wind_edges = self.wind_edges.tolist()
+        self._cover_edges = self.cover_edges.tolist()
+        self._K_rows = self.K_grid.tolist()
+
+    @instr.instrument()
+    def lookup(
+        self, 
+        wind_speed: np.ndarray, 
+        cloud_cover: np.ndarray, 
+        validate: bool = True,
+        out: np.ndarray = None
+    ):
+        """Find the K values for wind speed and cloud cover observations
+
+        The observations are processed in blocks of LOOKUP_BLOCK_SIZE rows,
+        so the only temporaries are block-sized bin indices.
+
+        Args:
+            wind_speed (np.ndarray): wind speed to find K Value
+            cloud_cover (np.ndarray): cloud cover to find K
+            validate (bool): 
+                check the observations are the same length, finite and 
+                non-negative, False if the caller has already checked them
+            out (np.ndarray): 
+                array of len(wind_speed) to write the K values to, allocated
+                if not given
+
+        Returns:
+            np.ndarray: 
+                K values for given wind and cloud cover inputs, 
+                len(wind_speed)
+        """
+        # Check Wind speeds (knots), should be magnitudes and thus positive,
+        # and Cloud cover (oktas), should be non-negative otherwise 
+        # non-physical
+        if validate:
+            check_lower_bounds(
+                {
+                    WIND_SPEED_COLUMN: wind_speed, 
+                    CLOUD_COVER_COLUMN: cloud_cover
+                },
+                {**WIND_SPEED_BOUND, **CLOUD_COVER_BOUND}
+            )
+
+        # Log function entry
+        logger.info(
+            f"Finding for K value given wind speed and cloud cover data..."
+        )
+
+        try:
+            K = np.empty(len(wind_speed), self.K_grid.dtype) if out is None \
+                else out
+            self._lookup_into(wind_speed, cloud_cover, K)
+            logger.debug("K value found: %s", ArraySummary(K))
+            logger.info(
+                f"Found K value(s) for given wind speed and cloud cover data"
+            )
+            return K
+
+        except ValueError as ve:
+            logger.critical(
+                f"ValueError: encountered while finding K values: {ve}"
+            )
+            raise
+
+        except IndexError as ie:
+            logger.critical(
+                f"IndexError: encountered while processing indices: {ie}"
+            )
+            raise
+
+        except Exception as e:
+            logger.error(f"Error: unexpected error occurred: {e}")
+            raise RuntimeError(
+                "RuntimeError: unexpected error occurred in" \
+                f" KLookupIndex.lookup: {e}"
+            ) from e
+
+    def _lookup_into(
+        self, 
+        wind_speed: np.ndarray, 
+        cloud_cover: np.ndarray, 
+        K: np.ndarray
+    ):
+        """Write the K values of checked observations to K, without logging
+
+        Holds no state between calls, so threads can look up disjoint 
+        slices of the same arrays at once.
+
+        Args:
+            wind_speed (np.ndarray): rounded wind speed (knots)
+            cloud_cover (np.ndarray): rounded cloud cover (oktas)
+            K (np.ndarray): array of len(wind_speed) to write the K values to
+        """
+        number_rows = len(wind_speed)
+        K_flat = self.K_grid.ravel()
+        for start in range(0, number_rows, LOOKUP_BLOCK_SIZE):
+            stop = min(start + LOOKUP_BLOCK_SIZE, number_rows)
+
+            # Find the flat grid cell of each wind speed and cloud cover
+            bins = _get_bin_indices(self.wind_edges, wind_speed[start:stop])
+            bins *= self.K_grid.shape[1]
+            bins += _get_bin_indices(
+                self.cover_edges, cloud_cover[start:stop]
+            )
+
+            # Assign corresponding K values
+            K[start:stop] = K_flat.take(bins)
+
+    def lookup_single(self, wind_speed: float, cloud_cover: float):
+        """Find the K value for one wind speed and cloud cover observation
+
+        Uses bisect on Python copies of the bin edges, with none of the 
+        checks or logging of lookup, so the observation must already be
+        rounded and checked.
+
+        Args:
+            wind_speed (float): rounded wind speed (knots)
+            cloud_cover (float): rounded cloud cover (oktas)
+
+        Returns:
+            float: K value, equal to that found by lookup
+        """
+        wind_bin = bisect_left(self._wind_edges, wind_speed) \
+            + bisect_right(self._wind_edges, wind_speed)
+        cover_bin = bisect_left(self._cover_edges, cloud_cover) \
+            + bisect_right(self._cover_edges, cloud_cover)
+        return self._K_rows[wind_bin][cover_bin]
+
+
+class ReferenceBook:
+    """Forecasters reference book method for single observations
+
+    Holds the coefficients as scalars and the K lookup index, so one
+    observation is computed with scalar arithmetic and bisect rather than 
+    NumPy arrays, for low latency calls from online services. Results are 
+    computed at the dtype of the K lookup index, as Python floats for 
+    float64 and NumPy scalars otherwise, and are identical to rounding, 
+    KLookupIndex.lookup and calculate_temperature_min_noon_celcius on 
+    arrays of that dtype.
+
+    Attributes:
+        coeff (tuple): the three coefficients of the linear calculation
+        K_index (KLookupIndex): grid index of the K lookup table
+    """
+
+    def __init__(self, coeff: list, K_index: KLookupIndex):
+        """Hold the reference data of the method
+
+        Args:
+            coeff (list): 
+                A list of three coefficients used in the linear calculation,
+                each a single value or single value array
+            K_index (KLookupIndex): grid index of the K lookup table
+        """
+        if len(coeff) != NUMBER_COEFF:
+            raise ValidationError(
+                "The coefficients list must contain exactly three values"
+            )
+        if any(np.size(c) != 1 for c in coeff):
+            raise ValidationError(
+                "Each coefficient must be a single value for single" \
+                " observations"
+            )
+        # Scalar type of the dtype of the K lookup index
+        self._scalar = float if K_index.dtype == np.float64 \
+            else K_index.dtype.type
+        self.coeff = tuple(
+            self._scalar(np.asarray(c, dtype=np.float64).item()) 
+            for c in coeff
+        )
+        self.K_index = K_index
+
+    def tmin_single(
+        self,
+        T_12: float,
+        Td_12: float,
+        wind_speed: float,
+        cloud_cover: float
+    ):
+        """Calculate Temp. min. noon (celcius) for a single observation
+
+        Args:
+            T_12 (float): temperature at noon (celcius)
+            Td_12 (float): dew point temperature at noon (celcius)
+            wind_speed (float): wind speed (knots), rounded for K lookup
+            cloud_cover (float): cloud cover (oktas), rounded for K lookup
+
+        Returns:
+            float: minimum temperature at noon (celcius), a NumPy scalar of
+            the dtype of the K lookup index if not float64
+
+        Raises:
+            ValidationError: 
+                If an observation is not finite or not within its physical 
+                bounds
+        """
+        # The observations at the dtype of the K lookup index, as the data 
+        # columns are imported for arrays
+        if self._scalar is not float:
+            T_12, Td_12, wind_speed, cloud_cover = (
+                self._scalar(x) for x in (T_12, Td_12, wind_speed, cloud_cover)
+            )
+
+        # Round the wind speed and cloud cover for K lookup, NaN and 
+        # infinite values cannot be rounded
+        try:
+            wind_speed = round(wind_speed)
+            cloud_cover = round(cloud_cover)
+        except (ValueError, OverflowError):
+            raise ValidationError(
+                "Non-physical values, expected finite wind speed and cloud" \
+                f" cover: {wind_speed}, {cloud_cover}"
+            ) from None
+
+        # Check the physical bounds of the observation, NaN fails each check
+        if not (
+            wind_speed >= MIN_WIND_SPEED
+            and cloud_cover >= MIN_CLOUD_COVER
+            and T_ABS < T_12 < math.inf
+            and T_ABS < Td_12 < math.inf
+        ):
+            raise ValidationError(
+                f"Non-physical values, expected finite {WIND_SPEED_COLUMN}" \
+                f" >= {MIN_WIND_SPEED}, {CLOUD_COVER_COLUMN} >=" \
+                f" {MIN_CLOUD_COVER}, temperatures > {T_ABS}: {T_12}," \
+                f" {Td_12}, {wind_speed}, {cloud_cover}"
+            )
+
+        # Forecasters Reference book temperature calculation
+        c0, c1, c2 = self.coeff
+        K = self.K_index.lookup_single(wind_speed, cloud_cover)
+        return c0 * T_12 + c1 * Td_12 + c2 + K
+
+
 # =============================================================================
 # Functions
 # =============================================================================
 
 
+def _get_bin_edges(min_values: np.ndarray, max_values: np.ndarray):
+    """Sorted unique range bounds of one axis of the K lookup table
+
+    Args:
+        min_values (np.ndarray): lower bounds of the table ranges
+        max_values (np.ndarray): upper bounds of the table ranges
+
+    Returns:
+        np.ndarray: sorted unique bounds, NaN bounds removed
+    """
+    edges = np.unique(
+        np.concatenate([min_values, max_values]).astype(np.float64)
+    )
+    return edges[~np.isnan(edges)]
+
+
+def _get_bin_points(edges: np.ndarray):
+    """Representative value of each bin of one axis of the grid index
+
+    Bin 2i + 1 holds values equal to edges[i], and bin 2i holds values in the
+    open interval below edges[i], so any point strictly within the interval
+    represents it.
+
+    Args:
+        edges (np.ndarray): sorted unique range bounds of the axis
+
+    Returns:
+        np.ndarray: one value per bin, 2 * len(edges) + 1 values
+    """
+    if len(edges) == 0:
+        return np.array([np.nan])
+    points = np.empty(2 * len(edges) + 1)
+    points[1::2] = edges
+    points[0] = np.nextafter(edges[0], -np.inf)
+    points[2:-1:2] = np.nextafter(edges[:-1], edges[1:])
+    points[-1] = np.nextafter(edges[-1], np.inf)
+    return points
+
+
+def _get_bin_indices(edges: np.ndarray, values: np.ndarray):
+    """Bin of the grid index axis for each value
+
+    Args:
+        edges (np.ndarray): sorted unique range bounds of the axis
+        values (np.ndarray): values to place into the bins
+
+    Returns:
+        np.ndarray: bin index of each value, NaN values in the last bin
+    """
+    bins = np.searchsorted(edges, values, side="left")
+    bins += np.searchsorted(edges, values, side="right")
+    return bins
+
+
+@instr.instrument()
 def get_K_lookup(
     wind_speed: np.ndarray,
     min_wind: np.ndarray,
@@ -54,95 +511,18 @@ def get_K_lookup(
         np.ndarray: 
             K values for given wind and cloud cover inputs, len(wind_speed)
     """
-    # Check if all K lookup values of table input arrays have the same length
-    lengths = {len(arr) for arr in [min_wind, max_wind, min_cover, max_cover]}
-    assert len(lengths) == 1, (
-        "All K lookup table input arrays must have the same length\n"
-        f"min_wind: {len(min_wind)} elements\n"
-        f"max_wind: {len(max_wind)} elements\n"
-        f"min_cover: {len(min_cover)} elements\n"
-        f"max_cover: {len(max_cover)} elements"
-    )
-    # Check if wind speed and cloud cover arrays have the same length
-    assert len(wind_speed) == len(cloud_cover), (
-        "Wind speed and cloud cover arrays must have the same length\n"
-        f"wind_speed: {len(wind_speed)} elements\n"
-        f"cloud_cover: {len(cloud_cover)})elements"
-    )
-    # Check Wind speeds (knots), should be magnitudes and thus positive
-    assert np.all(wind_speed >= MIN_WIND_SPEED), (
-        "Wind speed (knots) should be a magnitude and non-negative\n"
-        f"Wind speed: {wind_speed}"
-    )
-    # Check Cloud cover (oktas), should be non-negative otherwise non-physical
-    assert np.all(cloud_cover >= MIN_CLOUD_COVER), (
-        "Wind speed (knots) should be a magnitude and non-negative\n"
-        f"cloud cover: {cloud_cover}"
-    )
-    # Check max wind speeds should always be greater than min wind speeds for 
-    # K lookup table arrays
-    assert np.all(max_wind >= min_wind), (
-        "Max wind speed should be greater than Min wind speed in K lookup"
-        " table arrays\n"
-        f"Wind speed min. (knots) data: {min_wind}\n"
-        f"Wind speed max. (knots) data: {max_wind}"
-    )
-    # Check max cloud cover should always be greater than min cloud cover for
-    # K lookup table arrays
-    assert np.all(max_cover >= min_cover), (
-        "Max cloud cover should be greater than Min cloud cover in K lookup"
-        " table arrays\n"
-        f"Wind speed min. (knots) data: {min_cover}\n"
-        f"Wind speed max. (knots) data: {max_cover}"
-    )
-
-    # Log function entry
-    logger.info(
-        f"Finding for K value given wind speed and cloud cover data..."
-    )
-
-    try:
-        #Find indices of wind speed and cloud cover falls within min/max range
-        matches = (
-            (wind_speed[:, None] >= min_wind)
-            & (wind_speed[:, None] <= max_wind)
-            & (cloud_cover[:, None] >= min_cover)
-            & (cloud_cover[:, None] <= max_cover)
-        )
-        indices = matches.argmax(axis=1)
-
-        # Assign corresponding K values
-        K = K_values[indices]
-        logger.debug(f"K value found: {K}")
-        logger.info(
-            f"Found K value(s) for given wind speed and cloud cover data"
-        )
-        return K
-
-    except ValueError as ve:
-        logger.critical(
-            f"ValueError: encountered while finding K values: {ve}"
-        )
-        raise
-
-    except IndexError as ie:
-        logger.critical(
-            f"IndexError: encountered while processing indices: {ie}"
-        )
-        raise
-
-    except Exception as e:
-        logger.error(f"Error: unexpected error occurred: {e}")
-        raise RuntimeError(
-            f"RuntimeError: unexpected error occurred in get_K_lookup: {e}"
-        ) from e
+    # Compile the K lookup table into a grid index and gather K values
+    K_index = KLookupIndex(min_wind, max_wind, min_cover, max_cover, K_values)
+    return K_index.lookup(wind_speed, cloud_cover)
 
 
+@instr.instrument()
 def calculate_temperature_min_noon_celcius(
     T_12: np.ndarray, 
     Td_12: np.ndarray, 
     K: np.ndarray, 
-    coeff: list
+    coeff: list,
+    validate: bool = True
 ):
     """Calculate the minimum temperature at noon (celcius) based on the given 
         parameters
@@ -153,31 +533,32 @@ def calculate_temperature_min_noon_celcius(
         K (np.ndarray):  The K value used in the calculation
         coeff (list): 
             A list of three coefficients used in the linear calculation
+        validate (bool): 
+            check the temperatures are finite and above absolute zero, False
+            if the caller has already checked them
 
     Returns:
         float: The calculated minimum temperature at noon
     """
-    # Assert that T_12, Td_12, and K are NumPy arrays
-    assert isinstance(T_12, np.ndarray), "T_12 must be a NumPy array"
-    assert isinstance(Td_12, np.ndarray), "Td_12 must be a NumPy array"
-    assert isinstance(K, np.ndarray), "K must be a NumPy array"
-    # Assert that coeff is a list of NumPy arrays
-    assert isinstance(coeff, list), "Coefficients must be a list"
-    assert all(isinstance(c, np.ndarray) for c in coeff), (
-        "All coefficients must be NumPy arrays"
-    )
-    # Check T_12 is a physical temperature
-    assert np.all(T_12 > T_ABS), (
-        f"Non-physical values in Temp. noon (celcius) data: {T_12}"
-    )
-    # Check Td_12 is a physical temperature
-    assert np.all(Td_12 > T_ABS), (
-        f"Non-physical values in Temp. dew point noon (celcius) data: {Td_12}"
-    )
-    # Check that the coefficients list contains exactly three values
-    assert len(coeff) == NUMBER_COEFF, (
-        "The coefficients list must contain exactly three values"
-    )
+    # Check that T_12, Td_12, and K are NumPy arrays
+    for name, arr in [("T_12", T_12), ("Td_12", Td_12), ("K", K)]:
+        if not isinstance(arr, np.ndarray):
+            raise ValidationError(f"{name} must be a NumPy array")
+    # Check that coeff is a list of exactly three NumPy arrays
+    if not isinstance(coeff, list):
+        raise ValidationError("Coefficients must be a list")
+    if not all(isinstance(c, np.ndarray) for c in coeff):
+        raise ValidationError("All coefficients must be NumPy arrays")
+    if len(coeff) != NUMBER_COEFF:
+        raise ValidationError(
+            "The coefficients list must contain exactly three values"
+        )
+    # Check T_12 and Td_12 are physical temperatures
+    if validate:
+        check_lower_bounds(
+            {TEMP_NOON_COLUMN: T_12, TEMP_DEW_POINT_NOON_COLUMN: Td_12},
+            {**TEMP_NOON_BOUND, **TEMP_DEW_POINT_NOON_BOUND}
+        )
 
     # Log function entry
     logger.info(f"Calculating minimum temperature at noon (celcius)...")
@@ -185,7 +566,7 @@ def calculate_temperature_min_noon_celcius(
     try:
         # Perform the Forecasters Reference book temperature calculation
         Tmin_12 = coeff[0] * T_12 + coeff[1] * Td_12 + coeff[2] + K
-        logger.debug(f"Min. temperature at noon: {Tmin_12}")
+        logger.debug("Min. temperature at noon: %s", ArraySummary(Tmin_12))
         logger.info(f"Calculated minimum temperature at noon (celcius)")
         return Tmin_12
 
@@ -203,3 +584,313 @@ def calculate_temperature_min_noon_celcius(
             "RuntimeError: unexpected error occurred in" \
             f" calculate_temperature_min_noon_celcius: {e}"
         ) from e
+
+
+def allocate_tmin_buffers(number_rows: int, dtype=np.float64):
+    """Allocate output buffers for compute_tmin to reuse across batches
+
+    Args:
+        number_rows (int): largest number of rows of a batch
+        dtype (np.dtype): dtype of the buffers
+
+    Returns:
+        dict: 
+            empty arrays of number_rows for the rounded wind speed and cloud
+            cover, K, Temp. min. noon (celcius) and the scratch buffer
+    """
+    return {
+        name: np.empty(number_rows, dtype) for name in [
+            WIND_SPEED_COLUMN,
+            CLOUD_COVER_COLUMN,
+            K_COLUMN,
+            TEMP_MIN_NOON_COLUMN,
+            SCRATCH_BUFFER,
+        ]
+    }
+
+
+@instr.instrument()
+def compute_tmin(
+    batch: dict,
+    coeff: list,
+    K_index: KLookupIndex,
+    out: dict = None,
+    validate: bool = True,
+    workers: int = None
+):
+    """Round, look up K, and calculate Temp. min. noon (celcius) for a batch
+
+    Fused entry point of the reference book method. The rounding, K gather 
+    and linear combination write into the caller's buffers with out= and 
+    in-place ufuncs, so repeated batches reuse memory rather than allocating
+    per call. Results match rounding, KLookupIndex.lookup and 
+    calculate_temperature_min_noon_celcius bit for bit.
+
+    With more than one worker, batches of more than PARALLEL_SLICE_ROWS rows
+    are split into slices of that many rows, each rounded, checked, looked 
+    up and calculated by a thread of a pool, writing to its own rows of the
+    buffers. NumPy releases the GIL in these loops, so the threads run on 
+    separate cores, and the results are the same bit for bit.
+
+    Args:
+        batch (dict): 
+            arrays of the Temp. noon (celcius), Temp. dew point noon 
+            (celcius), Wind speed (knots) and Cloud cover (oktas) columns
+        coeff (list): 
+            A list of three coefficients used in the linear calculation
+        K_index (KLookupIndex): grid index of the K lookup table
+        out (dict): 
+            buffers from allocate_tmin_buffers of at least the batch length,
+            allocated at the precision of K_index if not given
+        validate (bool): 
+            check the observations are finite and within physical bounds
+        workers (int): 
+            number of threads computing the batch, one if not given, see 
+            get_compute_workers
+
+    Returns:
+        dict: 
+            views of the buffers for the batch rows, keyed by the rounded 
+            Wind speed (knots) and Cloud cover (oktas), K () and Temp. min. 
+            noon (celcius) columns. Integer wind speed and cloud cover need 
+            no rounding and are returned as given. The views are overwritten
+            by the next call with the same buffers.
+    """
+    number_rows = len(batch[TEMP_NOON_COLUMN])
+    if out is None:
+        out = allocate_tmin_buffers(number_rows, K_index.dtype)
+    # Check the buffers can hold the batch
+    for name, buffer in out.items():
+        if len(buffer) < number_rows:
+            raise ValidationError(
+                f"Buffer {name} of {len(buffer)} rows is too small for a" \
+                f" batch of {number_rows} rows"
+            )
+    if len(coeff) != NUMBER_COEFF:
+        raise ValidationError(
+            "The coefficients list must contain exactly three values"
+        )
+    workers = get_compute_workers(workers)
+
+    # pandas parses the columns of a data file without rows as objects
+    batch = {
+        **batch,
+        **{
+            name: np.asarray(batch[name], dtype=K_index.dtype)
+            for name in OBSERVATION_LOWER_BOUNDS
+            if np.asarray(batch[name]).dtype == object
+        },
+    }
+
+    # Log function entry
+    logger.info(
+        f"Computing minimum temperature at noon (celcius) for a batch of" \
+        f" {number_rows} rows..."
+    )
+    if workers > 1 and number_rows > PARALLEL_SLICE_ROWS:
+        results = _compute_tmin_parallel(
+            batch, coeff, K_index, out, number_rows, validate, workers
+        )
+        logger.info(
+            f"Computed minimum temperature at noon (celcius) for a batch of" \
+            f" {number_rows} rows with {workers} threads"
+        )
+        return results
+
+    # Round the wind speed and cloud cover for K lookup
+    results = {}
+    with instr.stage("rounding") as counters:
+        for name in [WIND_SPEED_COLUMN, CLOUD_COVER_COLUMN]:
+            if np.issubdtype(batch[name].dtype, np.integer):
+                results[name] = batch[name]
+            else:
+                results[name] = np.round(
+                    batch[name], out=out[name][:number_rows]
+                )
+        counters.update(rows_in=number_rows, rows_out=number_rows)
+
+    T_12 = batch[TEMP_NOON_COLUMN]
+    Td_12 = batch[TEMP_DEW_POINT_NOON_COLUMN]
+    if validate:
+        check_lower_bounds(
+            {
+                WIND_SPEED_COLUMN: results[WIND_SPEED_COLUMN],
+                CLOUD_COVER_COLUMN: results[CLOUD_COVER_COLUMN],
+                TEMP_NOON_COLUMN: T_12,
+                TEMP_DEW_POINT_NOON_COLUMN: Td_12,
+            },
+            OBSERVATION_LOWER_BOUNDS
+        )
+
+    try:
+        # K lookup values into the K buffer
+        K = K_index.lookup(
+            results[WIND_SPEED_COLUMN],
+            results[CLOUD_COVER_COLUMN],
+            validate=False,
+            out=out[K_COLUMN][:number_rows]
+        )
+        results[K_COLUMN] = K
+
+        # Forecasters Reference book temperature calculation, in the same 
+        # order of operations as calculate_temperature_min_noon_celcius
+        Tmin_12 = out[TEMP_MIN_NOON_COLUMN][:number_rows]
+        scratch = out[SCRATCH_BUFFER][:number_rows]
+        with instr.stage("tmin_calculation") as counters:
+            np.multiply(coeff[0], T_12, out=Tmin_12)
+            np.multiply(coeff[1], Td_12, out=scratch)
+            np.add(Tmin_12, scratch, out=Tmin_12)
+            np.add(Tmin_12, coeff[2], out=Tmin_12)
+            np.add(Tmin_12, K, out=Tmin_12)
+            counters.update(rows_in=number_rows, rows_out=number_rows)
+        results[TEMP_MIN_NOON_COLUMN] = Tmin_12
+
+        logger.debug("Min. temperature at noon: %s", ArraySummary(Tmin_12))
+        logger.info(
+            f"Computed minimum temperature at noon (celcius) for a batch of" \
+            f" {number_rows} rows"
+        )
+        return results
+
+    except ValueError as ve:
+        logger.critical(f"ValueError: {ve}")
+        raise
+
+    except TypeError as te:
+        logger.critical(f"TypeError: {te}")
+        raise
+
+    except Exception as e:
+        logger.error(f"Error: unexpected error occurred: {e}")
+        raise RuntimeError(
+            f"RuntimeError: unexpected error occurred in compute_tmin: {e}"
+        ) from e
+
+
+def get_compute_workers(workers: int = None):
+    """Returns the number of threads of compute_tmin
+
+    Args:
+        workers (int): number of threads, one if not given
+
+    Returns:
+        int: the number of threads
+
+    Raises:
+        ValueError: If workers is not a positive integer
+    """
+    if workers is None:
+        return 1
+    if isinstance(workers, bool) or not isinstance(workers, int) \
+        or workers < 1:
+        raise ValueError(
+            f"Compute workers must be a positive integer, got {workers}"
+        )
+    return workers
+
+
+def _get_compute_executor(workers: int):
+    """Returns the thread pool of workers threads, started on first use"""
+    with _compute_executors_lock:
+        executor = _compute_executors.get(workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="compute_tmin"
+            )
+            _compute_executors[workers] = executor
+        return executor
+
+
+def _compute_tmin_parallel(
+    batch: dict,
+    coeff: list,
+    K_index: KLookupIndex,
+    out: dict,
+    number_rows: int,
+    validate: bool,
+    workers: int
+):
+    """compute_tmin of a batch sliced across a thread pool
+
+    Each slice is rounded, checked, looked up and calculated in the order 
+    of operations of compute_tmin. If any slice fails the checks, the whole
+    batch is checked again to report the offending rows as compute_tmin 
+    does.
+
+    Args:
+        batch (dict): arrays of the observation columns
+        coeff (list): 
+            A list of three coefficients used in the linear calculation
+        K_index (KLookupIndex): grid index of the K lookup table
+        out (dict): buffers from allocate_tmin_buffers
+        number_rows (int): number of rows of the batch
+        validate (bool): 
+            check the observations are finite and within physical bounds
+        workers (int): number of threads
+
+    Returns:
+        dict: views of the buffers for the batch rows, as compute_tmin
+    """
+    # Integer wind speed and cloud cover need no rounding
+    results = {
+        name: batch[name] if np.issubdtype(batch[name].dtype, np.integer)
+        else out[name][:number_rows]
+        for name in [WIND_SPEED_COLUMN, CLOUD_COVER_COLUMN]
+    }
+    results[K_COLUMN] = out[K_COLUMN][:number_rows]
+    results[TEMP_MIN_NOON_COLUMN] = out[TEMP_MIN_NOON_COLUMN][:number_rows]
+    scratch = out[SCRATCH_BUFFER][:number_rows]
+    T_12 = batch[TEMP_NOON_COLUMN]
+    Td_12 = batch[TEMP_DEW_POINT_NOON_COLUMN]
+
+    def compute_slice(start: int):
+        """Compute a slice of rows, returns False if it fails the checks"""
+        rows = slice(start, min(start + PARALLEL_SLICE_ROWS, number_rows))
+        for name in [WIND_SPEED_COLUMN, CLOUD_COVER_COLUMN]:
+            if results[name] is not batch[name]:
+                np.round(batch[name][rows], out=results[name][rows])
+        wind_speed = results[WIND_SPEED_COLUMN][rows]
+        cloud_cover = results[CLOUD_COVER_COLUMN][rows]
+        if validate and not validate_lower_bounds(
+            {
+                WIND_SPEED_COLUMN: wind_speed,
+                CLOUD_COVER_COLUMN: cloud_cover,
+                TEMP_NOON_COLUMN: T_12[rows],
+                TEMP_DEW_POINT_NOON_COLUMN: Td_12[rows],
+            },
+            OBSERVATION_LOWER_BOUNDS
+        ):
+            return False
+        K = results[K_COLUMN][rows]
+        K_index._lookup_into(wind_speed, cloud_cover, K)
+        Tmin_12 = results[TEMP_MIN_NOON_COLUMN][rows]
+        np.multiply(coeff[0], T_12[rows], out=Tmin_12)
+        np.multiply(coeff[1], Td_12[rows], out=scratch[rows])
+        np.add(Tmin_12, scratch[rows], out=Tmin_12)
+        np.add(Tmin_12, coeff[2], out=Tmin_12)
+        np.add(Tmin_12, K, out=Tmin_12)
+        return True
+
+    with instr.stage("parallel_compute") as counters:
+        # Wait for every slice, raising the first error of any
+        valid = list(
+            _get_compute_executor(workers).map(
+                compute_slice, range(0, number_rows, PARALLEL_SLICE_ROWS)
+            )
+        )
+        counters.update(rows_in=number_rows, rows_out=number_rows)
+    if not all(valid):
+        check_lower_bounds(
+            {
+                WIND_SPEED_COLUMN: results[WIND_SPEED_COLUMN],
+                CLOUD_COVER_COLUMN: results[CLOUD_COVER_COLUMN],
+                TEMP_NOON_COLUMN: T_12,
+                TEMP_DEW_POINT_NOON_COLUMN: Td_12,
+            },
+            OBSERVATION_LOWER_BOUNDS
+        )
+    logger.debug(
+        "Min. temperature at noon: %s", 
+        ArraySummary(results[TEMP_MIN_NOON_COLUMN])
+    )
+    return results
@@ -0,0 +1,406 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# Resource usage is only available on Unix
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Third party modules
+import numpy as np
+
+# Custom modules
+from custom_logger import get_custom_logger
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Logging
+logger = get_custom_logger("data/logging_config.yaml")
+
+# Metrics file formats by file extension, any other extension is JSON
+METRICS_FILE_FORMAT_EXTENSIONS = {
+    ".json": "json",
+    ".prom": "prometheus",
+    ".txt": "prometheus",
+}
+METRICS_FILE_FORMATS = ("json", "prometheus")
+
+# Prefix of the Prometheus metric names
+METRIC_PREFIX = "forecasters_reference_book_stage"
+
+# Prometheus metric name suffix, type and help of each stage metric
+PROMETHEUS_METRICS = {
+    "calls": ("calls_total", "counter", "Number of calls of the stage"),
+    "wall_seconds": (
+        "wall_seconds_total", "counter", "Wall time spent in the stage"
+    ),
+    "cpu_seconds": (
+        "cpu_seconds_total", "counter", "Process CPU time spent in the stage"
+    ),
+    "rows_in": ("rows_in_total", "counter", "Rows into the stage"),
+    "rows_out": ("rows_out_total", "counter", "Rows out of the stage"),
+    "nan_rows_removed": (
+        "nan_rows_removed_total", "counter",
+        "Rows with missing values removed by the stage"
+    ),
+    "peak_rss_bytes": (
+        "peak_rss_bytes", "gauge",
+        "Peak resident set size of the process during the stage"
+    ),
+}
+
+# Metrics of each stage, keyed by stage name, and the counters of the stage
+# running in the current thread
+_stage_metrics = {}
+_stage_metrics_lock = threading.Lock()
+_current_counters = contextvars.ContextVar("current_counters", default=None)
+
+# Stage metrics are only recorded once enabled, e.g. by --metrics-file, so
+# the stages on hot paths cost a flag check otherwise
+_stage_metrics_enabled = False
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def stage(stage_name: str):
+    """Record the wall time, CPU time, rows and peak memory of a stage
+
+    Runs of the same stage are summed, so batches of a chunked run add up.
+    Stages can be nested, and the time of an inner stage also counts towards
+    the outer stage. Nothing is recorded unless enable_stage_metrics has
+    been called.
+
+    Args:
+        stage_name (str): name the metrics of the stage are recorded under
+
+    Returns:
+        contextlib.AbstractContextManager:
+            context yielding the counters of the stage, e.g. rows_in,
+            rows_out and nan_rows_removed, also set with add_stage_counters
+    """
+    if not _stage_metrics_enabled:
+        return contextlib.nullcontext({})
+    return _recorded_stage(stage_name)
+
+
+@contextlib.contextmanager
+def _recorded_stage(stage_name: str):
+    """Record the metrics of a stage, see stage"""
+    counters = {}
+    token = _current_counters.set(counters)
+    start_peak_rss = get_peak_rss()
+    start_rss = get_current_rss()
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        yield counters
+    finally:
+        wall_seconds = time.perf_counter() - start_wall
+        cpu_seconds = time.process_time() - start_cpu
+        _current_counters.reset(token)
+        _record_stage(
+            stage_name,
+            wall_seconds,
+            cpu_seconds,
+            _get_stage_peak_rss(start_peak_rss, start_rss),
+            counters
+        )
+
+
+def instrument(stage_name: str = None):
+    """Decorate a function to record its metrics as a stage
+
+    Rows in are counted from the first array or dictionary of arrays
+    argument and rows out from an array or dictionary of arrays result,
+    unless the function sets them with add_stage_counters.
+
+    Args:
+        stage_name (str):
+            name the metrics are recorded under, the function's qualified
+            name if not given
+
+    Returns:
+        callable: the decorator
+    """
+    def decorator(function):
+        name = stage_name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _stage_metrics_enabled:
+                return function(*args, **kwargs)
+            with _recorded_stage(name) as counters:
+                result = function(*args, **kwargs)
+                if "rows_in" not in counters:
+                    rows_in = next(
+                        (
+                            rows for rows in map(_count_rows, args)
+                            if rows is not None
+                        ),
+                        None
+                    )
+                    if rows_in is not None:
+                        counters["rows_in"] = rows_in
+                rows_out = _count_rows(result)
+                if "rows_out" not in counters and rows_out is not None:
+                    counters["rows_out"] = rows_out
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def enable_stage_metrics(enabled: bool = True):
+    """Turn the recording of stage metrics on or off for this process
+
+    Args:
+        enabled (bool): True to record the metrics of the stages run next
+    """
+    global _stage_metrics_enabled
+    _stage_metrics_enabled = enabled
+
+
+def stage_metrics_enabled():
+    """Returns True if stage metrics are being recorded"""
+    return _stage_metrics_enabled
+
+
+def add_stage_counters(**counters):
+    """Add to the counters of the stage running in the current thread
+
+    Does nothing outside a stage.
+
+    Args:
+        **counters (int): counts to add, e.g. nan_rows_removed=3
+    """
+    current_counters = _current_counters.get()
+    if current_counters is None:
+        return
+    for name, count in counters.items():
+        current_counters[name] = current_counters.get(name, 0) + int(count)
+
+
+def get_stage_metrics():
+    """Returns a copy of the metrics of each stage
+
+    Returns:
+        dict:
+            calls, wall_seconds, cpu_seconds, peak_rss_bytes and any row
+            counters of each stage, keyed by stage name
+    """
+    with _stage_metrics_lock:
+        return {
+            stage_name: dict(metrics)
+            for stage_name, metrics in _stage_metrics.items()
+        }
+
+
+def merge_stage_metrics(stage_metrics: dict):
+    """Add the stage metrics of another process, e.g. a batch worker
+
+    Args:
+        stage_metrics (dict): metrics from get_stage_metrics
+    """
+    with _stage_metrics_lock:
+        for stage_name, metrics in stage_metrics.items():
+            _merge_metrics(stage_name, metrics)
+
+
+def reset_stage_metrics():
+    """Remove the metrics of all stages"""
+    with _stage_metrics_lock:
+        _stage_metrics.clear()
+
+
+def write_metrics_file(file: str, file_format: str = None):
+    """Writes the metrics of each stage to a JSON or Prometheus text file
+
+    Args:
+        file (str): file path of the metrics file
+        file_format (str):
+            "json" or "prometheus", by file extension if not given
+
+    Raises:
+        ValueError: If file_format is not a supported format
+        PermissionError:
+            incorrect permission to access file to create/overwrite
+    """
+    if file_format is None:
+        extension = os.path.splitext(file)[1].lower()
+        file_format = METRICS_FILE_FORMAT_EXTENSIONS.get(extension, "json")
+    if file_format not in METRICS_FILE_FORMATS:
+        raise ValueError(
+            f"Unsupported metrics file format {file_format}, expected one" \
+            f" of {METRICS_FILE_FORMATS}"
+        )
+
+    # Log function entry
+    logger.info(f"Writing stage metrics to {file}...")
+
+    try:
+        stage_metrics = get_stage_metrics()
+        with open(file, "w") as f:
+            if file_format == "json":
+                json.dump({"stages": stage_metrics}, f, indent=2)
+                f.write("\n")
+            else:
+                f.write(format_prometheus_metrics(stage_metrics))
+        logger.info(f"Wrote stage metrics to {file}")
+
+    except PermissionError as pe:
+        logger.critical(
+            f"PermissionError: unable to write to {file}, check" \
+            f" permissions: {pe}"
+        )
+        raise
+
+    except Exception as e:
+        logger.error(f"Error: unexpected error occurred: {e}")
+        raise RuntimeError(
+            f"RuntimeError: unexpected error occurred in" \
+            f" write_metrics_file: {e}"
+        ) from e
+
+
+def format_prometheus_metrics(stage_metrics: dict):
+    """Returns stage metrics in the Prometheus text exposition format
+
+    Args:
+        stage_metrics (dict): metrics from get_stage_metrics
+
+    Returns:
+        str: one metric family per stage metric, labelled by stage
+    """
+    lines = []
+    for key, (suffix, metric_type, help_text) in PROMETHEUS_METRICS.items():
+        samples = [
+            (stage_name, metrics[key])
+            for stage_name, metrics in stage_metrics.items()
+            if metrics.get(key) is not None
+        ]
+        if not samples:
+            continue
+        metric_name = f"{METRIC_PREFIX}_{suffix}"
+        lines.append(f"# HELP {metric_name} {help_text}")
+        lines.append(f"# TYPE {metric_name} {metric_type}")
+        for stage_name, value in samples:
+            label = stage_name.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'{metric_name}{{stage="{label}"}} {value}')
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def get_peak_rss():
+    """Peak resident set size of this process (bytes), None if unknown"""
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def get_current_rss():
+    """Resident set size of this process (bytes), None if unknown"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _get_stage_peak_rss(start_peak_rss: int, start_rss: int):
+    """Peak resident set size of the process during a stage (bytes)
+
+    The process peak is that of the stage if the stage raised it, and
+    otherwise the larger of the resident set sizes at the start and end of
+    the stage is taken, so a stage after a larger one reports its own size.
+    Where the current resident set size is unknown, the process peak is
+    taken.
+
+    Args:
+        start_peak_rss (int): process peak at the start of the stage
+        start_rss (int): resident set size at the start of the stage
+
+    Returns:
+        int: peak resident set size of the stage, None if unknown
+    """
+    peak_rss = get_peak_rss()
+    end_rss = get_current_rss()
+    if peak_rss is None or start_rss is None or end_rss is None \
+        or peak_rss > start_peak_rss:
+        return peak_rss
+    return max(start_rss, end_rss)
+
+
+def _record_stage(
+    stage_name: str,
+    wall_seconds: float,
+    cpu_seconds: float,
+    peak_rss_bytes: int,
+    counters: dict
+):
+    """Add one run of a stage to its metrics
+
+    Args:
+        stage_name (str): name of the stage
+        wall_seconds (float): wall time of the run
+        cpu_seconds (float): process CPU time of the run
+        peak_rss_bytes (int): peak resident set size during the run
+        counters (dict): row counters of the run
+    """
+    metrics = {
+        "calls": 1,
+        "wall_seconds": wall_seconds,
+        "cpu_seconds": cpu_seconds,
+        "peak_rss_bytes": peak_rss_bytes,
+        **counters,
+    }
+    with _stage_metrics_lock:
+        _merge_metrics(stage_name, metrics)
+
+
+def _merge_metrics(stage_name: str, metrics: dict):
+    """Sum metrics into those of a stage, taking the maximum peak RSS
+
+    Must be called holding _stage_metrics_lock.
+
+    Args:
+        stage_name (str): name of the stage
+        metrics (dict): metrics to add
+    """
+    stage_metrics = _stage_metrics.setdefault(stage_name, {})
+    for key, value in metrics.items():
+        if value is None:
+            stage_metrics.setdefault(key, None)
+        elif key == "peak_rss_bytes":
+            stage_metrics[key] = max(stage_metrics.get(key) or 0, value)
+        else:
+            stage_metrics[key] = (stage_metrics.get(key) or 0) + value
+
+
+def _count_rows(value):
+    """Number of rows of an array or dictionary of arrays, otherwise None"""
+    if isinstance(value, np.ndarray):
+        return len(value) if value.ndim else None
+    if isinstance(value, dict) and value:
+        first_value = next(iter(value.values()))
+        if isinstance(first_value, np.ndarray) and first_value.ndim:
+            return len(first_value)
+    return None
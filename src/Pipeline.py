@@ -0,0 +1,869 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import functools
+import hashlib
+import os
+
+# Third party modules
+import numpy as np
+
+# Custom modules
+from custom_logger import get_custom_logger
+from DataValidation import get_precision_dtype
+import DataImportExport as die
+from FileSignature import get_file_identity
+import ForecasterReferenceBook as frb
+import ProgressJournal as pj
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Logging
+logger = get_custom_logger("data/logging_config.yaml")
+
+# Constants columns
+TEMP_NOON_COEFF_COLUMN = "Temp. noon coeff (/celcius)"
+TEMP_DEW_POINT_NOON_COEFF_COLUMN = "Temp. dew point noon coeff (/celcius)"
+TEMP_CONSTANT_COLUMN = "Temp. constant (celcius)"
+
+# K lookup columns
+WIND_SPEED_MIN_COLUMN = "Wind speed min. (knots)"
+WIND_SPEED_MAX_COLUMN = "Wind speed max. (knots)"
+CLOUD_COVER_MIN_COLUMN = "Cloud cover min. (oktas)"
+CLOUD_COVER_MAX_COLUMN = "Cloud cover max. (oktas)"
+K_COLUMN = frb.K_COLUMN
+
+# Data columns
+TEMP_NOON_COLUMN = frb.TEMP_NOON_COLUMN
+TEMP_DEW_POINT_NOON_COLUMN = frb.TEMP_DEW_POINT_NOON_COLUMN
+WIND_SPEED_COLUMN = frb.WIND_SPEED_COLUMN
+CLOUD_COVER_COLUMN = frb.CLOUD_COVER_COLUMN
+TEMP_MIN_NOON_COLUMN = frb.TEMP_MIN_NOON_COLUMN
+
+# Suffixes of the partial output and progress journal of a chunked run
+PARTIAL_FILE_SUFFIX = ".partial"
+JOURNAL_FILE_SUFFIX = ".journal"
+# Journal entry of the progress of a chunked run, batches written, rows and
+# bytes of the partial output
+PROGRESS_ENTRY = "progress"
+NO_PROGRESS = {"chunks": 0, "rows": 0, "bytes": 0}
+
+# Suffix of the state of an incremental run, kept next to its output
+INCREMENTAL_STATE_SUFFIX = ".state"
+# State entry of an incremental run, the data file bytes and rows processed
+# and the output bytes written for them
+INCREMENTAL_ENTRY = "incremental"
+# Bytes at the start and end of the data file processed that are hashed, to
+# find it rewritten between incremental runs
+INCREMENTAL_CHECK_BYTES = 1 << 16
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def load_reference_data(config_data: dict):
+    """Import the constants and K lookup table named in the configuration
+
+    The two tables are imported concurrently, see die.import_concurrently.
+    The parsed tables are cached in the optional cache_directory of the
+    reference_cache section of the configuration, if set. The coefficients
+    and K lookup index are at the optional precision of the configuration, 
+    float32 or float64 (the default), which the data is then computed at.
+
+    Args:
+        config_data (dict): dictonary of configuration data
+
+    Returns:
+        tuple:
+            list of the three coefficients for the Temp. min. noon (celcius)
+            calculation and the KLookupIndex of the K lookup table
+    """
+    imported_constants_data, imported_lookup_data = die.import_concurrently(
+        _get_reference_imports(config_data)
+    )
+    return _get_reference_data(
+        config_data, imported_constants_data, imported_lookup_data
+    )
+
+
+def load_inputs(config_data: dict):
+    """Import the constants, K lookup table and data named in the configuration
+
+    The constants, K lookup table and data files are all imported
+    concurrently, see die.import_concurrently, so the inputs are loaded 
+    once the slowest file is. The data_file_path of the data section is a
+    data file, or a list of data files concatenated in order, see 
+    die.import_data_files. The data is imported at the precision of the
+    configuration, as in load_reference_data.
+
+    Args:
+        config_data (dict): dictonary of configuration data
+
+    Returns:
+        tuple:
+            list of the three coefficients for the Temp. min. noon (celcius)
+            calculation, the KLookupIndex of the K lookup table and the
+            dictionary of data columns
+    """
+    data_config = config_data["data"]
+    imported_constants_data, imported_lookup_data, imported_data = \
+        die.import_concurrently(
+            _get_reference_imports(config_data) + [
+                functools.partial(
+                    die.import_data_files,
+                    data_config["data_file_path"],
+                    data_config["data_columns"],
+                    data_config.get("data_file_format"),
+                    data_config.get("data_column_dtypes"),
+                    get_precision_dtype(config_data.get("precision")).name,
+                    data_config.get("compact_columns", False)
+                ),
+            ]
+        )
+    coeff, K_index = _get_reference_data(
+        config_data, imported_constants_data, imported_lookup_data
+    )
+    return coeff, K_index, imported_data
+
+
+def _get_reference_imports(config_data: dict):
+    """Returns the imports of the constants and K lookup table
+
+    Args:
+        config_data (dict): dictonary of configuration data
+
+    Returns:
+        list: functions importing the constants and K lookup table
+    """
+    cache_directory = config_data.get("reference_cache", {}).get(
+        "cache_directory"
+    )
+    return [
+        functools.partial(
+            die.import_cached_csv_data_file,
+            config_data["constants"]["constants_file_path"],
+            config_data["constants"]["constants_columns"],
+            cache_directory
+        ),
+        functools.partial(
+            die.import_cached_csv_data_file,
+            config_data["k_lookup"]["k_lookup_file_path"],
+            config_data["k_lookup"]["k_lookup_columns"],
+            cache_directory
+        ),
+    ]
+
+
+def _get_reference_data(
+    config_data: dict,
+    imported_constants_data: dict,
+    imported_lookup_data: dict
+):
+    """Returns the coefficients and K lookup index of the imported tables
+
+    Args:
+        config_data (dict): dictonary of configuration data
+        imported_constants_data (dict): columns of the constants table
+        imported_lookup_data (dict): columns of the K lookup table
+
+    Returns:
+        tuple: list of the three coefficients and the KLookupIndex
+    """
+    # Coefficients of the Temp. min. noon (celcius) calculation
+    precision = config_data.get("precision")
+    dtype = get_precision_dtype(precision)
+    coeff = [
+        imported_constants_data[column].astype(dtype, copy=False)
+        for column in [
+            TEMP_NOON_COEFF_COLUMN,
+            TEMP_DEW_POINT_NOON_COEFF_COLUMN,
+            TEMP_CONSTANT_COLUMN,
+        ]
+    ]
+
+    # Compile the K lookup table into a grid index once
+    K_index = frb.KLookupIndex(
+        imported_lookup_data[WIND_SPEED_MIN_COLUMN],
+        imported_lookup_data[WIND_SPEED_MAX_COLUMN],
+        imported_lookup_data[CLOUD_COVER_MIN_COLUMN],
+        imported_lookup_data[CLOUD_COVER_MAX_COLUMN],
+        imported_lookup_data[K_COLUMN],
+        precision
+    )
+    return coeff, K_index
+
+
+def compute_reference_book(
+    imported_data: dict,
+    coeff: list,
+    K_index: frb.KLookupIndex,
+    out: dict = None,
+    workers: int = None
+):
+    """Round, look up K, and calculate Temp. min. noon (celcius) for data
+
+    Args:
+        imported_data (dict):
+            dictionary of data columns, updated in place with the rounded
+            wind speed and cloud cover, K () and Temp. min. noon (celcius)
+        coeff (list):
+            A list of three coefficients used in the linear calculation
+        K_index (frb.KLookupIndex): grid index of the K lookup table
+        out (dict): 
+            buffers from frb.allocate_tmin_buffers to reuse, allocated if 
+            not given
+        workers (int): 
+            number of threads computing the data, see frb.compute_tmin
+
+    Returns:
+        dict: the updated imported_data dictionary
+    """
+    results = frb.compute_tmin(
+        imported_data, coeff, K_index, out=out, workers=workers
+    )
+    imported_data.update(results)
+    return imported_data
+
+
+def run_in_memory(
+    data_file_path: str | list,
+    data_columns: list,
+    output_file_path: str,
+    coeff: list,
+    K_index: frb.KLookupIndex,
+    data_file_format: str = None,
+    output_file_format: str = None,
+    column_dtypes: dict = None,
+    compact_columns: bool = False,
+    output_float_format: str = None,
+    output_compression: str = None,
+    compute_workers: int = None
+):
+    """Run the reference book method over the whole data file at once
+
+    The floating point columns are imported and computed at the precision of
+    K_index.
+
+    Args:
+        data_file_path (str | list): 
+            file path of the data file, or a list of data files imported
+            concurrently and concatenated, see die.import_data_files
+        data_columns (list): columns of the data file to import
+        output_file_path (str): file path of the output file
+        coeff (list):
+            A list of three coefficients used in the linear calculation
+        K_index (frb.KLookupIndex): grid index of the K lookup table
+        data_file_format (str): 
+            format of the data file, by file extension if not given
+        output_file_format (str): 
+            format of the output file, by file extension if not given
+        column_dtypes (dict): 
+            dtype of each column of a .csv data file, to parse the columns
+            straight to, see die.import_typed_csv_data_file
+        compact_columns (bool): 
+            hold the Location and Date columns compactly, see 
+            die.encode_compact_columns
+        output_float_format (str): 
+            %-format of floating point values of a .csv output file, see
+            die.export_csv_data_file
+        output_compression (str): 
+            "gzip" or "zstd" compression of a .csv output file, by file 
+            extension if not given
+        compute_workers (int): 
+            number of threads computing the data, see frb.compute_tmin
+
+    Returns:
+        int: number of rows exported
+    """
+    # Import raw data
+    imported_data = die.import_data_files(
+        data_file_path,
+        data_columns,
+        data_file_format,
+        column_dtypes,
+        K_index.dtype.name,
+        compact_columns
+    )
+    return run_imported(
+        imported_data,
+        output_file_path,
+        coeff,
+        K_index,
+        output_file_format,
+        output_float_format,
+        output_compression,
+        compute_workers
+    )
+
+
+def run_imported(
+    imported_data: dict,
+    output_file_path: str,
+    coeff: list,
+    K_index: frb.KLookupIndex,
+    output_file_format: str = None,
+    output_float_format: str = None,
+    output_compression: str = None,
+    compute_workers: int = None
+):
+    """Run the reference book method over data already imported
+
+    As run_in_memory, for data imported alongside the reference data by
+    load_inputs.
+
+    Args:
+        imported_data (dict): dictionary of data columns
+        output_file_path (str): file path of the output file
+        coeff (list):
+            A list of three coefficients used in the linear calculation
+        K_index (frb.KLookupIndex): grid index of the K lookup table
+        output_file_format (str): 
+            format of the output file, by file extension if not given
+        output_float_format (str): 
+            %-format of floating point values of a .csv output file, see
+            die.export_csv_data_file
+        output_compression (str): 
+            "gzip" or "zstd" compression of a .csv output file, by file 
+            extension if not given
+        compute_workers (int): 
+            number of threads computing the data, see frb.compute_tmin
+
+    Returns:
+        int: number of rows exported
+    """
+    # Compute K and Temp. min. noon (celcius)
+    imported_data = compute_reference_book(
+        imported_data, coeff, K_index, workers=compute_workers
+    )
+
+    # Export computations and imported data
+    die.export_data_file(
+        output_file_path, 
+        list(imported_data.keys()), 
+        imported_data, 
+        output_file_format,
+        output_float_format,
+        output_compression
+    )
+    return len(imported_data[K_COLUMN])
+
+
+def run_chunked(
+    data_file_path: str,
+    data_columns: list,
+    output_file_path: str,
+    coeff: list,
+    K_index: frb.KLookupIndex,
+    chunk_size: int,
+    column_dtypes: dict = None,
+    compact_columns: bool = False,
+    output_float_format: str = None,
+    output_compression: str = None,
+    compute_workers: int = None
+):
+    """Run the reference book method streaming the data file in row batches
+
+    Each batch is imported, computed and appended to the output in turn, so
+    peak memory is bounded by chunk_size rather than the data file size. The
+    output is computed at the same precision of K_index as run_in_memory, 
+    and matches it byte for byte if the dtypes of the columns are declared,
+    or those of the first batch hold over the whole data file, see 
+    die.import_csv_data_file_chunks. A data file without rows writes an
+    output of the header alone.
+
+    Batches are appended to <output_file_path>.partial, which is renamed to
+    the output file once complete, and each batch written is recorded in the
+    progress journal <output_file_path>.journal. A run that dies part way 
+    leaves any existing output file as it was, and running it again with 
+    the same data file, reference data and options resumes after the last 
+    batch recorded. The batches before it are still read, but not computed
+    or written again.
+
+    Args:
+        data_file_path (str): file path of the .csv data file
+        data_columns (list): columns of the .csv data file to import
+        output_file_path (str): file path of the .csv output file
+        coeff (list):
+            A list of three coefficients used in the linear calculation
+        K_index (frb.KLookupIndex): grid index of the K lookup table
+        chunk_size (int): number of rows of the data file per batch
+        column_dtypes (dict): 
+            dtype of each column of the data file, to parse the columns
+            straight to, see die.import_csv_data_file_chunks
+        compact_columns (bool): 
+            hold the Location and Date columns compactly, see 
+            die.encode_compact_columns
+        output_float_format (str): 
+            %-format of floating point values of a .csv output file, see
+            die.export_csv_data_file
+        output_compression (str): 
+            "gzip" or "zstd" compression of a .csv output file, by file 
+            extension if not given
+        compute_workers (int): 
+            number of threads computing the data, see frb.compute_tmin
+
+    Returns:
+        int: number of rows exported
+    """
+    if not isinstance(data_file_path, (str, os.PathLike)):
+        raise ValueError(
+            f"Chunked runs only support a single data file: {data_file_path}"
+        )
+
+    # Check both files are .csv files, the only format read in batches
+    for file in [data_file_path, output_file_path]:
+        if die.get_file_format(file) != "csv":
+            raise ValueError(
+                f"Chunked runs only support .csv data and output files: {file}"
+            )
+
+    # The compression is that of the output file, not the partial file
+    output_compression = die.get_compression(
+        output_file_path, output_compression
+    )
+    partial_file_path = output_file_path + PARTIAL_FILE_SUFFIX
+    journal = pj.ProgressJournal(
+        output_file_path + JOURNAL_FILE_SUFFIX,
+        {
+            "data_file_path": os.path.abspath(data_file_path),
+            "data_file": pj.get_file_signature(data_file_path),
+            "chunk_size": chunk_size,
+            "reference": get_reference_digest(coeff, K_index),
+            "options": [
+                data_columns,
+                column_dtypes,
+                compact_columns,
+                output_float_format,
+                output_compression,
+            ],
+        }
+    )
+    progress = journal.get(PROGRESS_ENTRY, NO_PROGRESS)
+    if progress["chunks"] \
+        and not _truncate_file(partial_file_path, progress["bytes"]):
+        logger.warning(
+            f"Partial output {partial_file_path} does not match the journal," \
+            " starting again"
+        )
+        progress = NO_PROGRESS
+    if progress["chunks"]:
+        logger.info(
+            f"Resuming {data_file_path} after {progress['chunks']} chunks"
+        )
+
+    number_rows = progress["rows"]
+    chunks = die.import_csv_data_file_chunks(
+        data_file_path,
+        data_columns,
+        chunk_size,
+        column_dtypes,
+        K_index.dtype.name,
+        compact_columns
+    )
+    # Buffers of the computed columns, allocated once and reused by every
+    # batch
+    buffers = None
+    chunk_number = None
+    for chunk_number, imported_data in enumerate(chunks):
+        # Skip the batches already written
+        if chunk_number < progress["chunks"]:
+            continue
+        logger.info(f"Processing chunk {chunk_number}...")
+
+        # Compute K and Temp. min. noon (celcius)
+        if buffers is None:
+            buffers = frb.allocate_tmin_buffers(chunk_size, K_index.dtype)
+        imported_data = compute_reference_book(
+            imported_data, coeff, K_index, out=buffers, workers=compute_workers
+        )
+
+        # Export computations and imported data, header with first batch only
+        die.export_csv_data_file(
+            partial_file_path,
+            list(imported_data.keys()),
+            imported_data,
+            append=chunk_number > 0,
+            float_format=output_float_format,
+            compression=output_compression
+        )
+        number_rows += len(imported_data[K_COLUMN])
+        journal.record(
+            PROGRESS_ENTRY,
+            {
+                "chunks": chunk_number + 1,
+                "rows": number_rows,
+                "bytes": os.path.getsize(partial_file_path),
+            }
+        )
+        logger.info(f"Processed chunk {chunk_number}")
+
+    if chunk_number is None:
+        # No batches, write the header alone in place of any existing output
+        logger.warning(f"No rows in {data_file_path}, exporting the header")
+        imported_data = compute_reference_book(
+            {col: np.empty(0, K_index.dtype) for col in data_columns},
+            coeff,
+            K_index
+        )
+        die.export_csv_data_file(
+            output_file_path,
+            list(imported_data.keys()),
+            imported_data,
+            float_format=output_float_format,
+            compression=output_compression
+        )
+    elif os.path.exists(partial_file_path):
+        os.replace(partial_file_path, output_file_path)
+    journal.remove()
+    return number_rows
+
+
+def run_incremental(
+    data_file_path: str,
+    data_columns: list,
+    output_file_path: str,
+    coeff: list,
+    K_index: frb.KLookupIndex,
+    column_dtypes: dict = None,
+    compact_columns: bool = False,
+    output_float_format: str = None,
+    output_compression: str = None,
+    compute_workers: int = None
+):
+    """Run the reference book method over the rows appended to the data file
+
+    For data files that are only ever appended to. The byte offset and rows
+    of the data file processed, and the bytes of output written for them,
+    are kept in the state file <output_file_path>.state. A run with a state
+    of the same data file, reference data and options reads only the lines
+    after that offset, parsed to the dtypes of the earlier rows, and appends
+    their outputs to the output file, so its cost grows with the new rows
+    rather than the whole file. Otherwise, or if the data file has since
+    been replaced, truncated or rewritten (by the first and last 
+    INCREMENTAL_CHECK_BYTES bytes processed), the output no longer matches
+    the state, or the new rows do not parse to those dtypes, the whole data
+    file is run again as by run_in_memory.
+
+    A last line without a newline, which may still be being written, is
+    computed and appended but not recorded, so the next run replaces its 
+    output. The output then matches that of run_in_memory over the data 
+    file byte for byte, if the dtypes of its columns are declared or do not
+    change with the rows appended.
+
+    Args:
+        data_file_path (str): file path of the .csv data file
+        data_columns (list): columns of the .csv data file to import
+        output_file_path (str): file path of the .csv output file
+        coeff (list):
+            A list of three coefficients used in the linear calculation
+        K_index (frb.KLookupIndex): grid index of the K lookup table
+        column_dtypes (dict): 
+            dtype of each column of the data file, to parse the columns
+            straight to, see die.import_csv_data_file_tail
+        compact_columns (bool): 
+            hold the Location and Date columns compactly, see 
+            die.encode_compact_columns
+        output_float_format (str): 
+            %-format of floating point values of a .csv output file, see
+            die.export_csv_data_file
+        output_compression (str): 
+            "gzip" or "zstd" compression of a .csv output file, by file 
+            extension if not given
+        compute_workers (int): 
+            number of threads computing the data, see frb.compute_tmin
+
+    Returns:
+        int: number of rows exported by this run
+    """
+    if not isinstance(data_file_path, (str, os.PathLike)):
+        raise ValueError(
+            "Incremental runs only support a single data file:" \
+            f" {data_file_path}"
+        )
+    # Check both files are .csv files, the only format read from an offset
+    for file in [data_file_path, output_file_path]:
+        if die.get_file_format(file) != "csv":
+            raise ValueError(
+                "Incremental runs only support .csv data and output files:" \
+                f" {file}"
+            )
+
+    output_compression = die.get_compression(
+        output_file_path, output_compression
+    )
+    journal = pj.ProgressJournal(
+        output_file_path + INCREMENTAL_STATE_SUFFIX,
+        {
+            "data_file_path": os.path.abspath(data_file_path),
+            "reference": get_reference_digest(coeff, K_index),
+            "options": [
+                data_columns,
+                column_dtypes,
+                compact_columns,
+                output_float_format,
+                output_compression,
+            ],
+        }
+    )
+    state = _get_incremental_state(
+        journal.get(INCREMENTAL_ENTRY), data_file_path, output_file_path
+    )
+
+    # Import the rows after those processed, or all of them
+    imported_data = None
+    if state is not None:
+        logger.info(
+            f"Processing {data_file_path} from byte {state['bytes']}, after" \
+            f" {state['rows']} rows..."
+        )
+        try:
+            imported_data, offset = _import_new_rows(
+                data_file_path,
+                data_columns,
+                state["bytes"],
+                column_dtypes,
+                state["dtypes"],
+                K_index.dtype.name,
+                compact_columns
+            )
+
+        except ValueError as ve:
+            logger.warning(
+                f"The new rows of {data_file_path} do not parse to the" \
+                f" dtypes of the earlier rows, running it again in full: {ve}"
+            )
+            state = None
+    if state is None:
+        logger.info(f"Processing {data_file_path} in full...")
+        imported_data, offset = die.import_csv_data_file_tail(
+            data_file_path,
+            data_columns,
+            0,
+            column_dtypes,
+            K_index.dtype.name
+        )
+        # Dtypes resolved over the whole data file, that new rows must keep
+        dtypes = None if column_dtypes is not None else {
+            col: imported_data[col].dtype.name for col in data_columns
+        }
+        if compact_columns:
+            imported_data = die.encode_compact_columns(imported_data)
+    else:
+        dtypes = state["dtypes"]
+    file_identity = get_file_identity(data_file_path)
+
+    # Compute and export the new rows, appending them to the output
+    number_rows = len(imported_data[data_columns[0]])
+    if state is None or number_rows:
+        imported_data = compute_reference_book(
+            imported_data, coeff, K_index, workers=compute_workers
+        )
+        die.export_csv_data_file(
+            output_file_path,
+            list(imported_data.keys()),
+            imported_data,
+            append=state is not None,
+            float_format=output_float_format,
+            compression=output_compression
+        )
+    journal.record(
+        INCREMENTAL_ENTRY,
+        {
+            "file": file_identity,
+            "bytes": offset,
+            "rows": number_rows + (state["rows"] if state else 0),
+            "output_bytes": os.path.getsize(output_file_path),
+            "dtypes": dtypes,
+            "digest": _get_data_file_digest(data_file_path, offset),
+        }
+    )
+
+    # Export a last line still being written, replaced by the next run
+    if os.path.getsize(data_file_path) > offset:
+        try:
+            imported_data, _ = _import_new_rows(
+                data_file_path,
+                data_columns,
+                offset,
+                column_dtypes,
+                dtypes,
+                K_index.dtype.name,
+                compact_columns,
+                complete_lines=False
+            )
+
+        except ValueError as ve:
+            logger.warning(
+                f"Leaving the last line of {data_file_path} for the next" \
+                f" run: {ve}"
+            )
+            imported_data = {col: [] for col in data_columns}
+        last_rows = len(imported_data[data_columns[0]])
+        if last_rows:
+            imported_data = compute_reference_book(
+                imported_data, coeff, K_index, workers=compute_workers
+            )
+            die.export_csv_data_file(
+                output_file_path,
+                list(imported_data.keys()),
+                imported_data,
+                append=True,
+                float_format=output_float_format,
+                compression=output_compression
+            )
+            number_rows += last_rows
+    logger.info(f"Processed {number_rows} rows of {data_file_path}")
+    return number_rows
+
+
+def _import_new_rows(
+    data_file_path: str,
+    data_columns: list,
+    offset: int,
+    column_dtypes: dict,
+    dtypes: dict,
+    precision: str,
+    compact_columns: bool,
+    complete_lines: bool = True
+):
+    """Returns the rows of a data file after offset, at the earlier dtypes
+
+    Args:
+        data_file_path (str): file path of the .csv data file
+        data_columns (list): columns of the .csv data file to import
+        offset (int): byte offset of the first row to import
+        column_dtypes (dict): declared dtype of each column, if any
+        dtypes (dict): 
+            dtypes of the columns resolved over the earlier rows, if not 
+            declared
+        precision (str): "float32" or "float64" for the floating point columns
+        compact_columns (bool): hold the Location and Date columns compactly
+        complete_lines (bool): import up to the last newline only
+
+    Returns:
+        tuple: 
+            dictionary of data columns, and the byte offset of the end of
+            the last line imported
+
+    Raises:
+        ValueError: 
+            If the rows do not parse, or would change the dtype of an integer
+            column of the earlier rows to floating point
+    """
+    imported_data, end_offset = die.import_csv_data_file_tail(
+        data_file_path,
+        data_columns,
+        offset,
+        column_dtypes,
+        precision,
+        complete_lines=complete_lines
+    )
+    # Resolved as over the whole data file, rows with missing values 
+    # included, see die.import_csv_data_file_chunks
+    if dtypes is not None and end_offset > offset:
+        for col, dtype in dtypes.items():
+            if np.issubdtype(np.dtype(dtype), np.integer) \
+                and not np.issubdtype(imported_data[col].dtype, np.integer):
+                raise ValueError(
+                    f"Column {col} changes from {dtype} to" \
+                    f" {imported_data[col].dtype}"
+                )
+        imported_data = {
+            col: data.astype(dtypes[col], copy=False)
+            for col, data in imported_data.items()
+        }
+    if compact_columns:
+        imported_data = die.encode_compact_columns(imported_data)
+    return imported_data, end_offset
+
+
+def _get_incremental_state(
+    state: dict,
+    data_file_path: str,
+    output_file_path: str
+):
+    """Returns the state of an incremental run if it can be continued
+
+    The output file is truncated to the bytes written for the rows 
+    recorded, removing the output of an unrecorded last line or export.
+
+    Args:
+        state (dict): state entry of the incremental run, if any
+        data_file_path (str): file path of the .csv data file
+        output_file_path (str): file path of the .csv output file
+
+    Returns:
+        dict: the state, None if the data file must be run in full
+    """
+    if state is None:
+        return None
+    try:
+        size = os.path.getsize(data_file_path)
+
+    except FileNotFoundError:
+        return None
+
+    if get_file_identity(data_file_path) != state["file"]:
+        reason = "was replaced"
+    elif size < state["bytes"]:
+        reason = "was truncated"
+    elif _get_data_file_digest(data_file_path, state["bytes"]) \
+        != state["digest"]:
+        reason = "was rewritten"
+    elif not _truncate_file(output_file_path, state["output_bytes"]):
+        reason = f"has an output {output_file_path} not matching its state"
+    else:
+        return state
+    logger.warning(
+        f"{data_file_path} {reason} since the last incremental run, running" \
+        " it again in full"
+    )
+    return None
+
+
+def _get_data_file_digest(file: str, size: int):
+    """SHA-256 digest of the first and last bytes of the first size bytes"""
+    digest = hashlib.sha256()
+    with open(file, "rb") as f:
+        digest.update(f.read(min(size, INCREMENTAL_CHECK_BYTES)))
+        f.seek(max(size - INCREMENTAL_CHECK_BYTES, 0))
+        digest.update(f.read(min(size, INCREMENTAL_CHECK_BYTES)))
+    return digest.hexdigest()
+
+
+def get_reference_digest(coeff: list, K_index: frb.KLookupIndex):
+    """Returns a SHA-256 digest of the coefficients and K lookup index
+
+    Args:
+        coeff (list):
+            A list of three coefficients used in the linear calculation
+        K_index (frb.KLookupIndex): grid index of the K lookup table
+
+    Returns:
+        str: hexadecimal digest, equal for equal reference data
+    """
+    digest = hashlib.sha256()
+    for array in list(coeff) + [
+        K_index.wind_edges,
+        K_index.cover_edges,
+        K_index.row_grid,
+        K_index.K_grid,
+    ]:
+        array = np.asarray(array)
+        digest.update(array.dtype.str.encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _truncate_file(file: str, size: int):
+    """Truncate a file to size bytes, returns False if it is shorter"""
+    if not os.path.exists(file) or os.path.getsize(file) < size:
+        return False
+    with open(file, "r+b") as f:
+        f.truncate(size)
+    return True
@@ -0,0 +1,189 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import cProfile
+import os
+import tracemalloc
+
+# Third party modules
+import yaml
+
+# Custom modules
+from custom_logger import get_custom_logger
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Logging
+logger = get_custom_logger("data/logging_config.yaml")
+
+# Profiling modes, CPU time with cProfile and allocations with tracemalloc
+PROFILE_MODES = ("cpu", "mem")
+
+# Default number of allocation sites in the memory summary
+DEFAULT_TOP_ALLOCATIONS = 25
+
+# Suffixes of the CPU profile and memory summary files
+CPU_PROFILE_SUFFIX = ".prof"
+MEMORY_SUMMARY_SUFFIX = "_memory.txt"
+
+# Profile file prefix when the logging configuration has no log file
+DEFAULT_PROFILE_FILE_PREFIX = "outputs/forecasters_reference_book"
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class Profiler:
+    """Profile the CPU time and/or memory allocations of a run
+
+    The CPU profile is dumped to <file_prefix>.prof, to be read with pstats
+    or snakeviz, and the top allocation sites by size to
+    <file_prefix>_memory.txt. Only the calling process is profiled, not the
+    worker processes of a batch run.
+
+    Attributes:
+        modes (list): profiling modes, "cpu" and/or "mem"
+        file_prefix (str): file path prefix of the profile files
+        top_allocations (int): number of allocation sites in the summary
+    """
+
+    def __init__(
+        self,
+        modes: list,
+        file_prefix: str,
+        top_allocations: int = DEFAULT_TOP_ALLOCATIONS
+    ):
+        """Set up the profiler without starting it
+
+        Args:
+            modes (list): profiling modes, "cpu" and/or "mem"
+            file_prefix (str): file path prefix of the profile files
+            top_allocations (int): number of allocation sites in the summary
+
+        Raises:
+            ValueError: If a mode is not a supported profiling mode
+        """
+        for mode in modes:
+            if mode not in PROFILE_MODES:
+                raise ValueError(
+                    f"Unsupported profiling mode {mode}, expected one of" \
+                    f" {PROFILE_MODES}"
+                )
+        self.modes = list(dict.fromkeys(modes))
+        self.file_prefix = file_prefix
+        self.top_allocations = top_allocations
+        self._cpu_profile = None
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        """Start profiling"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop profiling and write the profile files"""
+        self.stop()
+
+    def start(self):
+        """Start profiling in each of the modes"""
+        if "mem" in self.modes and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if "cpu" in self.modes:
+            self._cpu_profile = cProfile.Profile()
+            self._cpu_profile.enable()
+        logger.info(f"Started {', '.join(self.modes)} profiling")
+
+    def stop(self):
+        """Stop profiling and write the profile files
+
+        Safe to call more than once, only the first call writes the files.
+
+        Returns:
+            list: file paths of the profile files written
+        """
+        files = []
+        # Stop both before writing, so neither profiles the other's output
+        cpu_profile, self._cpu_profile = self._cpu_profile, None
+        if cpu_profile is not None:
+            cpu_profile.disable()
+        snapshot = None
+        if self._started_tracemalloc:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+        if cpu_profile is not None:
+            file = self.file_prefix + CPU_PROFILE_SUFFIX
+            cpu_profile.dump_stats(file)
+            files.append(file)
+            logger.info(f"Wrote CPU profile to {file}")
+        if snapshot is not None:
+            file = self.file_prefix + MEMORY_SUMMARY_SUFFIX
+            with open(file, "w") as f:
+                f.write(
+                    format_memory_summary(snapshot, peak, self.top_allocations)
+                )
+            files.append(file)
+            logger.info(f"Wrote memory allocation summary to {file}")
+        return files
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def get_profile_file_prefix(yaml_config_file_path: str):
+    """Returns the profile file prefix next to the configured log file
+
+    Args:
+        yaml_config_file_path (str):
+            The path to the YAML file containing the logging configuration
+
+    Returns:
+        str:
+            log file path without its extension, or
+            DEFAULT_PROFILE_FILE_PREFIX if no handler logs to a file
+    """
+    with open(yaml_config_file_path, "r") as file:
+        config = yaml.safe_load(file)
+    handlers = config["logging"].get("handlers", {})
+    for handler in handlers.values():
+        if handler.get("filename"):
+            return os.path.splitext(handler["filename"])[0]
+    return DEFAULT_PROFILE_FILE_PREFIX
+
+
+def format_memory_summary(
+    snapshot: tracemalloc.Snapshot,
+    peak: int,
+    top_allocations: int = DEFAULT_TOP_ALLOCATIONS
+):
+    """Returns the top allocation sites of a tracemalloc snapshot as text
+
+    Args:
+        snapshot (tracemalloc.Snapshot): snapshot of the traced allocations
+        peak (int): peak traced memory (bytes)
+        top_allocations (int): number of allocation sites to list
+
+    Returns:
+        str:
+            peak and current traced memory followed by one line per
+            allocation site, largest first
+    """
+    statistics = snapshot.statistics("lineno")
+    current = sum(statistic.size for statistic in statistics)
+    lines = [
+        f"Peak traced memory: {peak / 1024:.1f} KiB",
+        f"Traced memory at end: {current / 1024:.1f} KiB",
+        f"Top {top_allocations} allocation sites by size:",
+    ]
+    for rank, statistic in enumerate(statistics[:top_allocations], 1):
+        lines.append(f"#{rank}: {statistic}")
+    return "\n".join(lines) + "\n"
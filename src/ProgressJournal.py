@@ -0,0 +1,122 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+import json
+import os
+
+# Custom modules
+from custom_logger import get_custom_logger
+import DataImportExport as die
+from FileSignature import get_file_signature
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Logging
+logger = get_custom_logger("data/logging_config.yaml")
+
+# Version of the journal file layout, journals of other versions are ignored
+JOURNAL_VERSION = 1
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class ProgressJournal:
+    """JSON record of the completed work of a run, to resume it after a crash
+
+    Each completed unit of work, a chunk of a data file or a data file of a
+    batch, is recorded under a name once its output is written, and the
+    journal file is replaced whole on every record. A restarted run with
+    the same run key reads the entries back and skips the work recorded,
+    while a journal of a different run, e.g. with other data or options, is
+    ignored and overwritten.
+
+    Attributes:
+        journal_file_path (str): file path of the journal file
+        run_key (dict):
+            JSON serialisable description of the run, that must match for
+            its entries to be resumed
+    """
+
+    def __init__(self, journal_file_path: str, run_key: dict):
+        """Read the entries of a journal file of the same run, if any
+
+        Args:
+            journal_file_path (str): file path of the journal file
+            run_key (dict): JSON serialisable description of the run
+        """
+        self.journal_file_path = journal_file_path
+        # Compare as read back from JSON, e.g. with tuples as lists
+        self.run_key = json.loads(json.dumps(run_key))
+        self._entries = self._read_entries()
+
+    def __len__(self):
+        """Number of entries recorded"""
+        return len(self._entries)
+
+    def __contains__(self, name: str):
+        """True if an entry is recorded under name"""
+        return name in self._entries
+
+    def get(self, name: str, default=None):
+        """Returns the entry recorded under name, or default"""
+        return self._entries.get(name, default)
+
+    def record(self, name: str, entry):
+        """Record a unit of work as completed and write the journal file
+
+        Args:
+            name (str): name of the unit of work
+            entry: JSON serialisable record of the unit of work
+        """
+        self._entries[name] = entry
+        with die.atomic_output_file(self.journal_file_path) as temporary_file:
+            with open(temporary_file, "w") as f:
+                json.dump(
+                    {
+                        "version": JOURNAL_VERSION,
+                        "run": self.run_key,
+                        "entries": self._entries,
+                    },
+                    f,
+                    indent=2
+                )
+
+    def remove(self):
+        """Remove the journal file once the run has completed"""
+        self._entries = {}
+        if os.path.exists(self.journal_file_path):
+            os.remove(self.journal_file_path)
+
+    def _read_entries(self):
+        """Returns the entries of the journal file if of the same run"""
+        try:
+            with open(self.journal_file_path, "r") as f:
+                journal = json.load(f)
+
+        except FileNotFoundError:
+            return {}
+
+        except (OSError, ValueError) as e:
+            logger.warning(
+                f"Ignoring unreadable journal {self.journal_file_path}: {e}"
+            )
+            return {}
+
+        if journal.get("version") != JOURNAL_VERSION \
+            or journal.get("run") != self.run_key:
+            logger.warning(
+                f"Ignoring journal {self.journal_file_path} of a different run"
+            )
+            return {}
+        entries = journal.get("entries", {})
+        logger.info(
+            f"Resuming from journal {self.journal_file_path} with" \
+            f" {len(entries)} entries"
+        )
+        return entries
@@ -0,0 +1,196 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python in built modules
+from collections import OrderedDict
+import os
+import threading
+
+# Custom modules
+from custom_logger import get_custom_logger
+import DataImportExport as die
+from FileSignature import get_file_signature
+import ForecasterReferenceBook as frb
+import Pipeline as pl
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Logging
+logger = get_custom_logger("data/logging_config.yaml")
+
+# Default number of configurations whose reference data is held
+DEFAULT_MAX_ENTRIES = 8
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class ReferenceData:
+    """Reference data loaded from one configuration file
+
+    The arrays are read-only as they are shared by every caller.
+
+    Attributes:
+        config_data (dict): dictonary of configuration data
+        coeff (tuple):
+            the three coefficients for the Temp. min. noon (celcius)
+            calculation
+        K_index (frb.KLookupIndex): grid index of the K lookup table
+        reference_book (frb.ReferenceBook):
+            reference book method for single observations
+        file_signatures (dict):
+            [modification time, size] of the configuration, constants and K
+            lookup files when loaded, keyed by file path
+    """
+
+    def __init__(self, config_file_path: str):
+        """Load the configuration, constants and K lookup
+
+        Args:
+            config_file_path (str): file path to yaml configuration file
+        """
+        self.config_data = die.import_yaml_configuration_file(
+            config_file_path
+        )
+        coeff, self.K_index = pl.load_reference_data(self.config_data)
+        for array in list(coeff) + [
+            self.K_index.wind_edges,
+            self.K_index.cover_edges,
+            self.K_index.row_grid,
+            self.K_index.K_grid,
+        ]:
+            array.setflags(write=False)
+        self.coeff = tuple(coeff)
+        self.reference_book = frb.ReferenceBook(self.coeff, self.K_index)
+        self.file_signatures = {
+            file: get_file_signature(file)
+            for file in _get_reference_files(
+                config_file_path, self.config_data
+            )
+        }
+
+    def is_stale(self):
+        """Returns True if any of the files loaded has changed since"""
+        return any(
+            get_file_signature(file) != signature
+            for file, signature in self.file_signatures.items()
+        )
+
+
+class ReferenceRegistry:
+    """Thread-safe least recently used registry of loaded reference data
+
+    Reference data is loaded from the files of a configuration on first use
+    and then handed back from memory, so repeated calls do no file I/O.
+    Changed files are only picked up by reload_if_changed or invalidate,
+    which callers run off the hot path, e.g. on a timer.
+
+    Attributes:
+        max_entries (int): number of configurations held before the least
+            recently used is dropped
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Create an empty registry
+
+        Args:
+            max_entries (int): number of configurations held
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Number of configurations held"""
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, config_file_path: str):
+        """Returns the reference data of a configuration, loading on a miss
+
+        Args:
+            config_file_path (str): file path to yaml configuration file
+
+        Returns:
+            ReferenceData: the reference data of the configuration
+        """
+        key = os.path.abspath(config_file_path)
+        with self._lock:
+            reference_data = self._entries.get(key)
+            if reference_data is not None:
+                self._entries.move_to_end(key)
+                return reference_data
+
+        # Load without holding the lock so other configurations are not
+        # blocked, the first of concurrent loads is kept
+        logger.info(f"Loading reference data of {config_file_path}...")
+        reference_data = ReferenceData(config_file_path)
+        with self._lock:
+            reference_data = self._entries.setdefault(key, reference_data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.info(f"Loaded reference data of {config_file_path}")
+        return reference_data
+
+    def invalidate(self, config_file_path: str = None):
+        """Drop the reference data of a configuration, or of all of them
+
+        The next get loads the files again.
+
+        Args:
+            config_file_path (str):
+                file path to yaml configuration file, all configurations if
+                not given
+        """
+        with self._lock:
+            if config_file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(config_file_path), None)
+        logger.info(
+            f"Invalidated reference data of {config_file_path or 'all'}" \
+            " configurations"
+        )
+
+    def reload_if_changed(self):
+        """Reload the reference data whose files have changed
+
+        Files are compared by modification time and size. Reference data is
+        swapped in whole once reloaded, so callers never see a mix of old
+        and new data.
+
+        Returns:
+            list: configuration file paths reloaded
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+        reloaded = []
+        for key, reference_data in entries:
+            if not reference_data.is_stale():
+                continue
+            logger.info(f"Reloading changed reference data of {key}...")
+            new_reference_data = ReferenceData(key)
+            with self._lock:
+                # Only replace the entry if it was not dropped meanwhile
+                if self._entries.get(key) is reference_data:
+                    self._entries[key] = new_reference_data
+            reloaded.append(key)
+        return reloaded
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def _get_reference_files(config_file_path: str, config_data: dict):
+    """Returns the configuration, constants and K lookup file paths"""
+    return [
+        config_file_path,
+        config_data["constants"]["constants_file_path"],
+        config_data["k_lookup"]["k_lookup_file_path"],
+    ]
@@ -3,12 +3,22 @@
 # =============================================================================
 
 # Python modules
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import multiprocessing
+import multiprocessing.util
+import os
+import warnings
 
 # Third party modules
+import numpy as np
 import yaml
 
+# Custom modules
+from FileSignature import get_file_signature
+
 # =============================================================================
 # Variables
 # =============================================================================
@@ -20,6 +30,115 @@ logging.basicConfig(
 )
 setup_logger = logging.getLogger("setup")
 
+# Arrays up to this size are logged whole, larger arrays are summarised
+MAX_LOGGED_ARRAY_SIZE = 10
+# Number of leading values shown in the summary of a larger array
+ARRAY_SUMMARY_HEAD = 5
+
+# Queue, background listener and the process it runs in when the logging 
+# configuration enables queue handlers
+_log_queue = None
+_log_queue_listener = None
+_log_queue_listener_pid = None
+_log_queue_finalizer = None
+
+# Logger of the logging configuration applied last, and the (path, 
+# modification time, size) of its YAML file, so modules importing the 
+# logger do not re-apply an unchanged configuration
+_configured_logger = None
+_configured_signature = None
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class ArraySummary:
+    """Lazily formatted summary of an array, or dictionary of arrays, for logs
+
+    Pass as an argument of a %-style logging call, e.g. 
+    logger.debug("K value found: %s", ArraySummary(K)), so the array is only
+    summarised if the log level is enabled and the record is emitted.
+
+    Attributes:
+        data (np.ndarray | dict): array, or dictionary of arrays, to summarise
+    """
+
+    def __init__(self, data):
+        """Hold the array to summarise when the log record is formatted
+
+        Args:
+            data (np.ndarray | dict): 
+                array, or dictionary of arrays, to summarise
+        """
+        self.data = data
+
+    def __str__(self):
+        """Summary of the array, or of each array of a dictionary"""
+        if isinstance(self.data, dict):
+            return "{" + ", ".join(
+                f"{key!r}: {summarise_array(value)}"
+                for key, value in self.data.items()
+            ) + "}"
+        return summarise_array(self.data)
+
+
+class LoggerQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler standing in for the configured handlers of one logger
+
+    Records are tagged with the name of the logger the handler replaced, so
+    the listener hands each record to that logger's configured handlers 
+    only, however many loggers share the queue.
+
+    Attributes:
+        logger_name (str): name of the logger the handler is attached to
+    """
+
+    def __init__(self, queue, logger_name: str):
+        """Attach the handler to a queue for a logger
+
+        Args:
+            queue (multiprocessing.Queue): queue read by the listener
+            logger_name (str): name of the logger the handler is attached to
+        """
+        super().__init__(queue)
+        self.logger_name = logger_name
+
+    def prepare(self, record: logging.LogRecord):
+        """Format the record message and tag it with the logger name"""
+        record = super().prepare(record)
+        record.queue_logger_name = self.logger_name
+        return record
+
+
+class LoggerQueueListener(logging.handlers.QueueListener):
+    """Queue listener handing records to the handlers of their logger
+
+    Attributes:
+        logger_handlers (dict): 
+            configured handlers of each logger, keyed by logger name
+    """
+
+    def __init__(self, queue, logger_handlers: dict):
+        """Listen on a queue for the configured handlers of the loggers
+
+        Args:
+            queue (multiprocessing.Queue): queue the handlers write to
+            logger_handlers (dict): 
+                configured handlers of each logger, keyed by logger name
+        """
+        super().__init__(queue, respect_handler_level=True)
+        self.logger_handlers = logger_handlers
+
+    def handle(self, record: logging.LogRecord):
+        """Hand a record to the configured handlers of its logger"""
+        record = self.prepare(record)
+        for handler in self.logger_handlers.get(
+            record.queue_logger_name, []
+        ):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
 # =============================================================================
 # Functions
 # =============================================================================
@@ -28,6 +147,10 @@ setup_logger = logging.getLogger("setup")
 def get_custom_logger(yaml_config_file_path: str):
     """Set up logger based on configuration from a YAML file
 
+    The configuration is applied once, and later calls for the same 
+    unchanged YAML file return the configured logger without reading it
+    again.
+
     Args:
         yaml_config_file_path (str): 
             The path to the YAML file containing the logging configuration
@@ -39,6 +162,12 @@ def get_custom_logger(yaml_config_file_path: str):
         FileNotFoundError: If the file does not exist
         yaml.YAMLError: If there's an error parsing the YAML file
     """
+    global _configured_logger, _configured_signature
+    # Return the logger if the configuration is already applied
+    signature = _get_config_signature(yaml_config_file_path)
+    if signature is not None and signature == _configured_signature:
+        return _configured_logger
+
     # Log function entry
     setup_logger.info(f"Generating logger from {yaml_config_file_path}...")
 
@@ -46,19 +175,27 @@ def get_custom_logger(yaml_config_file_path: str):
         # Load logging configuration from YAML file
         with open(yaml_config_file_path, "r") as file:
             config = yaml.safe_load(file)
-        setup_logger.debug(f"Configuration data: {config}")
+        setup_logger.debug("Configuration data: %s", config)
         
-        # Apply the logging configuration
+        # Apply the logging configuration, flushing any previous queue first
+        stop_log_queue_listener()
         logging.config.dictConfig(config["logging"])
 
+        # Move the configured handlers behind a queue and background listener
+        if config.get("queue", {}).get("enabled", False):
+            logger_names = [""] + list(config["logging"].get("loggers", {}))
+            _start_log_queue_listener(logger_names)
+
         # Dynamically get the logger's name from YAML configuration
         logger_name = next(
             iter(config["logging"]["loggers"]),"default_logger"
         )
-        setup_logger.debug(f"Logger name: {logger_name}")
+        setup_logger.debug("Logger name: %s", logger_name)
         
         # Use the logger name dynamically
         logger = logging.getLogger(logger_name)
+        _configured_logger = logger
+        _configured_signature = signature
         setup_logger.info(
             f"Generated {logger_name} from {yaml_config_file_path}"
         )
@@ -85,3 +222,171 @@ def get_custom_logger(yaml_config_file_path: str):
         raise RuntimeError(
             f"RuntimeError: unexpected error occurred in custom_logger: {e}"
         ) from e
+
+
+def _get_config_signature(yaml_config_file_path: str):
+    """(path, modification time, size) of a YAML file, None if missing"""
+    signature = get_file_signature(yaml_config_file_path)
+    if signature is None:
+        return None
+    return (os.path.abspath(yaml_config_file_path), *signature)
+
+
+def _start_log_queue_listener(logger_names: list):
+    """Replace the handlers of loggers with a queue and background listener
+
+    Logging calls then only put records on the queue, and the configured 
+    stream and file handlers are run on the listener's thread. A 
+    multiprocessing queue is used so worker processes can log to the same 
+    listener, see use_log_queue.
+
+    Args:
+        logger_names (list): names of the loggers, "" for the root logger
+    """
+    global _log_queue, _log_queue_listener, _log_queue_listener_pid, \
+        _log_queue_finalizer
+    # A spawn context queue can be shared with both forked and spawned workers
+    _log_queue = multiprocessing.get_context("spawn").Queue(-1)
+
+    logger_handlers = _attach_queue_handlers(logger_names, _log_queue)
+    _log_queue_listener = LoggerQueueListener(_log_queue, logger_handlers)
+    _log_queue_listener.start()
+    _log_queue_listener_pid = os.getpid()
+    setup_logger.debug("Started log queue listener for %s", logger_names)
+
+    # Flush queued log records at exit, registered after the queue so it runs
+    # before multiprocessing closes the queue at exit
+    atexit.unregister(stop_log_queue_listener)
+    atexit.register(stop_log_queue_listener)
+    # Worker processes skip atexit, but run multiprocessing finalizers before
+    # their queues are closed
+    if _log_queue_finalizer is not None:
+        _log_queue_finalizer.cancel()
+    _log_queue_finalizer = multiprocessing.util.Finalize(
+        None, stop_log_queue_listener, exitpriority=100
+    )
+
+
+def _attach_queue_handlers(logger_names: list, log_queue):
+    """Swap the handlers of loggers for queue handlers on a log queue
+
+    Args:
+        logger_names (list): names of the loggers, "" for the root logger
+        log_queue (multiprocessing.Queue): queue read by the listener
+
+    Returns:
+        dict: handlers removed from each logger, keyed by logger name
+    """
+    logger_handlers = {}
+    for logger_name in logger_names:
+        logger = logging.getLogger(logger_name)
+        if not logger.handlers:
+            continue
+        logger_handlers[logger_name] = list(logger.handlers)
+        for handler in logger_handlers[logger_name]:
+            logger.removeHandler(handler)
+        logger.addHandler(LoggerQueueHandler(log_queue, logger_name))
+    return logger_handlers
+
+
+def stop_log_queue_listener():
+    """Flush the log queue, stop its listener and restore the handlers
+
+    The loggers get their configured handlers back, so no records are left
+    on a queue nobody reads. Registered to run at exit, and safe to call when
+    queue handlers are not enabled.
+    """
+    global _log_queue, _log_queue_listener, _log_queue_listener_pid, \
+        _configured_signature
+    # A forked worker holds a copy of the listener of its parent process
+    if _log_queue_listener is None or _log_queue_listener_pid != os.getpid():
+        return
+    # The configuration is no longer applied as it was
+    _configured_signature = None
+    _log_queue_listener.stop()
+    for logger_name, handlers in _log_queue_listener.logger_handlers.items():
+        logger = logging.getLogger(logger_name)
+        for handler in list(logger.handlers):
+            if isinstance(handler, LoggerQueueHandler):
+                logger.removeHandler(handler)
+        for handler in handlers:
+            logger.addHandler(handler)
+    _log_queue = None
+    _log_queue_listener = None
+    _log_queue_listener_pid = None
+
+
+def get_log_queue():
+    """Returns the queue of the log queue listener to hand to worker processes
+
+    Returns:
+        multiprocessing.Queue: 
+            the log queue, or None if queue handlers are not enabled
+    """
+    return _log_queue
+
+
+def use_log_queue(log_queue):
+    """Send the records of a worker process to its parent's log queue
+
+    Call in the initializer of worker processes with the queue from 
+    get_log_queue in the parent. Forked workers already inherit the parent's
+    queue handlers, while spawned workers configure logging afresh on import
+    and are moved from their own listener to the parent's here.
+
+    Args:
+        log_queue (multiprocessing.Queue): 
+            queue of the parent's log queue listener, or None to leave the
+            logging configuration as it is
+    """
+    global _log_queue, _configured_signature
+    if log_queue is None or log_queue is _log_queue:
+        return
+
+    if _log_queue_listener is not None and \
+        _log_queue_listener_pid == os.getpid():
+        # Spawned worker, swap its own listener for the parent's queue, 
+        # keeping the configuration marked as applied so later imports do
+        # not undo the swap
+        logger_names = list(_log_queue_listener.logger_handlers)
+        configured_signature = _configured_signature
+        stop_log_queue_listener()
+        _attach_queue_handlers(logger_names, log_queue)
+        _configured_signature = configured_signature
+    else:
+        # Forked worker, point the inherited queue handlers at the queue
+        for logger in [logging.getLogger()] + [
+            logging.getLogger(name) for name in logging.root.manager.loggerDict
+        ]:
+            for handler in logger.handlers:
+                if isinstance(handler, LoggerQueueHandler):
+                    handler.queue = log_queue
+    _log_queue = log_queue
+
+
+def summarise_array(array: np.ndarray):
+    """Summarise an array for log and error messages
+
+    Small arrays are shown whole, larger arrays by their shape, dtype, 
+    min/max and first values rather than dumping every value.
+
+    Args:
+        array (np.ndarray): array to summarise
+
+    Returns:
+        str: summary of the array
+    """
+    array = np.asarray(array)
+    if array.size <= MAX_LOGGED_ARRAY_SIZE:
+        return np.array2string(array, separator=", ")
+
+    summary = f"array(shape={array.shape}, dtype={array.dtype}"
+    if np.issubdtype(array.dtype, np.number):
+        # NaN aware so a missing value does not hide the range of the data
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            summary += f", min={np.nanmin(array)}, max={np.nanmax(array)}"
+    head = np.array2string(
+        array.ravel()[:ARRAY_SUMMARY_HEAD], separator=", "
+    )
+    return summary + f", head={head[:-1]}, ...])"
@@ -4,14 +4,18 @@
 
 # Python in built modules
 import argparse
-
-# Third party modules
-import numpy as np
+import atexit
+import os
+import signal
+import sys
+import threading
 
 # Custom modules
 from custom_logger import get_custom_logger
 import DataImportExport as die
-import ForecasterReferenceBook as frb
+import Instrumentation as instr
+import Pipeline as pl
+import Profiling as prof
 
 # =============================================================================
 # Variables
@@ -33,9 +37,66 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="files for mph processing")
     parser.add_argument("-c", "--config_file_path", type=str, required=True,
         help="YAML configuration file")
+    parser.add_argument("--chunk-size", type=int, default=None,
+        help="stream the data file in batches of this many rows")
+    parser.add_argument("--incremental", action="store_true",
+        help="process only the rows appended to the data file since the last"
+        " incremental run, appending their outputs to the output file")
+    parser.add_argument("--input-glob", type=str, default=None,
+        help="batch mode: glob pattern of .csv data files to process")
+    parser.add_argument("--manifest", type=str, default=None,
+        help="batch mode: file listing one .csv data file path per line")
+    parser.add_argument("--output-dir", type=str, default=None,
+        help="batch and watch modes: output directory, defaults to that of"
+        " the configured output file")
+    parser.add_argument("--workers", type=int, default=None,
+        help="batch mode: number of worker processes, defaults to CPU count")
+    parser.add_argument("--compute-workers", type=int, default=None,
+        help="number of threads computing each data file, overriding the"
+        " compute_workers of the configuration")
+    parser.add_argument("--watch", type=str, default=None,
+        metavar="DIRECTORY",
+        help="watch mode: process each .csv data file landing in this"
+        " directory, holding the reference data loaded, until interrupted")
+    parser.add_argument("--poll-interval", type=float, default=None,
+        help="watch mode: seconds between scans of the watched directory,"
+        " 0.2 by default")
+    parser.add_argument("--ingest", type=str, default=None,
+        metavar="STORE_DIRECTORY",
+        help="convert the configured .csv data file into a column store of"
+        " memory mapped .npy files in this directory and exit, then set it as"
+        " the data file path")
+    parser.add_argument("--metrics-file", type=str, default=None,
+        help="write the time, rows and peak memory of each stage at exit, as"
+        " Prometheus text for .prom or .txt files and JSON otherwise")
+    parser.add_argument("--profile", action="append", default=None,
+        choices=prof.PROFILE_MODES,
+        help="profile the run with cProfile (cpu) and/or tracemalloc (mem),"
+        " writing the profiles next to the log file, may be repeated")
+    parser.add_argument("--profile-top", type=int,
+        default=prof.DEFAULT_TOP_ALLOCATIONS,
+        help="number of allocation sites in the mem profile summary")
     args = parser.parse_args()
+    if args.incremental and args.chunk_size is not None:
+        parser.error("--incremental cannot be combined with --chunk-size")
     config_file_path = args.config_file_path
 
+    # Record the stage metrics, and write them at exit, including failed and
+    # batch runs
+    if args.metrics_file is not None:
+        instr.enable_stage_metrics()
+        atexit.register(instr.write_metrics_file, args.metrics_file)
+
+    # Profile the whole run, writing the profiles at exit
+    if args.profile is not None:
+        profiler = prof.Profiler(
+            args.profile,
+            prof.get_profile_file_prefix("data/logging_config.yaml"),
+            args.profile_top
+        )
+        profiler.start()
+        atexit.register(profiler.stop)
+
     # =========================================================================
     # Programme
     # =========================================================================
@@ -45,83 +106,113 @@ if __name__ == "__main__":
     # Import configuration data
     config_data = die.import_yaml_configuration_file(config_file_path)
 
-    # Import constants, K lookup, and raw data
-    imported_constants_data = die.import_csv_data_file(
-        config_data["constants"]["constants_file_path"], 
-        config_data["constants"]["constants_columns"]
-    )
-    imported_lookup_data = die.import_csv_data_file(
-        config_data["k_lookup"]["k_lookup_file_path"], 
-        config_data["k_lookup"]["k_lookup_columns"]
-    )
-    imported_data = die.import_csv_data_file(
-        config_data["data"]["data_file_path"], 
-        config_data["data"]["data_columns"]
-    )
-
-    # Initialise K values to predict
-    logger.info(
-        "Initialising K () array for imported data for" \
-        " Temp. min. noon (celcius) computations..."
-    )
-    imported_data["K ()"] = np.zeros_like(imported_data["Temp. noon (celcius)"])
-    logger.debug(f"Initialised K values: {imported_data['K ()']}")
-    logger.info(
-        "Initialised K () array for imported data for" \
-        " Temp. min. noon (celcius) computations"
-    )
-
-    # Round the wind speeds array for K lookup
-    logger.info(
-        "Rounding wind speed (knots) array for imported data for" \
-        " K value lookup..."
-    )
-    imported_data["Wind speed (knots)"] = imported_data["Wind speed (knots)"].round()
-    logger.debug(f"Rounded wind speeds: {imported_data['Wind speed (knots)']}")
-    logger.info(
-        "Rounded wind speed (knots) array for imported data for" \
-        " K value lookup"
-    )
-
-    # Round the cloud cover array for K loohup
-    logger.info(
-        "Rounding cloud cover (oktas) array for imported data for" \
-        " K value lookup..."
-    )
-    imported_data["Cloud cover (oktas)"] = imported_data["Cloud cover (oktas)"].round()
-    logger.debug(f"Rounded cloud cover: {imported_data['Cloud cover (oktas)']}")
-    logger.info(
-        "Round cloud cover (oktas) array for imported data for" \
-        " K value lookup"
-    )
-
-    # K lookup values to predict
-    imported_data["K ()"] = frb.get_K_lookup(
-        imported_data["Wind speed (knots)"],
-        imported_lookup_data["Wind speed min. (knots)"],
-        imported_lookup_data["Wind speed max. (knots)"],
-        imported_data["Cloud cover (oktas)"],
-        imported_lookup_data["Cloud cover min. (oktas)"],
-        imported_lookup_data["Cloud cover max. (oktas)"],
-        imported_lookup_data["K ()"],
-    )
-
-    # Calculate T min at noon
-    imported_data["Temp. min. noon (celcius)"] = frb.calculate_temperature_min_noon_celcius(
-        imported_data["Temp. noon (celcius)"],
-        imported_data["Temp. dew point noon (celcius)"],
-        imported_data["K ()"],
-        coeff=[
-            imported_constants_data["Temp. noon coeff (/celcius)"],
-            imported_constants_data["Temp. dew point noon coeff (/celcius)"],
-            imported_constants_data["Temp. constant (celcius)"],
-        ],
-    )
-
-    # Export computations and imported data
-    die.export_csv_data_file(
-        config_data["outputs"]["output_file_path"],
-        list(imported_data.keys()), imported_data
-    )
+    # Threads computing each data file
+    if args.compute_workers is not None:
+        config_data["compute_workers"] = args.compute_workers
+
+    # Ingest mode, convert the data file into a column store once
+    if args.ingest is not None:
+        die.ingest_csv_data_file(
+            config_data["data"]["data_file_path"],
+            args.ingest,
+            config_data["data"]["data_columns"],
+            config_data["data"].get("data_column_dtypes"),
+            config_data.get("precision"),
+            config_data["data"].get("compact_columns", False),
+            args.chunk_size or die.INGEST_CHUNK_SIZE
+        )
+        logger.info(f"Executed forecaster's referenece book method")
+        sys.exit(0)
+
+    # Watch mode, process data files as they land until interrupted
+    if args.watch is not None:
+        # Only watch runs need the directory watcher
+        import DirectoryWatcher as dw
+
+        watcher = dw.DirectoryWatcher(
+            config_file_path,
+            args.watch,
+            args.output_dir or os.path.dirname(
+                config_data["outputs"]["output_file_path"]
+            ),
+            args.poll_interval or dw.DEFAULT_POLL_INTERVAL,
+            chunk_size=args.chunk_size,
+            compute_workers=config_data.get("compute_workers")
+        )
+        stop_event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+        try:
+            watcher.run(stop_event)
+
+        except KeyboardInterrupt:
+            logger.info(f"Interrupted watching {args.watch}")
+        logger.info(f"Executed forecaster's referenece book method")
+        sys.exit(0)
+
+    # Batch mode, fan the data files out over worker processes
+    if args.input_glob is not None or args.manifest is not None:
+        # Only batch runs need the process pool
+        import BatchRunner as br
+
+        input_files = br.resolve_input_files(args.input_glob, args.manifest)
+        output_directory = args.output_dir or os.path.dirname(
+            config_data["outputs"]["output_file_path"]
+        )
+        summaries = br.run_batch(
+            config_data,
+            input_files,
+            output_directory,
+            workers=args.workers,
+            chunk_size=args.chunk_size
+        )
+        logger.info(f"Executed forecaster's referenece book method")
+        sys.exit(0 if all(summary["success"] for summary in summaries) else 1)
+
+    # Compute K and Temp. min. noon (celcius) for the data and export
+    if args.incremental:
+        # Import constants and K lookup, the new rows are read from the
+        # data file
+        coeff, K_index = pl.load_reference_data(config_data)
+        pl.run_incremental(
+            config_data["data"]["data_file_path"],
+            config_data["data"]["data_columns"],
+            config_data["outputs"]["output_file_path"],
+            coeff,
+            K_index,
+            config_data["data"].get("data_column_dtypes"),
+            config_data["data"].get("compact_columns", False),
+            config_data["outputs"].get("output_float_format"),
+            config_data["outputs"].get("output_compression"),
+            config_data.get("compute_workers")
+        )
+    elif args.chunk_size is None:
+        # Import constants, K lookup and data concurrently
+        coeff, K_index, imported_data = pl.load_inputs(config_data)
+        pl.run_imported(
+            imported_data,
+            config_data["outputs"]["output_file_path"],
+            coeff,
+            K_index,
+            config_data["outputs"].get("output_file_format"),
+            config_data["outputs"].get("output_float_format"),
+            config_data["outputs"].get("output_compression"),
+            config_data.get("compute_workers")
+        )
+    else:
+        # Import constants and K lookup, the data is streamed
+        coeff, K_index = pl.load_reference_data(config_data)
+        pl.run_chunked(
+            config_data["data"]["data_file_path"],
+            config_data["data"]["data_columns"],
+            config_data["outputs"]["output_file_path"],
+            coeff,
+            K_index,
+            args.chunk_size,
+            config_data["data"].get("data_column_dtypes"),
+            config_data["data"].get("compact_columns", False),
+            config_data["outputs"].get("output_float_format"),
+            config_data["outputs"].get("output_compression"),
+            config_data.get("compute_workers")
+        )
 
     logger.info(f"Executed forecaster's referenece book method")
@@ -0,0 +1,169 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python modules
+import os
+import shutil
+import tempfile
+import unittest
+
+# Testing module
+import BatchRunner as br
+import DataImportExport as die
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Configuration data for the reference book method
+CONFIG_FILE_PATH = "data/forecasters_reference_book_config.yaml"
+DATA_FILE_PATH = "data/initial_data.csv"
+EXPECTED_OUTPUT_FILE_PATH = "outputs/initial_outputs.csv"
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+
+class TestResolveInputFiles(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary directory of data files and a manifest"""
+        self.directory = tempfile.mkdtemp()
+        self.data_files = []
+        for name in ["b.csv", "a.csv"]:
+            data_file_path = os.path.join(self.directory, name)
+            open(data_file_path, "w").close()
+            self.data_files.append(data_file_path)
+        self.manifest = os.path.join(self.directory, "manifest.txt")
+        with open(self.manifest, "w") as f:
+            f.write(f"# station files\n{self.data_files[0]}\n\nc.csv\n")
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.directory)
+
+    def test_glob_and_manifest(self):
+        """Test glob matches are sorted and manifest duplicates dropped"""
+        input_files = br.resolve_input_files(
+            os.path.join(self.directory, "*.csv"), self.manifest
+        )
+        self.assertEqual(
+            input_files,
+            [self.data_files[1], self.data_files[0], "c.csv"]
+        )
+
+    def test_missing_manifest(self):
+        """Test a FileNotFoundError is raised for a missing manifest"""
+        with self.assertRaises(FileNotFoundError):
+            br.resolve_input_files(
+                manifest_file_path=os.path.join(self.directory, "none.txt")
+            )
+
+    def test_output_file_path(self):
+        """Test output file names, with the extension of a compression"""
+        self.assertEqual(
+            br.get_output_file_path("data/a.csv", "outputs"),
+            os.path.join("outputs", "a_outputs.csv")
+        )
+        self.assertEqual(
+            br.get_output_file_path("data/a.csv", "outputs", "gzip"),
+            os.path.join("outputs", "a_outputs.csv.gz")
+        )
+
+
+class TestRunBatch(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary directory of station data files"""
+        self.directory = tempfile.mkdtemp()
+        self.output_directory = os.path.join(self.directory, "outputs")
+        self.input_files = []
+        for station in range(3):
+            data_file_path = os.path.join(
+                self.directory, f"station_{station}.csv"
+            )
+            shutil.copy(DATA_FILE_PATH, data_file_path)
+            self.input_files.append(data_file_path)
+        self.bad_file = os.path.join(self.directory, "station_bad.csv")
+        with open(self.bad_file, "w") as f:
+            f.write("A,B\n1,2\n")
+        self.config_data = die.import_yaml_configuration_file(
+            CONFIG_FILE_PATH
+        )
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.directory)
+
+    def test_outputs_and_summary(self):
+        """Test each data file is written to its own output and summarised"""
+        summaries = br.run_batch(
+            self.config_data,
+            self.input_files + [self.bad_file],
+            self.output_directory,
+            workers=2
+        )
+        with open(EXPECTED_OUTPUT_FILE_PATH, "rb") as f:
+            expected = f.read()
+        for data_file_path, summary in zip(self.input_files, summaries):
+            self.assertTrue(summary["success"])
+            self.assertEqual(summary["file"], data_file_path)
+            self.assertEqual(summary["rows"], 4)
+            with open(summary["output"], "rb") as f:
+                self.assertEqual(f.read(), expected)
+        self.assertFalse(summaries[-1]["success"])
+        self.assertIn("KeyError", summaries[-1]["error"])
+
+    def test_resume(self):
+        """Test a batch run again skips the data files already written"""
+        journal_file = os.path.join(
+            self.output_directory, br.BATCH_JOURNAL_FILE
+        )
+        summaries = br.run_batch(
+            self.config_data,
+            self.input_files + [self.bad_file],
+            self.output_directory,
+            workers=2
+        )
+        self.assertFalse(any(summary["resumed"] for summary in summaries))
+        self.assertTrue(os.path.exists(journal_file))
+
+        # A changed data file is processed again
+        with open(self.input_files[0], "a") as f:
+            f.write("\n")
+        summaries = br.run_batch(
+            self.config_data, self.input_files, self.output_directory
+        )
+        self.assertEqual(
+            [summary["resumed"] for summary in summaries],
+            [False, True, True]
+        )
+        self.assertTrue(all(summary["success"] for summary in summaries))
+        self.assertEqual(summaries[1]["rows"], 4)
+        self.assertFalse(os.path.exists(journal_file))
+
+    def test_same_file_names_rejected(self):
+        """Test data files sharing an output file are rejected up front"""
+        input_files = []
+        for station in ["north", "south"]:
+            os.makedirs(os.path.join(self.directory, station))
+            data_file_path = os.path.join(self.directory, station, "data.csv")
+            shutil.copy(DATA_FILE_PATH, data_file_path)
+            input_files.append(data_file_path)
+        with self.assertRaises(ValueError) as context:
+            br.run_batch(
+                self.config_data, input_files, self.output_directory
+            )
+        self.assertIn("data_outputs.csv", str(context.exception))
+        self.assertFalse(os.path.exists(self.output_directory))
+
+
+
+# =============================================================================
+# Test execution
+# =============================================================================
+
+if __name__ == "__main__":
+    unittest.main()
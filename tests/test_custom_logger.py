@@ -3,15 +3,22 @@
 # =============================================================================
 
 # Python modules
+import copy
 import logging
+import multiprocessing
 import os
+import subprocess
+import sys
 import unittest
+from unittest import mock
 
 # Third party modules
+import numpy as np
 import yaml
 
 # Testing module
-from custom_logger import get_custom_logger
+import custom_logger
+from custom_logger import ArraySummary, get_custom_logger, summarise_array
 
 # =============================================================================
 # Tests
@@ -155,6 +162,219 @@ class TestGetCustomLogger(unittest.TestCase):
                 "Logger creation test failed due to an  unexpected error: {e}"
             )
 
+    def test_unchanged_configuration_not_reapplied(self):
+        """Test a second call for the same unchanged file returns early"""
+        custom_logger._configured_signature = None
+        with mock.patch.object(
+            logging.config, "dictConfig", wraps=logging.config.dictConfig
+        ) as dict_config:
+            logger = get_custom_logger(self.test_yaml_file)
+            self.assertIs(get_custom_logger(self.test_yaml_file), logger)
+        self.assertEqual(dict_config.call_count, 1)
+
+    def test_changed_configuration_reapplied(self):
+        """Test the configuration is applied again once the file changes"""
+        custom_logger._configured_signature = None
+        with mock.patch.object(
+            logging.config, "dictConfig", wraps=logging.config.dictConfig
+        ) as dict_config:
+            get_custom_logger(self.test_yaml_file)
+
+            # Modification time changed, same size
+            stat = os.stat(self.test_yaml_file)
+            os.utime(
+                self.test_yaml_file,
+                ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9)
+            )
+            get_custom_logger(self.test_yaml_file)
+            self.assertEqual(dict_config.call_count, 2)
+
+            # Size changed, same modification time
+            stat = os.stat(self.test_yaml_file)
+            with open(self.test_yaml_file, "a") as file:
+                file.write("\n")
+            os.utime(
+                self.test_yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns)
+            )
+            get_custom_logger(self.test_yaml_file)
+            self.assertEqual(dict_config.call_count, 3)
+            get_custom_logger(self.test_yaml_file)
+            self.assertEqual(dict_config.call_count, 3)
+
+    def test_import_without_pandas(self):
+        """Test importing the modules does not import pandas"""
+        code = (
+            "import sys\n"
+            "import custom_logger, DataImportExport, ForecasterReferenceBook\n"
+            "import Pipeline, main\n"
+            "raise SystemExit('pandas' in sys.modules)\n"
+        )
+        src_path = os.path.abspath(
+            os.path.join(os.path.dirname(__file__), "../src/")
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.join(src_path, ".."),
+            env={**os.environ, "PYTHONPATH": src_path},
+            capture_output=True
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+def log_from_worker(yaml_config_file_path, log_queue):
+    """Log a record from a worker process through the parent's log queue"""
+    logger = get_custom_logger(yaml_config_file_path)
+    custom_logger.use_log_queue(log_queue)
+    logger.info("worker record")
+
+
+class TestGetCustomLoggerQueue(unittest.TestCase):
+
+    def setUp(self):
+        """Create a logging configuration with queue handlers enabled"""
+        self.test_yaml_file = "test_queue_logging_config.yaml"
+        self.test_log_file = "test_queue_logging.log"
+        self.logging_config = {
+            "logging": {
+                "version": 1,
+                "disable_existing_loggers": False,
+                "formatters": {
+                    "default": {"format": "%(levelname)s - %(message)s"}
+                },
+                "handlers": {
+                    "file": {
+                        "class": "logging.FileHandler",
+                        "level": "INFO",
+                        "formatter": "default",
+                        "filename": self.test_log_file,
+                    }
+                },
+                "loggers": {
+                    "test_queue_logger": {
+                        "level": "DEBUG",
+                        "handlers": ["file"],
+                        "propagate": False
+                        }
+                },
+                "root": {"level": "INFO", "handlers": []},
+            },
+            "queue": {"enabled": True},
+        }
+        with open(self.test_yaml_file, "w") as file:
+            yaml.dump(self.logging_config, file)
+
+    def tearDown(self):
+        """Stop the listener and remove the temporary files"""
+        custom_logger.stop_log_queue_listener()
+        logging.getLogger("test_queue_logger").handlers.clear()
+        for file in [self.test_yaml_file, self.test_log_file]:
+            if os.path.exists(file):
+                os.remove(file)
+
+    def read_log(self):
+        """Flush the log queue and return the lines of the log file"""
+        custom_logger.stop_log_queue_listener()
+        with open(self.test_log_file, "r") as file:
+            return file.read().splitlines()
+
+    def test_handlers_replaced_by_queue_handler(self):
+        """Test the configured handlers are moved behind a queue"""
+        logger = get_custom_logger(self.test_yaml_file)
+        self.assertEqual(len(logger.handlers), 1)
+        self.assertIsInstance(
+            logger.handlers[0], custom_logger.LoggerQueueHandler
+        )
+        self.assertIsNotNone(custom_logger.get_log_queue())
+
+    def test_records_written_with_handler_levels(self):
+        """Test queued records reach the file, respecting handler levels"""
+        logger = get_custom_logger(self.test_yaml_file)
+        logger.debug("debug record")
+        logger.info("info record %s", 1)
+        self.assertEqual(self.read_log(), ["INFO - info record 1"])
+
+    def test_records_from_worker_process(self):
+        """Test records logged in a worker process reach the parent's file"""
+        get_custom_logger(self.test_yaml_file)
+        context = multiprocessing.get_context("spawn")
+        process = context.Process(
+            target=log_from_worker,
+            args=(self.test_yaml_file, custom_logger.get_log_queue())
+        )
+        process.start()
+        process.join()
+        self.assertIn("INFO - worker record", self.read_log())
+
+    def test_stopped_listener_reapplies_configuration(self):
+        """Test stopping the listener clears the configuration applied"""
+        get_custom_logger(self.test_yaml_file)
+        custom_logger.stop_log_queue_listener()
+        self.assertIsNone(custom_logger._configured_signature)
+        logger = logging.getLogger("test_queue_logger")
+        self.assertIsInstance(logger.handlers[0], logging.FileHandler)
+
+        # The next call moves the handlers behind a queue again
+        with mock.patch.object(
+            logging.config, "dictConfig", wraps=logging.config.dictConfig
+        ) as dict_config:
+            get_custom_logger(self.test_yaml_file)
+        self.assertEqual(dict_config.call_count, 1)
+        self.assertIsInstance(
+            logger.handlers[0], custom_logger.LoggerQueueHandler
+        )
+
+    def test_queue_disabled(self):
+        """Test handlers are left in place when the queue is not enabled"""
+        config = copy.deepcopy(self.logging_config)
+        config["queue"]["enabled"] = False
+        with open(self.test_yaml_file, "w") as file:
+            yaml.dump(config, file)
+        logger = get_custom_logger(self.test_yaml_file)
+        self.assertIsInstance(logger.handlers[0], logging.FileHandler)
+        self.assertIsNone(custom_logger.get_log_queue())
+
+
+class TestSummariseArray(unittest.TestCase):
+
+    def test_small_array_shown_whole(self):
+        """Test a small array is shown with all its values"""
+        self.assertEqual(summarise_array(np.array([1.5, 2.0])), "[1.5, 2. ]")
+
+    def test_large_array_summarised(self):
+        """Test a large array is summarised rather than dumped"""
+        summary = summarise_array(np.arange(1000.0))
+        self.assertEqual(
+            summary,
+            "array(shape=(1000,), dtype=float64, min=0.0, max=999.0," \
+            " head=[0., 1., 2., 3., 4., ...])"
+        )
+
+    def test_large_array_with_nan(self):
+        """Test missing values do not hide the range of a large array"""
+        array = np.arange(20.0)
+        array[0] = np.nan
+        self.assertIn("min=1.0, max=19.0", summarise_array(array))
+
+
+class TestArraySummary(unittest.TestCase):
+
+    def test_not_formatted_when_level_disabled(self):
+        """Test the array is not summarised if the record is not emitted"""
+        logger = logging.getLogger("test_array_summary")
+        logger.setLevel(logging.INFO)
+
+        class Unformattable:
+            def __array__(self, *args, **kwargs):
+                raise AssertionError("array was formatted")
+
+        logger.debug("data: %s", ArraySummary(Unformattable()))
+
+    def test_dictionary_of_arrays(self):
+        """Test each array of a dictionary is summarised"""
+        summary = str(ArraySummary({"A": np.arange(100), "B": np.array([1])}))
+        self.assertTrue(summary.startswith("{'A': array(shape=(100,)"))
+        self.assertTrue(summary.endswith("'B': [1]}"))
+
 
 # =============================================================================
 # Test execution
@@ -3,8 +3,12 @@
 # =============================================================================
 
 # Python modules
+import importlib.util
 import os
+import tempfile
+import time
 import unittest
+from unittest import mock
 
 # Third party modules
 import numpy as np
@@ -14,6 +18,13 @@ import yaml
 # Testing module
 import DataImportExport as die
 
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Parquet and Arrow/Feather data files need the optional pyarrow package
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
 # =============================================================================
 # Tests
 # =============================================================================
@@ -255,6 +266,635 @@ class TestExportCsvDataFile(unittest.TestCase):
         os.chmod(self.permission_denied_csv, 0o666)
 
 
+class TestFastCsvExport(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary directory and columns of every kind"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.directory.name, "output.csv")
+        self.expected_csv = os.path.join(self.directory.name, "expected.csv")
+        self.export_data = {
+            "Temp. noon (celcius)": np.array([22.4, 0.1 + 0.2, np.nan, 1e20]),
+            "Float32": np.array([9.434, 15.0, np.nan, -2.5], dtype=np.float32),
+            "Location": np.array([1003, 7, 1003, 70000]),
+            "Date": np.array([19000, 19000, 19001, 19002], dtype=np.int32),
+            "Name": np.array(["a", "b,c", 'd"e', None], dtype=object),
+        }
+        self.columns = list(self.export_data.keys())
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.directory.cleanup()
+
+    def read_bytes(self, file: str):
+        """Returns the bytes of a file"""
+        with open(file, "rb") as f:
+            return f.read()
+
+    def test_matches_pandas(self):
+        """Test the bytes match pandas' to_csv, including compact columns"""
+        pd.DataFrame(self.export_data).to_csv(self.expected_csv, index=False)
+        export_data = die.encode_compact_columns(dict(self.export_data))
+        die.export_csv_data_file(self.csv, self.columns, export_data)
+        self.assertEqual(
+            self.read_bytes(self.csv), self.read_bytes(self.expected_csv)
+        )
+
+    def test_blocks_and_append(self):
+        """Test rows over several blocks and appended rows match pandas"""
+        values = np.random.default_rng(0).normal(10, 5, 2500)
+        export_data = {"A": values, "B": np.arange(2500)}
+        pd.DataFrame(export_data).to_csv(self.expected_csv, index=False)
+        with mock.patch.object(die, "EXPORT_BLOCK_ROWS", 1000):
+            die.export_csv_data_file(
+                self.csv, 
+                ["A", "B"], 
+                {"A": values[:2000], "B": export_data["B"][:2000]}
+            )
+            die.export_csv_data_file(
+                self.csv, 
+                ["A", "B"], 
+                {"A": values[2000:], "B": export_data["B"][2000:]}, 
+                append=True
+            )
+        self.assertEqual(
+            self.read_bytes(self.csv), self.read_bytes(self.expected_csv)
+        )
+
+    def test_float_format(self):
+        """Test a float format is applied to floating point columns only"""
+        pd.DataFrame(self.export_data).to_csv(
+            self.expected_csv, index=False, float_format="%.3f"
+        )
+        die.export_csv_data_file(
+            self.csv, self.columns, self.export_data, float_format="%.3f"
+        )
+        self.assertEqual(
+            self.read_bytes(self.csv), self.read_bytes(self.expected_csv)
+        )
+
+    def test_gzip(self):
+        """Test gzip compression, by file extension, with appended rows"""
+        gzip_csv = self.csv + ".gz"
+        die.export_csv_data_file(gzip_csv, self.columns, self.export_data)
+        die.export_csv_data_file(
+            gzip_csv, self.columns, self.export_data, append=True
+        )
+        df = pd.read_csv(gzip_csv)
+        self.assertEqual(len(df), 8)
+        np.testing.assert_array_equal(
+            df["Location"], np.tile(self.export_data["Location"], 2)
+        )
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("zstandard"), "zstandard not installed"
+    )
+    def test_zstd(self):
+        """Test zstd compression decompresses to the uncompressed bytes"""
+        import zstandard
+        die.export_csv_data_file(self.csv, self.columns, self.export_data)
+        die.export_csv_data_file(
+            self.expected_csv, 
+            self.columns, 
+            self.export_data, 
+            compression="zstd"
+        )
+        with open(self.expected_csv, "rb") as f:
+            data = zstandard.ZstdDecompressor().stream_reader(f).read()
+        self.assertEqual(data, self.read_bytes(self.csv))
+
+    def test_crash_mid_export(self):
+        """Test an export that dies part way leaves the existing file"""
+        with open(self.csv, "w") as f:
+            f.write("previous output\n")
+
+        def crash_after_first_block(*args, **kwargs):
+            yield "A,B\n1.0,2.0\n"
+            raise KeyboardInterrupt
+        with mock.patch.object(
+            die, "_format_csv_blocks", crash_after_first_block
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                die.export_csv_data_file(
+                    self.csv, self.columns, self.export_data
+                )
+        with open(self.csv, "r") as f:
+            self.assertEqual(f.read(), "previous output\n")
+        self.assertEqual(os.listdir(self.directory.name), ["output.csv"])
+
+    def test_unsupported_compression(self):
+        """Test a ValueError is raised for an unsupported compression"""
+        with self.assertRaises(ValueError):
+            die.export_csv_data_file(
+                self.csv, self.columns, self.export_data, compression="bz2"
+            )
+
+
+class TestGetFileFormat(unittest.TestCase):
+
+    def test_format_by_extension(self):
+        """Test the file format is chosen by file extension"""
+        self.assertEqual(die.get_file_format("data.csv"), "csv")
+        self.assertEqual(die.get_file_format("data.PARQUET"), "parquet")
+        self.assertEqual(die.get_file_format("data.feather"), "feather")
+        self.assertEqual(die.get_file_format("data.txt"), "csv")
+
+    def test_format_from_configuration(self):
+        """Test a given file format overrides the file extension"""
+        self.assertEqual(die.get_file_format("data.csv", "parquet"), "parquet")
+
+    def test_unsupported_format(self):
+        """Test a ValueError is raised for an unsupported file format"""
+        with self.assertRaises(ValueError):
+            die.get_file_format("data.csv", "xlsx")
+
+
+@unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+class TestImportExportColumnarDataFile(unittest.TestCase):
+
+    def setUp(self):
+        """Set up temporary file paths and data to export"""
+        self.files = {
+            "parquet": "test_valid_export.parquet",
+            "feather": "test_valid_export.feather",
+        }
+        self.columns = ["A", "B", "C"]
+        self.data = {
+                    "A": np.array([1.0, 2.0, 3.0]),
+                    "B": np.array([4.0, 5.0, 6.0]),
+                    "C": np.array([7, 8, 9])
+                    }
+
+    def tearDown(self):
+        """Remove temporary test files"""
+        try:
+            for file in self.files.values():
+                if os.path.exists(file):
+                    os.remove(file)
+
+        except Exception as e:
+            self.fail(f"Failed to delete test file: {e}")
+
+    def test_round_trip(self):
+        """Test exported data is imported unchanged"""
+        for file_format, file in self.files.items():
+            with self.subTest(file_format=file_format):
+                die.export_data_file(file, self.columns, self.data)
+                result = die.import_data_file(file, self.columns)
+                for col in self.columns:
+                    np.testing.assert_array_equal(result[col], self.data[col])
+                    self.assertEqual(result[col].dtype, self.data[col].dtype)
+
+    def test_column_projection(self):
+        """Test only the selected columns are imported"""
+        for file_format, file in self.files.items():
+            with self.subTest(file_format=file_format):
+                die.export_data_file(file, self.columns, self.data)
+                result = die.import_data_file(file, ["C", "A"])
+                self.assertEqual(list(result.keys()), ["C", "A"])
+
+    def test_missing_columns(self):
+        """Test that a KeyError is raised if required columns are missing"""
+        for file_format, file in self.files.items():
+            with self.subTest(file_format=file_format):
+                die.export_data_file(file, self.columns, self.data)
+                with self.assertRaises(KeyError):
+                    die.import_data_file(file, ["A", "X"])
+
+    def test_non_existent_file(self):
+        """Test that a FileNotFoundError is raised for missing files"""
+        for file_format, file in self.files.items():
+            with self.subTest(file_format=file_format):
+                with self.assertRaises(FileNotFoundError):
+                    die.import_data_file(file, self.columns)
+
+
+class TestImportTypedCsvDataFile(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary CSV file with an unused column"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.directory.name, "test_typed.csv")
+        with open(self.csv, "w") as f:
+            f.write("A,Unused,B\n1.5,x,1\n2.5,y,\n 3.5,,3\n")
+        self.columns = ["A", "B"]
+        self.engines = ["c", "pyarrow"] if HAS_PYARROW else ["c"]
+
+    def tearDown(self):
+        """Remove the CSV file"""
+        self.directory.cleanup()
+
+    def write_csv(self, text: str):
+        """Overwrite the CSV file"""
+        with open(self.csv, "w") as f:
+            f.write(text)
+
+    def test_declared_dtypes(self):
+        """Test columns are parsed to their dtypes, skipping unused columns"""
+        for engine in self.engines:
+            with self.subTest(engine=engine):
+                result = die.import_typed_csv_data_file(
+                    self.csv, self.columns, {"B": "int64"}, engine
+                )
+                self.assertEqual(list(result.keys()), self.columns)
+                np.testing.assert_array_equal(result["A"], [1.5, 3.5])
+                np.testing.assert_array_equal(result["B"], [1, 3])
+                self.assertEqual(result["A"].dtype, np.float64)
+                self.assertEqual(result["B"].dtype, np.int64)
+
+    def test_float32(self):
+        """Test float32 columns are parsed to float32"""
+        result = die.import_typed_csv_data_file(
+            self.csv, self.columns, {"A": "float32"}
+        )
+        self.assertEqual(result["A"].dtype, np.float32)
+
+    def test_non_numeric_values(self):
+        """Test a ValueError is raised for non-numeric values when parsing"""
+        self.write_csv("A,B\n1.5,1\nerror,2\n")
+        for engine in self.engines:
+            with self.subTest(engine=engine):
+                with self.assertRaises(ValueError):
+                    die.import_typed_csv_data_file(
+                        self.csv, self.columns, engine=engine
+                    )
+
+    def test_non_integer_values(self):
+        """Test a ValueError is raised for fractions in integer columns"""
+        self.write_csv("A,B\n1.5,1\n2.5,2.5\n")
+        with self.assertRaises(ValueError):
+            die.import_typed_csv_data_file(
+                self.csv, self.columns, {"B": "int64"}
+            )
+
+    def test_unsupported_dtype(self):
+        """Test a ValueError is raised for an unsupported dtype"""
+        with self.assertRaises(ValueError):
+            die.import_typed_csv_data_file(
+                self.csv, self.columns, {"B": "str"}
+            )
+
+    def test_missing_columns(self):
+        """Test that a KeyError is raised if required columns are missing"""
+        with self.assertRaises(KeyError):
+            die.import_typed_csv_data_file(self.csv, ["A", "X"])
+
+    def test_matches_chunks(self):
+        """Test typed chunks match the typed import of the whole file"""
+        expected = die.import_typed_csv_data_file(
+            self.csv, self.columns, {"B": "int64"}
+        )
+        chunks = list(die.import_csv_data_file_chunks(
+            self.csv, self.columns, 1, {"B": "int64"}
+        ))
+        for col in self.columns:
+            result = np.concatenate([chunk[col] for chunk in chunks])
+            np.testing.assert_array_equal(result, expected[col])
+            self.assertEqual(result.dtype, expected[col].dtype)
+
+    def test_chunks_take_first_dtypes(self):
+        """Test untyped chunks are cast to the dtypes of the first chunk
+
+        The missing value of B turns it to float in the second chunk alone
+        """
+        with mock.patch.object(
+            pd, "read_csv", wraps=pd.read_csv
+        ) as read_csv:
+            chunks = list(die.import_csv_data_file_chunks(
+                self.csv, self.columns, 1
+            ))
+        chunk_reads = [
+            call for call in read_csv.call_args_list
+            if "chunksize" in call.kwargs
+        ]
+        self.assertEqual(len(chunk_reads), 1)
+        self.assertEqual(len(chunks), 3)
+        for chunk in chunks:
+            self.assertEqual(chunk["A"].dtype, np.float64)
+            self.assertEqual(chunk["B"].dtype, np.int64)
+        np.testing.assert_array_equal(chunks[0]["B"], [1])
+        self.assertEqual(len(chunks[1]["B"]), 0)
+
+    def test_chunks_turn_to_float(self):
+        """Test fractions after the first chunk turn integer columns float"""
+        self.write_csv("A,B\n1.5,1\n2.5,2.5\n3.5,3\n")
+        chunks = list(die.import_csv_data_file_chunks(
+            self.csv, self.columns, 1
+        ))
+        self.assertEqual(
+            [chunk["B"].dtype for chunk in chunks],
+            [np.int64, np.float64, np.float64]
+        )
+        np.testing.assert_array_equal(
+            np.concatenate([chunk["B"] for chunk in chunks]), [1, 2.5, 3]
+        )
+
+
+class TestCompactColumns(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary CSV file of station observations"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.directory.name, "test_compact.csv")
+        self.output_csv = os.path.join(self.directory.name, "output.csv")
+        self.columns = ["Temp. noon (celcius)", "Location", "Date"]
+        with open(self.csv, "w") as f:
+            f.write(
+                "Temp. noon (celcius),Location,Date\n"
+                "22.4,1003,19000\n"
+                "18.6,7,19000\n"
+                "26,1003,19001\n"
+                "13.2,70000,19002\n"
+            )
+
+    def tearDown(self):
+        """Remove the CSV files"""
+        self.directory.cleanup()
+
+    def test_encoding(self):
+        """Test Location is dictionary encoded and Date held as int32"""
+        imported_data = die.import_csv_data_file(
+            self.csv, self.columns, compact=True
+        )
+        location = imported_data["Location"]
+        self.assertIsInstance(location, die.DictionaryEncodedArray)
+        self.assertEqual(location.codes.dtype, np.uint16)
+        np.testing.assert_array_equal(location.categories, [7, 1003, 70000])
+        np.testing.assert_array_equal(location, [1003, 7, 1003, 70000])
+        np.testing.assert_array_equal(location[1:3], [7, 1003])
+        self.assertEqual(imported_data["Date"].dtype, np.int32)
+
+    def test_many_stations(self):
+        """Test more than 65536 stations are encoded with uint32 codes"""
+        location = die.DictionaryEncodedArray.encode(np.arange(70000))
+        self.assertEqual(location.codes.dtype, np.uint32)
+        np.testing.assert_array_equal(location.decode(), np.arange(70000))
+
+    def test_round_trip(self):
+        """Test compact columns are exported exactly as imported"""
+        expected_csv = os.path.join(self.directory.name, "expected.csv")
+        for compact, file in [(False, expected_csv), (True, self.output_csv)]:
+            imported_data = die.import_typed_csv_data_file(
+                self.csv,
+                self.columns,
+                {"Location": "int64", "Date": "int64"},
+                compact=compact
+            )
+            die.export_csv_data_file(file, self.columns, imported_data)
+        with open(expected_csv, "r") as f:
+            expected = f.read()
+        with open(self.output_csv, "r") as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_float_dates_left(self):
+        """Test non-integer Date columns are left as imported"""
+        imported_data = die.encode_compact_columns(
+            {"Date": np.array([1.0, 2.5])}
+        )
+        self.assertEqual(imported_data["Date"].dtype, np.float64)
+
+
+class TestImportDataFiles(unittest.TestCase):
+
+    def setUp(self):
+        """Set up temporary CSV files of two stations"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.columns = ["Temp. noon (celcius)", "Location", "Date"]
+        self.files = []
+        for station, text in [
+            (1003, "22.4,1003,19000\n18.6,1003,19001\n"),
+            (7, "26,7,19001\n"),
+        ]:
+            file = os.path.join(self.directory.name, f"station_{station}.csv")
+            with open(file, "w") as f:
+                f.write("Temp. noon (celcius),Location,Date\n" + text)
+            self.files.append(file)
+
+    def tearDown(self):
+        """Remove the CSV files"""
+        self.directory.cleanup()
+
+    def test_concatenated_in_order(self):
+        """Test several data files are concatenated in the order given"""
+        imported_data = die.import_data_files(self.files, self.columns)
+        np.testing.assert_array_equal(
+            imported_data["Temp. noon (celcius)"], [22.4, 18.6, 26]
+        )
+        np.testing.assert_array_equal(
+            imported_data["Location"], [1003, 1003, 7]
+        )
+
+        # Locations are encoded over the rows of every file
+        imported_data = die.import_data_files(
+            self.files, self.columns, compact=True
+        )
+        location = imported_data["Location"]
+        self.assertIsInstance(location, die.DictionaryEncodedArray)
+        np.testing.assert_array_equal(location.categories, [7, 1003])
+        np.testing.assert_array_equal(location, [1003, 1003, 7])
+        self.assertEqual(imported_data["Date"].dtype, np.int32)
+
+    def test_single_data_file(self):
+        """Test a file path or list of one is imported as import_data_file"""
+        expected = die.import_data_file(self.files[0], self.columns)
+        for files in [self.files[0], self.files[:1]]:
+            imported_data = die.import_data_files(files, self.columns)
+            for col in self.columns:
+                np.testing.assert_array_equal(
+                    imported_data[col], expected[col]
+                )
+
+    def test_errors_in_file_order(self):
+        """Test the error of the first data file to fail is raised"""
+        missing_file = os.path.join(self.directory.name, "none.csv")
+        with open(self.files[1], "w") as f:
+            f.write("A,B\n1,2\n")
+        with self.assertRaises(FileNotFoundError):
+            die.import_data_files([missing_file] + self.files, self.columns)
+        with self.assertRaises(KeyError):
+            die.import_data_files(self.files + [missing_file], self.columns)
+        with self.assertRaises(ValueError):
+            die.import_data_files([], self.columns)
+
+    def test_import_concurrently(self):
+        """Test results are returned in order once every import is done"""
+        finished = []
+
+        def import_after(delay: float, result: int):
+            time.sleep(delay)
+            finished.append(result)
+            return result
+
+        results = die.import_concurrently([
+            lambda: import_after(0.05, 0),
+            lambda: import_after(0, 1),
+        ])
+        self.assertEqual(results, [0, 1])
+        self.assertEqual(finished, [1, 0])
+
+
+class TestImportCachedCsvDataFile(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary CSV file and cache directory"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_directory = os.path.join(self.directory.name, "cache")
+        self.csv = os.path.join(self.directory.name, "test_cached.csv")
+        self.columns = ["A", "B (/unit)"]
+        pd.DataFrame(
+            {"A": [1.0, 2.0, 3.0], "B (/unit)": [4, 5, 6]}
+        ).to_csv(self.csv, index=False)
+
+    def tearDown(self):
+        """Remove the CSV file and cache directory"""
+        self.directory.cleanup()
+
+    def test_cache_hit(self):
+        """Test a cached file is imported unchanged without parsing it"""
+        expected = die.import_csv_data_file(self.csv, self.columns)
+        die.import_cached_csv_data_file(
+            self.csv, self.columns, self.cache_directory
+        )
+        self.assertEqual(len(os.listdir(self.cache_directory)), 1)
+        with mock.patch.object(die, "import_csv_data_file") as import_csv:
+            result = die.import_cached_csv_data_file(
+                self.csv, self.columns, self.cache_directory
+            )
+        import_csv.assert_not_called()
+        self.assertEqual(list(result.keys()), self.columns)
+        for col in self.columns:
+            np.testing.assert_array_equal(result[col], expected[col])
+            self.assertEqual(result[col].dtype, expected[col].dtype)
+
+    def test_cache_invalidated_on_change(self):
+        """Test changing the file imports its new contents"""
+        die.import_cached_csv_data_file(
+            self.csv, self.columns, self.cache_directory
+        )
+        pd.DataFrame(
+            {"A": [7.0], "B (/unit)": [8]}
+        ).to_csv(self.csv, index=False)
+        result = die.import_cached_csv_data_file(
+            self.csv, self.columns, self.cache_directory
+        )
+        np.testing.assert_array_equal(result["A"], [7.0])
+        self.assertEqual(len(os.listdir(self.cache_directory)), 2)
+
+    def test_unreadable_cache_file(self):
+        """Test a corrupt cache file is replaced by parsing the file"""
+        cache_file = die.get_cache_file_path(
+            self.csv, self.columns, self.cache_directory
+        )
+        os.makedirs(self.cache_directory)
+        with open(cache_file, "w") as f:
+            f.write("not a cache file")
+        result = die.import_cached_csv_data_file(
+            self.csv, self.columns, self.cache_directory
+        )
+        np.testing.assert_array_equal(result["A"], [1.0, 2.0, 3.0])
+
+    def test_non_existent_csv(self):
+        """Test that a FileNotFoundError is raised for missing files"""
+        with self.assertRaises(FileNotFoundError):
+            die.import_cached_csv_data_file(
+                os.path.join(self.directory.name, "missing.csv"),
+                self.columns,
+                self.cache_directory
+            )
+
+
+
+class TestColumnStore(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary CSV file of station observations"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.directory.name, "test_store.csv")
+        self.store = os.path.join(self.directory.name, "test_store")
+        self.columns = ["Temp. noon (celcius)", "Location", "Date"]
+        self.column_dtypes = {"Location": "int64", "Date": "int64"}
+        with open(self.csv, "w") as f:
+            f.write(
+                "Temp. noon (celcius),Location,Date,Other\n"
+                "22.4,1003,19000,a\n"
+                "18.6,7,19000,b\n"
+                ",7,19001,c\n"
+                "26,1003,19001,d\n"
+                "13.2,70000,19002,e\n"
+            )
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """Test the store imports the same columns memory mapped"""
+        rows = die.ingest_csv_data_file(
+            self.csv, self.store, self.columns, self.column_dtypes, 
+            chunk_size=2
+        )
+        self.assertEqual(rows, 4)
+        self.assertEqual(die.get_file_format(self.store), "npy")
+        expected = die.import_typed_csv_data_file(
+            self.csv, self.columns, self.column_dtypes
+        )
+        imported_data = die.import_data_file(self.store, self.columns)
+        for col in self.columns:
+            self.assertIsInstance(imported_data[col], np.memmap)
+            self.assertFalse(imported_data[col].flags.writeable)
+            self.assertEqual(imported_data[col].dtype, expected[col].dtype)
+            np.testing.assert_array_equal(imported_data[col], expected[col])
+
+    def test_compact_store(self):
+        """Test a compact store is imported without encoding or copying"""
+        die.ingest_csv_data_file(
+            self.csv, self.store, self.columns, self.column_dtypes, 
+            compact=True
+        )
+        imported_data = die.import_column_store(
+            self.store, self.columns, compact=True
+        )
+        location = imported_data["Location"]
+        self.assertIsInstance(location, die.DictionaryEncodedArray)
+        self.assertIsInstance(location.codes, np.memmap)
+        np.testing.assert_array_equal(location, [1003, 7, 1003, 70000])
+        self.assertIsInstance(imported_data["Date"], np.memmap)
+        self.assertEqual(imported_data["Date"].dtype, np.int32)
+
+        # Decoded when not imported compactly
+        imported_data = die.import_column_store(self.store, self.columns)
+        np.testing.assert_array_equal(
+            imported_data["Location"], [1003, 7, 1003, 70000]
+        )
+
+    def test_precision(self):
+        """Test floating point columns are stored at precision"""
+        die.ingest_csv_data_file(
+            self.csv, self.store, self.columns, precision="float32"
+        )
+        imported_data = die.import_column_store(self.store, self.columns)
+        self.assertEqual(
+            imported_data["Temp. noon (celcius)"].dtype, np.float32
+        )
+
+    def test_missing_column(self):
+        """Test a KeyError is raised for a column not in the store"""
+        die.ingest_csv_data_file(self.csv, self.store, self.columns)
+        with self.assertRaises(KeyError):
+            die.import_column_store(self.store, ["Other"])
+
+    def test_failed_ingest_keeps_store(self):
+        """Test a failed ingest leaves the previous store as it was"""
+        die.ingest_csv_data_file(self.csv, self.store, self.columns)
+        with self.assertRaises(KeyError):
+            die.ingest_csv_data_file(self.csv, self.store, ["Missing"])
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)), 
+            ["test_store", "test_store.csv"]
+        )
+        imported_data = die.import_column_store(self.store, self.columns)
+        self.assertEqual(len(imported_data["Date"]), 4)
+
 # =============================================================================
 # Test execution
 # =============================================================================
@@ -0,0 +1,118 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python modules
+import os
+import subprocess
+import sys
+import unittest
+
+# Third party modules
+import numpy as np
+
+# Testing module
+import DataValidation as dv
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Lower bounds of the observations, (lower bound, inclusive)
+LOWER_BOUNDS = {
+    "wind": (0, True),
+    "temp": (-273.15, False),
+}
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+
+class TestValidateLowerBounds(unittest.TestCase):
+
+    def test_valid_columns(self):
+        """Test columns within their bounds pass"""
+        report = dv.validate_lower_bounds(
+            {"wind": np.array([0.0, 5.0]), "temp": np.array([-273.0, 20.0])},
+            LOWER_BOUNDS
+        )
+        self.assertTrue(report)
+        self.assertEqual(len(report.invalid_rows), 0)
+
+    def test_offending_rows_reported(self):
+        """Test the rows failing any check are reported with column counts"""
+        wind = np.zeros(40000)
+        temp = np.full(40000, 10.0)
+        wind[[3, 20000]] = [-1.0, np.nan]
+        temp[[3, 35000, 39999]] = [-273.15, np.inf, -np.inf]
+        report = dv.validate_lower_bounds(
+            {"wind": wind, "temp": temp}, LOWER_BOUNDS
+        )
+        self.assertFalse(report)
+        np.testing.assert_array_equal(
+            report.invalid_rows, [3, 20000, 35000, 39999]
+        )
+        self.assertEqual(report.column_counts, {"wind": 2, "temp": 3})
+        self.assertEqual(
+            str(report),
+            "4 of 40000 rows invalid (wind: 2, temp: 3)," \
+            " rows [3, 20000, 35000, 39999]"
+        )
+
+    def test_integer_columns(self):
+        """Test integer columns are checked"""
+        report = dv.validate_lower_bounds(
+            {"wind": np.array([1, -2, 3])}, {"wind": (0, True)}
+        )
+        np.testing.assert_array_equal(report.invalid_rows, [1])
+
+    def test_mismatched_lengths(self):
+        """Test columns of different lengths raise a ValidationError"""
+        with self.assertRaises(dv.ValidationError):
+            dv.validate_lower_bounds(
+                {"wind": np.zeros(2), "temp": np.zeros(3)}, LOWER_BOUNDS
+            )
+
+
+class TestCheckLowerBounds(unittest.TestCase):
+
+    def test_raises_with_report(self):
+        """Test a ValidationError naming the offending rows is raised"""
+        with self.assertRaises(dv.ValidationError) as context:
+            dv.check_lower_bounds(
+                {"wind": np.array([1.0, -1.0])}, {"wind": (0, True)}
+            )
+        self.assertIn("rows [1]", str(context.exception))
+
+    def test_raises_under_optimisation(self):
+        """Test the checks still run under python -O"""
+        code = (
+            "import numpy as np\n"
+            "import ForecasterReferenceBook as frb\n"
+            "try:\n"
+            "    frb.calculate_temperature_min_noon_celcius(\n"
+            "        np.array([-300.0]), np.array([0.0]), np.array([0.0]),\n"
+            "        [np.array([1.0])] * 3\n"
+            "    )\n"
+            "except AssertionError:\n"
+            "    raise SystemExit(0)\n"
+            "raise SystemExit(1)\n"
+        )
+        src_path = os.path.abspath(
+            os.path.join(os.path.dirname(__file__), "../src/")
+        )
+        result = subprocess.run(
+            [sys.executable, "-O", "-c", code],
+            env={**os.environ, "PYTHONPATH": src_path},
+            capture_output=True
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+# =============================================================================
+# Test execution
+# =============================================================================
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python modules
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+# Third party modules
+import yaml
+
+# Testing module
+import DataImportExport as die
+import DirectoryWatcher as dw
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Configuration data for the reference book method
+CONFIG_FILE_PATH = "data/forecasters_reference_book_config.yaml"
+DATA_FILE_PATH = "data/initial_data.csv"
+EXPECTED_OUTPUT_FILE_PATH = "outputs/initial_outputs.csv"
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+
+class TestDirectoryWatcher(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary watched directory and output directory"""
+        self.directory = tempfile.mkdtemp()
+        self.watch_directory = os.path.join(self.directory, "incoming")
+        self.output_directory = os.path.join(self.directory, "outputs")
+        os.makedirs(self.watch_directory)
+        self.watcher = self.get_watcher()
+        with open(EXPECTED_OUTPUT_FILE_PATH, "rb") as f:
+            self.expected = f.read()
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.directory)
+
+    def get_watcher(self):
+        """Returns a watcher of the watched directory"""
+        return dw.DirectoryWatcher(
+            CONFIG_FILE_PATH, self.watch_directory, self.output_directory
+        )
+
+    def land(self, name: str):
+        """Copy the sample data file into the watched directory"""
+        data_file_path = os.path.join(self.watch_directory, name)
+        shutil.copy(DATA_FILE_PATH, data_file_path)
+        return data_file_path
+
+    def test_new_file_processed_once(self):
+        """Test a data file is processed once stable, then marked done"""
+        data_file_path = self.land("station_1.csv")
+        self.assertEqual(self.watcher.scan(), [])
+        summaries = self.watcher.scan()
+        self.assertEqual(len(summaries), 1)
+        self.assertTrue(summaries[0]["success"])
+        self.assertEqual(summaries[0]["rows"], 4)
+        with open(summaries[0]["output"], "rb") as f:
+            self.assertEqual(f.read(), self.expected)
+        self.assertTrue(
+            os.path.exists(self.watcher.get_done_marker_path(data_file_path))
+        )
+        self.assertEqual(self.watcher.scan(), [])
+
+        # A restarted watcher skips it, until it changes
+        watcher = self.get_watcher()
+        watcher.scan()
+        self.assertEqual(watcher.scan(), [])
+        with open(data_file_path, "a") as f:
+            f.write("\n")
+        watcher.scan()
+        self.assertEqual(len(watcher.scan()), 1)
+
+    def test_growing_file_waits(self):
+        """Test a data file still being written is left until it is stable"""
+        data_file_path = os.path.join(self.watch_directory, "station_1.csv")
+        with open(DATA_FILE_PATH, "r") as f:
+            lines = f.readlines()
+        with open(data_file_path, "w") as f:
+            f.writelines(lines[:2])
+        self.watcher.scan()
+        with open(data_file_path, "a") as f:
+            f.writelines(lines[2:])
+        self.assertEqual(self.watcher.scan(), [])
+        summaries = self.watcher.scan()
+        self.assertEqual(summaries[0]["rows"], 4)
+
+    def test_failed_file_not_retried(self):
+        """Test a bad data file is reported and not retried until changed"""
+        data_file_path = os.path.join(self.watch_directory, "station_bad.csv")
+        with open(data_file_path, "w") as f:
+            f.write("A,B\n1,2\n")
+        self.watcher.scan()
+        summaries = self.watcher.scan()
+        self.assertFalse(summaries[0]["success"])
+        self.assertIn("KeyError", summaries[0]["error"])
+        self.assertFalse(
+            os.path.exists(self.watcher.get_done_marker_path(data_file_path))
+        )
+        self.assertEqual(self.watcher.scan(), [])
+        self.assertEqual(self.watcher.scan(), [])
+
+        shutil.copy(DATA_FILE_PATH, data_file_path)
+        self.watcher.scan()
+        self.assertTrue(self.watcher.scan()[0]["success"])
+
+    def test_run_until_stopped(self):
+        """Test run processes data files until the stop event is set"""
+        self.land("station_1.csv")
+        self.land("station_2.csv")
+        self.assertEqual(self.watcher.run(max_scans=2), 2)
+        stop_event = threading.Event()
+        stop_event.set()
+        self.assertEqual(self.watcher.run(stop_event), 0)
+
+    def test_corrupt_reference_file_kept(self):
+        """Test a corrupt reference file keeps the loaded reference data"""
+        config_file_path = os.path.join(self.directory, "config.yaml")
+        constants_file_path = os.path.join(self.directory, "constants.csv")
+        config_data = die.import_yaml_configuration_file(CONFIG_FILE_PATH)
+        shutil.copy(
+            config_data["constants"]["constants_file_path"],
+            constants_file_path
+        )
+        config_data["constants"]["constants_file_path"] = constants_file_path
+        with open(config_file_path, "w") as f:
+            yaml.safe_dump(config_data, f)
+        watcher = dw.DirectoryWatcher(
+            config_file_path, self.watch_directory, self.output_directory
+        )
+        reference_data = watcher.registry.get(config_file_path)
+
+        with open(constants_file_path, "r") as f:
+            constants = f.read()
+        with open(constants_file_path, "w") as f:
+            f.write("Not,the\nconstants,file\n")
+        self.land("station_1.csv")
+        watcher.scan()
+        summaries = watcher.scan()
+        self.assertTrue(summaries[0]["success"])
+        with open(summaries[0]["output"], "rb") as f:
+            self.assertEqual(f.read(), self.expected)
+        self.assertIs(watcher.registry.get(config_file_path), reference_data)
+
+        # Retried on each scan until the file is fixed
+        with open(constants_file_path, "w") as f:
+            f.write(constants + "\n")
+        watcher.scan()
+        self.assertIsNot(
+            watcher.registry.get(config_file_path), reference_data
+        )
+
+    def test_invalid_options(self):
+        """Test the watched directory cannot also be the output directory"""
+        with self.assertRaises(ValueError):
+            dw.DirectoryWatcher(
+                CONFIG_FILE_PATH, self.watch_directory, self.watch_directory
+            )
+        with self.assertRaises(ValueError):
+            dw.DirectoryWatcher(
+                CONFIG_FILE_PATH,
+                self.watch_directory,
+                self.output_directory,
+                poll_interval=0
+            )
+
+
+# =============================================================================
+# Test execution
+# =============================================================================
+
+if __name__ == "__main__":
+    unittest.main()
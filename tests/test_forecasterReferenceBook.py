@@ -3,7 +3,9 @@
 # =============================================================================
 
 # Python modules
+import tracemalloc
 import unittest
+from unittest import mock
 
 # Third party modules
 import numpy as np
@@ -141,6 +143,85 @@ class TestGetKLookup(unittest.TestCase):
             )
 
 
+class TestKLookupIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up the K lookup table used by the reference book method"""
+        self.min_wind = np.array([0, 0, 0, 0, 13, 13, 13, 13, 26, 26, 26, 26,
+            39, 39, 39, 39])
+        self.max_wind = np.array([12, 12, 12, 12, 25, 25, 25, 25, 38, 38, 38,
+            38, 51, 51, 51, 51])
+        self.min_cover = np.array([0, 2, 4, 6] * 4)
+        self.max_cover = np.array([2, 4, 6, 8] * 4)
+        self.K_values = np.array([-2.2, -1.7, -0.6, 0, -1.1, 0, 0.6, 1.1,
+            -0.6, 0, 0.6, 1.1, 1.1, 1.7, 2.8, np.nan])
+        self.K_index = frb.KLookupIndex(
+            self.min_wind,
+            self.max_wind,
+            self.min_cover,
+            self.max_cover,
+            self.K_values
+        )
+
+    def match_matrix_lookup(self, wind_speed, cloud_cover):
+        """Reference K lookup using the full match matrix"""
+        matches = (
+            (wind_speed[:, None] >= self.min_wind)
+            & (wind_speed[:, None] <= self.max_wind)
+            & (cloud_cover[:, None] >= self.min_cover)
+            & (cloud_cover[:, None] <= self.max_cover)
+        )
+        return self.K_values[matches.argmax(axis=1)]
+
+    def test_matches_match_matrix_lookup(self):
+        """Test the grid index agrees with the match matrix lookup"""
+        rng = np.random.default_rng(0)
+        wind_speed = np.round(rng.uniform(0, 60, 10000) * 2) / 2
+        cloud_cover = np.round(rng.uniform(0, 10, 10000) * 2) / 2
+        np.testing.assert_array_equal(
+            self.K_index.lookup(wind_speed, cloud_cover),
+            self.match_matrix_lookup(wind_speed, cloud_cover)
+        )
+
+    def test_shared_boundary_first_match(self):
+        """Test a shared cloud cover boundary takes the first matching row"""
+        wind_speed = np.array([5.0, 5.0, 5.0, 20.0])
+        cloud_cover = np.array([2.0, 4.0, 6.0, 2.0])
+        expected_K = np.array([-2.2, -1.7, -0.6, -1.1])
+        np.testing.assert_array_equal(
+            self.K_index.lookup(wind_speed, cloud_cover),
+            expected_K
+        )
+
+    def test_no_match_takes_first_row(self):
+        """Test values outside every range take the K value of the first row"""
+        wind_speed = np.array([12.5, 60.0, 5.0])
+        cloud_cover = np.array([3.0, 3.0, 9.0])
+        expected_K = np.array([-2.2, -2.2, -2.2])
+        np.testing.assert_array_equal(
+            self.K_index.lookup(wind_speed, cloud_cover),
+            expected_K
+        )
+
+    def test_max_less_than_min_wind(self):
+        """Test an invalid wind speed range in the K lookup table"""
+        max_wind = self.max_wind.copy()
+        max_wind[0] = -1
+        with self.assertRaises(AssertionError):
+            frb.KLookupIndex(
+                self.min_wind,
+                max_wind,
+                self.min_cover,
+                self.max_cover,
+                self.K_values
+            )
+
+    def test_negative_wind_speed(self):
+        """Test for negative wind speeds"""
+        with self.assertRaises(AssertionError):
+            self.K_index.lookup(np.array([-1.0]), np.array([3.0]))
+
+
 class TestCalculateTemperatureMinNoonCelcius(unittest.TestCase):
 
     def setUp(self):
@@ -272,6 +353,263 @@ class TestCalculateTemperatureMinNoonCelcius(unittest.TestCase):
         )
 
 
+class TestComputeTmin(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a batch of observations and the reference data"""
+        rng = np.random.default_rng(0)
+        number_rows = 100000
+        self.batch = {
+            frb.TEMP_NOON_COLUMN: rng.uniform(-10, 35, number_rows),
+            frb.TEMP_DEW_POINT_NOON_COLUMN: rng.uniform(-15, 25, number_rows),
+            frb.WIND_SPEED_COLUMN: rng.uniform(0, 50, number_rows),
+            frb.CLOUD_COVER_COLUMN: rng.uniform(0, 8, number_rows),
+        }
+        self.coeff = [np.array([0.5]), np.array([0.3]), np.array([5.0])]
+        self.K_index = frb.KLookupIndex(
+            np.array([0, 0, 13, 13]),
+            np.array([12, 12, 51, 51]),
+            np.array([0, 4, 0, 4]),
+            np.array([4, 8, 4, 8]),
+            np.array([-2.2, -1.7, 0.6, 1.1])
+        )
+
+    def legacy_compute(self):
+        """Reference computation with the separate functions"""
+        wind_speed = self.batch[frb.WIND_SPEED_COLUMN].round()
+        cloud_cover = self.batch[frb.CLOUD_COVER_COLUMN].round()
+        K = self.K_index.lookup(wind_speed, cloud_cover)
+        Tmin_12 = frb.calculate_temperature_min_noon_celcius(
+            self.batch[frb.TEMP_NOON_COLUMN],
+            self.batch[frb.TEMP_DEW_POINT_NOON_COLUMN],
+            K,
+            self.coeff
+        )
+        return wind_speed, cloud_cover, K, Tmin_12
+
+    def test_matches_separate_functions(self):
+        """Test the fused computation matches the separate functions exactly"""
+        results = frb.compute_tmin(self.batch, self.coeff, self.K_index)
+        wind_speed, cloud_cover, K, Tmin_12 = self.legacy_compute()
+        np.testing.assert_array_equal(
+            results[frb.WIND_SPEED_COLUMN], wind_speed
+        )
+        np.testing.assert_array_equal(
+            results[frb.CLOUD_COVER_COLUMN], cloud_cover
+        )
+        np.testing.assert_array_equal(results[frb.K_COLUMN], K)
+        np.testing.assert_array_equal(
+            results[frb.TEMP_MIN_NOON_COLUMN], Tmin_12
+        )
+
+    def test_writes_into_buffers(self):
+        """Test the results are views of the caller's buffers"""
+        buffers = frb.allocate_tmin_buffers(200000)
+        results = frb.compute_tmin(
+            self.batch, self.coeff, self.K_index, out=buffers
+        )
+        for name in [frb.K_COLUMN, frb.TEMP_MIN_NOON_COLUMN]:
+            self.assertEqual(len(results[name]), 100000)
+            self.assertTrue(np.shares_memory(results[name], buffers[name]))
+
+    def test_integer_observations_not_rounded(self):
+        """Test integer wind speed and cloud cover are returned as given"""
+        self.batch[frb.WIND_SPEED_COLUMN] = np.array([5, 20])
+        self.batch[frb.CLOUD_COVER_COLUMN] = np.array([2, 6])
+        self.batch[frb.TEMP_NOON_COLUMN] = np.array([10.0, 12.0])
+        self.batch[frb.TEMP_DEW_POINT_NOON_COLUMN] = np.array([5.0, 6.0])
+        results = frb.compute_tmin(self.batch, self.coeff, self.K_index)
+        self.assertIs(
+            results[frb.WIND_SPEED_COLUMN], self.batch[frb.WIND_SPEED_COLUMN]
+        )
+        np.testing.assert_array_equal(results[frb.K_COLUMN], [-2.2, 1.1])
+
+    def test_buffer_too_small(self):
+        """Test buffers shorter than the batch raise a ValidationError"""
+        with self.assertRaises(frb.ValidationError):
+            frb.compute_tmin(
+                self.batch,
+                self.coeff,
+                self.K_index,
+                out=frb.allocate_tmin_buffers(10)
+            )
+
+    def test_non_physical_observations(self):
+        """Test negative wind speeds raise a ValidationError"""
+        self.batch[frb.WIND_SPEED_COLUMN][5] = -3.0
+        with self.assertRaises(frb.ValidationError):
+            frb.compute_tmin(self.batch, self.coeff, self.K_index)
+
+    def test_peak_allocation_drop(self):
+        """Test reused buffers allocate less at peak than separate functions"""
+        buffers = frb.allocate_tmin_buffers(100000)
+
+        tracemalloc.start()
+        self.legacy_compute()
+        _, legacy_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        frb.compute_tmin(self.batch, self.coeff, self.K_index, out=buffers)
+        _, fused_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Legacy path allocates at least the four 800 kB result arrays
+        self.assertGreater(legacy_peak, 4 * 800000)
+        self.assertLess(fused_peak, legacy_peak / 2)
+
+    def test_parallel_matches_serial(self):
+        """Test threads computing slices match the serial computation"""
+        serial = {
+            name: result.copy() for name, result in frb.compute_tmin(
+                self.batch, self.coeff, self.K_index
+            ).items()
+        }
+        with mock.patch.object(frb, "PARALLEL_SLICE_ROWS", 3001):
+            for workers in [2, 4]:
+                with self.subTest(workers=workers):
+                    results = frb.compute_tmin(
+                        self.batch, self.coeff, self.K_index, workers=workers
+                    )
+                    for name, result in serial.items():
+                        np.testing.assert_array_equal(results[name], result)
+
+    def test_parallel_non_physical_observations(self):
+        """Test a non-physical observation in one slice reports its row"""
+        self.batch[frb.TEMP_NOON_COLUMN][77777] = np.nan
+        with mock.patch.object(frb, "PARALLEL_SLICE_ROWS", 1000):
+            with self.assertRaisesRegex(frb.ValidationError, "77777"):
+                frb.compute_tmin(
+                    self.batch, self.coeff, self.K_index, workers=3
+                )
+
+    def test_empty_object_columns(self):
+        """Test a batch without rows parsed as object columns is computed"""
+        batch = {
+            name: np.array([], dtype=object) for name in self.batch
+        }
+        results = frb.compute_tmin(batch, self.coeff, self.K_index)
+        for name in [frb.K_COLUMN, frb.TEMP_MIN_NOON_COLUMN]:
+            self.assertEqual(len(results[name]), 0)
+            self.assertEqual(results[name].dtype, self.K_index.dtype)
+
+    def test_invalid_workers(self):
+        """Test a non-positive number of workers raises a ValueError"""
+        for workers in [0, -1, 2.5]:
+            with self.subTest(workers=workers):
+                with self.assertRaises(ValueError):
+                    frb.compute_tmin(
+                        self.batch, self.coeff, self.K_index, workers=workers
+                    )
+
+
+class TestReferenceBook(unittest.TestCase):
+
+    def setUp(self):
+        """Set up the reference data of the method"""
+        self.coeff = [np.array([0.5]), np.array([0.3]), np.array([5.0])]
+        self.K_index = frb.KLookupIndex(
+            np.array([0, 0, 0, 13, 13, 13]),
+            np.array([12, 12, 12, 51, 51, 51]),
+            np.array([0, 2, 4, 0, 2, 4]),
+            np.array([2, 4, 8, 2, 4, 8]),
+            np.array([-2.2, -1.7, -0.6, 0.6, 1.1, 1.7])
+        )
+        self.reference_book = frb.ReferenceBook(self.coeff, self.K_index)
+
+    def test_matches_array_path(self):
+        """Test single observations match the array computation exactly"""
+        rng = np.random.default_rng(0)
+        number_rows = 2000
+        batch = {
+            frb.TEMP_NOON_COLUMN: rng.uniform(-10, 35, number_rows),
+            frb.TEMP_DEW_POINT_NOON_COLUMN: rng.uniform(-15, 25, number_rows),
+            # Include values halfway between integers and range bounds
+            frb.WIND_SPEED_COLUMN: np.round(rng.uniform(0, 60, number_rows) 
+                * 2) / 2,
+            frb.CLOUD_COVER_COLUMN: np.round(rng.uniform(0, 9, number_rows) 
+                * 2) / 2,
+        }
+        expected = frb.compute_tmin(batch, self.coeff, self.K_index)
+        for i in range(number_rows):
+            result = self.reference_book.tmin_single(
+                batch[frb.TEMP_NOON_COLUMN][i],
+                batch[frb.TEMP_DEW_POINT_NOON_COLUMN][i],
+                float(batch[frb.WIND_SPEED_COLUMN][i]),
+                float(batch[frb.CLOUD_COVER_COLUMN][i])
+            )
+            self.assertEqual(result, expected[frb.TEMP_MIN_NOON_COLUMN][i])
+
+    def test_float32_matches_array_path(self):
+        """Test a float32 K lookup index computes single observations at
+        float32, matching the float32 array computation exactly"""
+        K_index = frb.KLookupIndex(
+            np.array([0, 0, 0, 13, 13, 13]),
+            np.array([12, 12, 12, 51, 51, 51]),
+            np.array([0, 2, 4, 0, 2, 4]),
+            np.array([2, 4, 8, 2, 4, 8]),
+            np.array([-2.2, -1.7, -0.6, 0.6, 1.1, 1.7]),
+            precision="float32"
+        )
+        coeff = [c.astype(np.float32) for c in self.coeff]
+        reference_book = frb.ReferenceBook(coeff, K_index)
+        rng = np.random.default_rng(1)
+        number_rows = 2000
+        observations = {
+            frb.TEMP_NOON_COLUMN: rng.uniform(-10, 35, number_rows),
+            frb.TEMP_DEW_POINT_NOON_COLUMN: rng.uniform(-15, 25, number_rows),
+            frb.WIND_SPEED_COLUMN: rng.uniform(0, 60, number_rows),
+            frb.CLOUD_COVER_COLUMN: rng.uniform(0, 9, number_rows),
+        }
+        batch = {
+            name: values.astype(np.float32)
+            for name, values in observations.items()
+        }
+        expected = frb.compute_tmin(batch, coeff, K_index)
+        for i in range(number_rows):
+            result = reference_book.tmin_single(
+                *(observations[name][i] for name in batch)
+            )
+            self.assertEqual(result.dtype, np.float32)
+            self.assertEqual(result, expected[frb.TEMP_MIN_NOON_COLUMN][i])
+
+    def test_integer_observations(self):
+        """Test integer observations match the array computation"""
+        result = self.reference_book.tmin_single(20, 10, 13, 2)
+        expected = frb.calculate_temperature_min_noon_celcius(
+            np.array([20]),
+            np.array([10]),
+            self.K_index.lookup(np.array([13]), np.array([2])),
+            self.coeff
+        )
+        self.assertEqual(result, expected[0])
+
+    def test_non_physical_observations(self):
+        """Test non-physical or non-finite observations are rejected"""
+        for observation in [
+            (20.0, 10.0, -1.0, 2.0),
+            (20.0, 10.0, 5.0, np.nan),
+            (20.0, 10.0, np.inf, 2.0),
+            (-274.0, 10.0, 5.0, 2.0),
+            (20.0, np.nan, 5.0, 2.0),
+        ]:
+            with self.subTest(observation=observation):
+                with self.assertRaises(frb.ValidationError):
+                    self.reference_book.tmin_single(*observation)
+
+    def test_rounded_to_zero_wind_speed(self):
+        """Test a wind speed rounding to zero is accepted, as for arrays"""
+        self.assertEqual(
+            self.reference_book.tmin_single(20.0, 10.0, -0.4, 2.0),
+            self.reference_book.tmin_single(20.0, 10.0, 0.0, 2.0)
+        )
+
+    def test_invalid_coefficient_length(self):
+        """Test a coefficients list of the wrong length is rejected"""
+        with self.assertRaises(frb.ValidationError):
+            frb.ReferenceBook(self.coeff[:2], self.K_index)
+
+
 # =============================================================================
 # Test execution
 # =============================================================================
@@ -0,0 +1,189 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python modules
+import json
+import os
+import tempfile
+import unittest
+
+# Third party modules
+import numpy as np
+
+# Testing module
+import DataImportExport as die
+import Instrumentation as instr
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Data rows with one missing value
+DATA_CSV = (
+    "Temp. noon (celcius),Wind speed (knots)\n"
+    "22.4,14.56\n"
+    "18.6,\n"
+    "26,0\n"
+)
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+
+@instr.instrument("double")
+def double(values: np.ndarray):
+    """Instrumented function doubling an array"""
+    return 2 * values
+
+
+class TestStageMetrics(unittest.TestCase):
+
+    def setUp(self):
+        """Start each test with no stage metrics, recording them"""
+        instr.reset_stage_metrics()
+        instr.enable_stage_metrics()
+
+    def tearDown(self):
+        """Remove the stage metrics of the test and stop recording them"""
+        instr.enable_stage_metrics(False)
+        instr.reset_stage_metrics()
+
+    def test_disabled_records_nothing(self):
+        """Test stages and decorated functions record nothing if disabled"""
+        instr.enable_stage_metrics(False)
+        np.testing.assert_array_equal(double(np.ones(3)), np.full(3, 2.0))
+        with instr.stage("disabled") as counters:
+            instr.add_stage_counters(rows_in=3)
+            counters["rows_out"] = 3
+        self.assertEqual(instr.get_stage_metrics(), {})
+
+    def test_instrument_counts_rows(self):
+        """Test calls, times and rows of a decorated function are summed"""
+        double(np.zeros(3))
+        double(np.zeros(5))
+        metrics = instr.get_stage_metrics()["double"]
+        self.assertEqual(metrics["calls"], 2)
+        self.assertEqual(metrics["rows_in"], 8)
+        self.assertEqual(metrics["rows_out"], 8)
+        self.assertGreaterEqual(metrics["wall_seconds"], 0)
+        self.assertGreaterEqual(metrics["cpu_seconds"], 0)
+
+    def test_stage_counters(self):
+        """Test counters added within a stage are recorded on it"""
+        with instr.stage("outer"):
+            instr.add_stage_counters(nan_rows_removed=2)
+            with instr.stage("inner"):
+                instr.add_stage_counters(nan_rows_removed=1)
+            instr.add_stage_counters(nan_rows_removed=3)
+        metrics = instr.get_stage_metrics()
+        self.assertEqual(metrics["outer"]["nan_rows_removed"], 5)
+        self.assertEqual(metrics["inner"]["nan_rows_removed"], 1)
+
+    def test_counters_outside_stage(self):
+        """Test counters added outside a stage are ignored"""
+        instr.add_stage_counters(rows_in=3)
+        self.assertEqual(instr.get_stage_metrics(), {})
+
+    def test_stage_recorded_on_error(self):
+        """Test a stage raising an error is still recorded"""
+        with self.assertRaises(ValueError):
+            with instr.stage("failing"):
+                raise ValueError("failed")
+        self.assertEqual(instr.get_stage_metrics()["failing"]["calls"], 1)
+
+    def test_merge_stage_metrics(self):
+        """Test metrics of another process are summed, peak RSS maximised"""
+        double(np.zeros(3))
+        instr.merge_stage_metrics({
+            "double": {"calls": 2, "rows_in": 4, "peak_rss_bytes": 1}
+        })
+        metrics = instr.get_stage_metrics()["double"]
+        self.assertEqual(metrics["calls"], 3)
+        self.assertEqual(metrics["rows_in"], 7)
+        self.assertGreater(metrics["peak_rss_bytes"], 1)
+
+    @unittest.skipIf(
+        instr.get_current_rss() is None,
+        "the resident set size is not known on this system"
+    )
+    def test_stage_peak_rss(self):
+        """Test a later, smaller stage reports its own, smaller peak RSS"""
+        with instr.stage("large"):
+            values = np.ones(1 << 25)
+        del values
+        with instr.stage("small"):
+            values = np.ones(1 << 10)
+        metrics = instr.get_stage_metrics()
+        self.assertLess(
+            metrics["small"]["peak_rss_bytes"],
+            metrics["large"]["peak_rss_bytes"] - (1 << 27)
+        )
+
+    def test_import_nan_rows_removed(self):
+        """Test the rows dropped for missing values by an import are counted"""
+        with tempfile.TemporaryDirectory() as directory:
+            data_file_path = os.path.join(directory, "data.csv")
+            with open(data_file_path, "w") as f:
+                f.write(DATA_CSV)
+            die.import_csv_data_file(
+                data_file_path, ["Temp. noon (celcius)", "Wind speed (knots)"]
+            )
+        metrics = instr.get_stage_metrics()["import_csv_data_file"]
+        self.assertEqual(metrics["rows_in"], 3)
+        self.assertEqual(metrics["nan_rows_removed"], 1)
+        self.assertEqual(metrics["rows_out"], 2)
+
+
+class TestWriteMetricsFile(unittest.TestCase):
+
+    def setUp(self):
+        """Record the metrics of one stage"""
+        instr.reset_stage_metrics()
+        instr.enable_stage_metrics()
+        double(np.zeros(3))
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Remove the stage metrics and metrics files"""
+        instr.enable_stage_metrics(False)
+        instr.reset_stage_metrics()
+        self.directory.cleanup()
+
+    def test_json(self):
+        """Test JSON metrics files hold the metrics of each stage"""
+        file = os.path.join(self.directory.name, "metrics.json")
+        instr.write_metrics_file(file)
+        with open(file, "r") as f:
+            metrics = json.load(f)
+        self.assertEqual(metrics["stages"]["double"]["rows_in"], 3)
+
+    def test_prometheus(self):
+        """Test .prom metrics files are in the Prometheus text format"""
+        file = os.path.join(self.directory.name, "metrics.prom")
+        instr.write_metrics_file(file)
+        with open(file, "r") as f:
+            text = f.read()
+        self.assertIn(
+            "# TYPE forecasters_reference_book_stage_calls_total counter", text
+        )
+        self.assertIn(
+            'forecasters_reference_book_stage_rows_in_total{stage="double"} 3',
+            text
+        )
+
+    def test_unsupported_format(self):
+        """Test an unsupported metrics file format raises a ValueError"""
+        with self.assertRaises(ValueError):
+            instr.write_metrics_file(
+                os.path.join(self.directory.name, "metrics.xml"), "xml"
+            )
+
+
+# =============================================================================
+# Test execution
+# =============================================================================
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,534 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python modules
+import copy
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# Third party modules
+import numpy as np
+
+# Testing module
+import DataImportExport as die
+import Pipeline as pl
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Configuration data for the reference book method
+CONFIG_FILE_PATH = "data/forecasters_reference_book_config.yaml"
+
+# Dtypes of the data columns, as set with data_column_dtypes
+DATA_COLUMN_DTYPES = {
+    "Temp. noon (celcius)": "float64",
+    "Temp. dew point noon (celcius)": "float64",
+    "Wind speed (knots)": "float64",
+    "Cloud cover (oktas)": "float64",
+    "Location": "int64",
+    "Date": "int64",
+}
+
+# Data rows where some batches hold only integer values, and a missing value
+# turns an integer column into a float column
+DATA_CSV = (
+    "Temp. noon (celcius),Temp. dew point noon (celcius),Wind speed (knots)," \
+    "Cloud cover (oktas),Location,Date\n"
+    "22.4,10.9,14.56,3.9,1,1\n"
+    "18.6,12.56,3.4,6,2,1\n"
+    "26,8.5,0,0.0,2,2\n"
+    "13,9,12,4,3,2\n"
+    "15,7,20,2,3,\n"
+    "13.2,9.4,12.5, 4.1,3,2\n"
+    "11,6,40,7,4,3\n"
+)
+
+# The data rows without the missing value, so that the dtypes of the first
+# batch of any size hold over all the rows
+FIRST_DTYPES_DATA_CSV = DATA_CSV.replace("15,7,20,2,3,\n", "")
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+
+class TestRunChunked(unittest.TestCase):
+
+    def setUp(self):
+        """Set up the configuration with temporary data and output files"""
+        self.data_csv = "test_pipeline_data.csv"
+        self.in_memory_csv = "test_pipeline_in_memory_output.csv"
+        self.chunked_csv = "test_pipeline_chunked_output.csv"
+
+        with open(self.data_csv, "w") as f:
+            f.write(FIRST_DTYPES_DATA_CSV)
+
+        self.config_data = die.import_yaml_configuration_file(
+            CONFIG_FILE_PATH
+        )
+        self.coeff, self.K_index = pl.load_reference_data(self.config_data)
+
+    def tearDown(self):
+        """Remove temporary CSV test files"""
+        try:
+            for file in [
+                self.data_csv, 
+                self.in_memory_csv, 
+                self.chunked_csv,
+                self.chunked_csv + pl.PARTIAL_FILE_SUFFIX,
+                self.chunked_csv + pl.JOURNAL_FILE_SUFFIX,
+            ]:
+                if os.path.exists(file):
+                    os.remove(file)
+
+        except Exception as e:
+            self.fail(f"Failed to delete test .csv file: {e}")
+
+    def run_to(self, output_file_path, chunk_size=None, column_dtypes=None):
+        """Run the reference book method and return the output bytes"""
+        data_columns = self.config_data["data"]["data_columns"]
+        if chunk_size is None:
+            pl.run_in_memory(
+                self.data_csv,
+                data_columns,
+                output_file_path,
+                self.coeff,
+                self.K_index,
+                column_dtypes=column_dtypes
+            )
+        else:
+            pl.run_chunked(
+                self.data_csv,
+                data_columns,
+                output_file_path,
+                self.coeff,
+                self.K_index,
+                chunk_size,
+                column_dtypes
+            )
+        with open(output_file_path, "rb") as f:
+            return f.read()
+
+    def test_chunked_matches_in_memory(self):
+        """Test chunked outputs match the in-memory output byte for byte"""
+        expected = self.run_to(self.in_memory_csv)
+        for chunk_size in [1, 2, 3, 4, 100]:
+            with self.subTest(chunk_size=chunk_size):
+                result = self.run_to(self.chunked_csv, chunk_size)
+                self.assertEqual(result, expected)
+
+    def test_typed_chunked_matches_in_memory(self):
+        """Test typed chunked outputs match the typed in-memory output"""
+        column_dtypes = DATA_COLUMN_DTYPES
+        expected = self.run_to(self.in_memory_csv, None, column_dtypes)
+        for chunk_size in [1, 3, 100]:
+            with self.subTest(chunk_size=chunk_size):
+                result = self.run_to(
+                    self.chunked_csv, chunk_size, column_dtypes
+                )
+                self.assertEqual(result, expected)
+
+    def test_missing_value_keeps_first_dtypes(self):
+        """Test a missing value after the first batch leaves its dtypes"""
+        with open(self.data_csv, "w") as f:
+            f.write(DATA_CSV)
+        # The Date column of the first batch stays an integer column
+        expected = self.run_to(self.in_memory_csv, None, DATA_COLUMN_DTYPES)
+        for chunk_size in [1, 2, 3, 4]:
+            with self.subTest(chunk_size=chunk_size):
+                result = self.run_to(self.chunked_csv, chunk_size)
+                self.assertEqual(result, expected)
+
+    def test_compact_columns_match(self):
+        """Test compact Location and Date columns leave the output as is"""
+        expected = self.run_to(self.in_memory_csv)
+        data_columns = self.config_data["data"]["data_columns"]
+        pl.run_in_memory(
+            self.data_csv,
+            data_columns,
+            self.chunked_csv,
+            self.coeff,
+            self.K_index,
+            compact_columns=True
+        )
+        pl.run_chunked(
+            self.data_csv,
+            data_columns,
+            self.in_memory_csv,
+            self.coeff,
+            self.K_index,
+            2,
+            compact_columns=True
+        )
+        for file in [self.chunked_csv, self.in_memory_csv]:
+            with open(file, "rb") as f:
+                self.assertEqual(f.read(), expected)
+
+    def crash_run(self, batches_written: int):
+        """Run chunked in batches of 2, dying part way through a batch"""
+        export_csv_data_file = die.export_csv_data_file
+        def crash_export(*args, **kwargs):
+            if crash_export.calls == batches_written:
+                with open(args[0], "a") as f:
+                    f.write("1.0,2.")
+                raise KeyboardInterrupt
+            crash_export.calls += 1
+            return export_csv_data_file(*args, **kwargs)
+        crash_export.calls = 0
+        with mock.patch.object(die, "export_csv_data_file", crash_export):
+            with self.assertRaises(KeyboardInterrupt):
+                self.run_to(self.chunked_csv, 2)
+
+    def test_resume_after_crash(self):
+        """Test a run that dies mid-export resumes to the same output"""
+        expected = self.run_to(self.in_memory_csv)
+        with open(self.chunked_csv, "w") as f:
+            f.write("previous output\n")
+        self.crash_run(2)
+
+        # The previous output is untouched and two batches are journaled
+        with open(self.chunked_csv, "r") as f:
+            self.assertEqual(f.read(), "previous output\n")
+        self.assertTrue(
+            os.path.exists(self.chunked_csv + pl.JOURNAL_FILE_SUFFIX)
+        )
+
+        # Only the remaining batch is computed when run again
+        with mock.patch.object(
+            pl, "compute_reference_book", wraps=pl.compute_reference_book
+        ) as compute_reference_book:
+            result = self.run_to(self.chunked_csv, 2)
+        self.assertEqual(compute_reference_book.call_count, 1)
+        self.assertEqual(result, expected)
+        for suffix in [pl.PARTIAL_FILE_SUFFIX, pl.JOURNAL_FILE_SUFFIX]:
+            self.assertFalse(os.path.exists(self.chunked_csv + suffix))
+
+    def test_changed_data_restarts(self):
+        """Test a journal of a different data file is not resumed"""
+        self.crash_run(2)
+        with open(self.data_csv, "a") as f:
+            f.write("12,5,3,1,5,4\n")
+        expected = self.run_to(self.in_memory_csv)
+        with mock.patch.object(
+            pl, "compute_reference_book", wraps=pl.compute_reference_book
+        ) as compute_reference_book:
+            self.assertEqual(self.run_to(self.chunked_csv, 2), expected)
+        self.assertEqual(compute_reference_book.call_count, 4)
+
+    def test_column_store_matches_csv(self):
+        """Test running from a column store matches the .csv data file"""
+        expected = self.run_to(self.in_memory_csv)
+        with tempfile.TemporaryDirectory() as store_directory:
+            die.ingest_csv_data_file(
+                self.data_csv, 
+                store_directory, 
+                self.config_data["data"]["data_columns"], 
+                compact=True
+            )
+            pl.run_in_memory(
+                store_directory,
+                self.config_data["data"]["data_columns"],
+                self.chunked_csv,
+                self.coeff,
+                self.K_index,
+                compact_columns=True
+            )
+        with open(self.chunked_csv, "rb") as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_empty_data_file(self):
+        """Test a data file without rows writes an output of its header"""
+        with open(self.data_csv, "w") as f:
+            f.write(DATA_CSV.splitlines(keepends=True)[0])
+        header = DATA_CSV.splitlines()[0] + ",K (),Temp. min. noon (celcius)\n"
+        for chunk_size in [None, 2]:
+            with self.subTest(chunk_size=chunk_size):
+                result = self.run_to(self.chunked_csv, chunk_size)
+                self.assertEqual(result.decode(), header)
+
+    def test_no_chunks_replaces_output(self):
+        """Test a data file yielding no batches replaces the output"""
+        with open(self.chunked_csv, "w") as f:
+            f.write("previous output\n")
+        header = DATA_CSV.splitlines()[0] + ",K (),Temp. min. noon (celcius)\n"
+        with mock.patch.object(
+            die, "import_csv_data_file_chunks", return_value=iter([])
+        ):
+            result = self.run_to(self.chunked_csv, 2)
+        self.assertEqual(result.decode(), header)
+        for suffix in [pl.PARTIAL_FILE_SUFFIX, pl.JOURNAL_FILE_SUFFIX]:
+            self.assertFalse(os.path.exists(self.chunked_csv + suffix))
+
+    def test_invalid_chunk_size(self):
+        """Test a non-positive chunk size is rejected"""
+        with self.assertRaises(AssertionError):
+            self.run_to(self.chunked_csv, 0)
+
+
+class TestRunIncremental(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary data file holding the first rows of the data"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_csv = os.path.join(self.directory.name, "data.csv")
+        self.output_csv = os.path.join(self.directory.name, "output.csv")
+        self.expected_csv = os.path.join(self.directory.name, "expected.csv")
+        self.lines = DATA_CSV.splitlines(keepends=True)
+        with open(self.data_csv, "w") as f:
+            f.writelines(self.lines[:3])
+
+        self.config_data = die.import_yaml_configuration_file(
+            CONFIG_FILE_PATH
+        )
+        self.data_columns = self.config_data["data"]["data_columns"]
+        self.coeff, self.K_index = pl.load_reference_data(self.config_data)
+        self.column_dtypes = None
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.directory.cleanup()
+
+    def append(self, text: str):
+        """Append text to the data file"""
+        with open(self.data_csv, "a") as f:
+            f.write(text)
+
+    def run_incremental(self):
+        """Run incrementally, returning the rows and offsets imported"""
+        with mock.patch.object(
+            die, 
+            "import_csv_data_file_tail", 
+            wraps=die.import_csv_data_file_tail
+        ) as import_csv_data_file_tail:
+            number_rows = pl.run_incremental(
+                self.data_csv,
+                self.data_columns,
+                self.output_csv,
+                self.coeff,
+                self.K_index,
+                self.column_dtypes,
+                compact_columns=True
+            )
+        offsets = [
+            call.args[2] for call in import_csv_data_file_tail.call_args_list
+        ]
+        return number_rows, offsets
+
+    def assert_matches_full_run(self):
+        """Test the output matches that of a run over the whole data file"""
+        pl.run_in_memory(
+            self.data_csv,
+            self.data_columns,
+            self.expected_csv,
+            self.coeff,
+            self.K_index,
+            column_dtypes=self.column_dtypes,
+            compact_columns=True
+        )
+        with open(self.expected_csv, "rb") as f:
+            expected = f.read()
+        with open(self.output_csv, "rb") as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_appended_rows(self):
+        """Test only the rows appended are read, computed and exported"""
+        for column_dtypes in [
+            None, DATA_COLUMN_DTYPES
+        ]:
+            with self.subTest(column_dtypes=column_dtypes):
+                self.setUp()
+                self.column_dtypes = column_dtypes
+                self.assertEqual(self.run_incremental(), (2, [0]))
+                self.assert_matches_full_run()
+
+                offset = os.path.getsize(self.data_csv)
+                self.append(self.lines[3] + self.lines[4])
+                self.assertEqual(self.run_incremental(), (2, [offset]))
+                self.assert_matches_full_run()
+
+                offset = os.path.getsize(self.data_csv)
+                self.assertEqual(self.run_incremental(), (0, [offset]))
+                self.assert_matches_full_run()
+
+    def test_unterminated_last_line(self):
+        """Test a last line without a newline is replaced once complete"""
+        self.append("11,6,40,7,4,3")
+        offset = os.path.getsize(self.data_csv) - len("11,6,40,7,4,3")
+        self.assertEqual(self.run_incremental(), (3, [0, offset]))
+        self.assert_matches_full_run()
+
+        self.append("\n12,5,3,1,5,4\n")
+        self.assertEqual(self.run_incremental(), (2, [offset]))
+        self.assert_matches_full_run()
+
+    def test_rewritten_data_runs_in_full(self):
+        """Test a truncated, rewritten or replaced data file is run in full"""
+        self.run_incremental()
+        with open(self.data_csv, "r+") as f:
+            f.write(self.lines[0] + "22.5")
+        self.assertEqual(self.run_incremental(), (2, [0]))
+        self.assert_matches_full_run()
+
+        with open(self.data_csv, "r+") as f:
+            f.truncate(len(self.lines[0]) + len(self.lines[1]))
+        self.assertEqual(self.run_incremental(), (1, [0]))
+        self.assert_matches_full_run()
+
+        replacement_csv = self.data_csv + ".new"
+        with open(replacement_csv, "w") as f:
+            f.writelines(self.lines[:4])
+        os.replace(replacement_csv, self.data_csv)
+        self.assertEqual(self.run_incremental(), (3, [0]))
+        self.assert_matches_full_run()
+
+    def test_changed_dtype_runs_in_full(self):
+        """Test new rows changing an undeclared column dtype run in full"""
+        # A missing value makes Date a floating point column
+        self.run_incremental()
+        offset = os.path.getsize(self.data_csv)
+        self.append(self.lines[5])
+        self.assertEqual(self.run_incremental(), (2, [offset, 0]))
+        self.assert_matches_full_run()
+
+        offset = os.path.getsize(self.data_csv)
+        self.append("11,6,40,7,4.5,3\n")
+        self.assertEqual(self.run_incremental(), (3, [offset, 0]))
+        self.assert_matches_full_run()
+
+        # A declared dtype is kept, and the row with a missing value removed
+        with open(self.data_csv, "w") as f:
+            f.writelines(self.lines[:3])
+        self.column_dtypes = DATA_COLUMN_DTYPES
+        self.run_incremental()
+        offset = os.path.getsize(self.data_csv)
+        self.append(self.lines[5])
+        self.assertEqual(self.run_incremental(), (0, [offset]))
+        self.assert_matches_full_run()
+
+    def test_unrecorded_output_removed(self):
+        """Test output written after the state was recorded is replaced"""
+        self.run_incremental()
+        with open(self.output_csv, "a") as f:
+            f.write("1.0,2.")
+        self.append(self.lines[3])
+        self.assertEqual(self.run_incremental()[0], 1)
+        self.assert_matches_full_run()
+
+        with open(self.output_csv, "w") as f:
+            f.write("other output\n")
+        self.assertEqual(self.run_incremental(), (3, [0]))
+        self.assert_matches_full_run()
+
+
+class TestPrecision(unittest.TestCase):
+
+    def setUp(self):
+        """Load the reference data at float64 and float32"""
+        self.config_data = die.import_yaml_configuration_file(
+            CONFIG_FILE_PATH
+        )
+        self.config_data["data"]["data_column_dtypes"] = DATA_COLUMN_DTYPES
+        self.config_data["data"]["compact_columns"] = True
+        self.float32_config_data = copy.deepcopy(self.config_data)
+        self.float32_config_data["precision"] = "float32"
+
+    def compute(self, config_data: dict):
+        """Compute the sample data file at the precision of the config"""
+        coeff, K_index = pl.load_reference_data(config_data)
+        imported_data = die.import_data_file(
+            config_data["data"]["data_file_path"],
+            config_data["data"]["data_columns"],
+            precision=K_index.dtype.name
+        )
+        return pl.compute_reference_book(imported_data, coeff, K_index)
+
+    def test_float32_matches_float64(self):
+        """Test float32 results are float32 and close to float64 results"""
+        expected = self.compute(self.config_data)
+        result = self.compute(self.float32_config_data)
+        for col in [pl.K_COLUMN, pl.TEMP_MIN_NOON_COLUMN]:
+            self.assertEqual(expected[col].dtype, np.float64)
+            self.assertEqual(result[col].dtype, np.float32)
+            np.testing.assert_allclose(
+                result[col], expected[col], rtol=1e-6, atol=1e-5
+            )
+
+        # Absolute zero is rejected at either precision, as a strict bound
+        for config_data in [self.config_data, self.float32_config_data]:
+            with self.subTest(precision=config_data.get("precision")):
+                coeff, K_index = pl.load_reference_data(config_data)
+                for temp_noon, valid in [(-273.15, False), (-273.1, True)]:
+                    imported_data = die.import_data_file(
+                        config_data["data"]["data_file_path"],
+                        config_data["data"]["data_columns"],
+                        precision=K_index.dtype.name
+                    )
+                    temp_noon_values = imported_data[pl.TEMP_NOON_COLUMN]
+                    temp_noon_values = temp_noon_values.copy()
+                    temp_noon_values[0] = temp_noon
+                    imported_data[pl.TEMP_NOON_COLUMN] = temp_noon_values
+                    if valid:
+                        pl.compute_reference_book(
+                            imported_data, coeff, K_index
+                        )
+                        continue
+                    with self.assertRaises(AssertionError):
+                        pl.compute_reference_book(
+                            imported_data, coeff, K_index
+                        )
+
+    def test_load_inputs(self):
+        """Test inputs imported together match those imported in turn"""
+        for config_data in [self.config_data, self.float32_config_data]:
+            with self.subTest(precision=config_data.get("precision")):
+                coeff, K_index, imported_data = pl.load_inputs(config_data)
+                expected_coeff, expected_K_index = pl.load_reference_data(
+                    config_data
+                )
+                for result, expected in zip(coeff, expected_coeff):
+                    np.testing.assert_array_equal(result, expected)
+                self.assertEqual(K_index.dtype, expected_K_index.dtype)
+                expected = die.import_data_files(
+                    config_data["data"]["data_file_path"],
+                    config_data["data"]["data_columns"],
+                    column_dtypes=config_data["data"]["data_column_dtypes"],
+                    precision=K_index.dtype.name,
+                    compact=True
+                )
+                for col in config_data["data"]["data_columns"]:
+                    np.testing.assert_array_equal(
+                        imported_data[col], expected[col]
+                    )
+                    self.assertEqual(
+                        imported_data[col].dtype, expected[col].dtype
+                    )
+
+    def test_data_file_list(self):
+        """Test a list of data files is concatenated before computing"""
+        expected = self.compute(self.config_data)
+        data_file_path = self.config_data["data"]["data_file_path"]
+        self.config_data["data"]["data_file_path"] = [data_file_path] * 2
+        coeff, K_index, imported_data = pl.load_inputs(self.config_data)
+        result = pl.compute_reference_book(imported_data, coeff, K_index)
+        for col in [pl.K_COLUMN, pl.TEMP_MIN_NOON_COLUMN]:
+            np.testing.assert_array_equal(
+                result[col], np.tile(expected[col], 2)
+            )
+
+    def test_unsupported_precision(self):
+        """Test an unsupported precision raises a ValueError"""
+        self.config_data["precision"] = "float16"
+        with self.assertRaises(ValueError):
+            pl.load_reference_data(self.config_data)
+
+
+# =============================================================================
+# Test execution
+# =============================================================================
+
+if __name__ == "__main__":
+    unittest.main()
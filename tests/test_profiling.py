@@ -0,0 +1,89 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python modules
+import os
+import pstats
+import tempfile
+import unittest
+
+# Testing module
+import Profiling as prof
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Logging configuration of the reference book method
+LOGGING_CONFIG_FILE_PATH = "data/logging_config.yaml"
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+
+def allocate(rows: int):
+    """Profiled function allocating a list of rows"""
+    return [float(row) for row in range(rows)]
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary directory for the profile files"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_prefix = os.path.join(self.directory.name, "run")
+
+    def tearDown(self):
+        """Remove the profile files"""
+        self.directory.cleanup()
+
+    def test_cpu_profile(self):
+        """Test the CPU profile is dumped to a .prof file readable by pstats"""
+        with prof.Profiler(["cpu"], self.file_prefix):
+            allocate(1000)
+        stats = pstats.Stats(self.file_prefix + ".prof")
+        self.assertIn(
+            "allocate", [function for _, _, function in stats.stats]
+        )
+        self.assertFalse(os.path.exists(self.file_prefix + "_memory.txt"))
+
+    def test_memory_summary(self):
+        """Test the memory summary lists the top allocation sites"""
+        with prof.Profiler(["mem"], self.file_prefix, top_allocations=3):
+            rows = allocate(10000)
+        with open(self.file_prefix + "_memory.txt", "r") as f:
+            summary = f.read()
+        self.assertIn("Top 3 allocation sites by size:", summary)
+        self.assertIn("#3:", summary)
+        self.assertNotIn("#4:", summary)
+        self.assertFalse(os.path.exists(self.file_prefix + ".prof"))
+        del rows
+
+    def test_stop_twice(self):
+        """Test stopping a profiler again writes no files"""
+        profiler = prof.Profiler(["cpu", "mem"], self.file_prefix)
+        profiler.start()
+        self.assertEqual(len(profiler.stop()), 2)
+        self.assertEqual(profiler.stop(), [])
+
+    def test_unsupported_mode(self):
+        """Test an unsupported profiling mode raises a ValueError"""
+        with self.assertRaises(ValueError):
+            prof.Profiler(["gpu"], self.file_prefix)
+
+    def test_profile_file_prefix(self):
+        """Test profile files are named after the configured log file"""
+        self.assertEqual(
+            prof.get_profile_file_prefix(LOGGING_CONFIG_FILE_PATH),
+            "outputs/forecasters_reference_book"
+        )
+
+
+# =============================================================================
+# Test execution
+# =============================================================================
+
+if __name__ == "__main__":
+    unittest.main()
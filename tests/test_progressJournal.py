@@ -0,0 +1,71 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python modules
+import os
+import tempfile
+import unittest
+
+# Testing module
+import ProgressJournal as pj
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+
+class TestProgressJournal(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary journal file path"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal_file = os.path.join(self.directory.name, "run.journal")
+        self.run_key = {"chunk_size": 2, "options": ("a", None)}
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.directory.cleanup()
+
+    def test_resume_entries(self):
+        """Test entries recorded are read back by a run with the same key"""
+        journal = pj.ProgressJournal(self.journal_file, self.run_key)
+        self.assertEqual(len(journal), 0)
+        journal.record("a.csv", {"rows": 4})
+        journal.record("b.csv", {"rows": 2})
+
+        resumed = pj.ProgressJournal(self.journal_file, self.run_key)
+        self.assertEqual(len(resumed), 2)
+        self.assertIn("a.csv", resumed)
+        self.assertEqual(resumed.get("b.csv"), {"rows": 2})
+        self.assertIsNone(resumed.get("c.csv"))
+        self.assertEqual(os.listdir(self.directory.name), ["run.journal"])
+
+    def test_different_run_ignored(self):
+        """Test entries of a run with a different key are not resumed"""
+        pj.ProgressJournal(self.journal_file, self.run_key).record("a.csv", 1)
+        journal = pj.ProgressJournal(self.journal_file, {"chunk_size": 3})
+        self.assertEqual(len(journal), 0)
+
+    def test_unreadable_journal_ignored(self):
+        """Test a corrupt journal file is ignored"""
+        with open(self.journal_file, "w") as f:
+            f.write("{\"version\": 1, \"run\"")
+        journal = pj.ProgressJournal(self.journal_file, self.run_key)
+        self.assertEqual(len(journal), 0)
+
+    def test_remove(self):
+        """Test the journal file is removed once the run completes"""
+        journal = pj.ProgressJournal(self.journal_file, self.run_key)
+        journal.record("a.csv", 1)
+        journal.remove()
+        self.assertFalse(os.path.exists(self.journal_file))
+        self.assertEqual(len(journal), 0)
+
+
+# =============================================================================
+# Test execution
+# =============================================================================
+
+if __name__ == "__main__":
+    unittest.main()
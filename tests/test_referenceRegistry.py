@@ -0,0 +1,134 @@
+# =============================================================================
+# Modules
+# =============================================================================
+
+# Python modules
+from concurrent.futures import ThreadPoolExecutor
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+# Third party modules
+import numpy as np
+import yaml
+
+# Testing module
+import DataImportExport as die
+import ReferenceRegistry as rr
+
+# =============================================================================
+# Variables
+# =============================================================================
+
+# Configuration data for the reference book method
+CONFIG_FILE_PATH = "data/forecasters_reference_book_config.yaml"
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+
+class TestReferenceRegistry(unittest.TestCase):
+
+    def setUp(self):
+        """Copy the configuration and reference files to a temporary dir"""
+        self.directory = tempfile.TemporaryDirectory()
+        config_data = die.import_yaml_configuration_file(CONFIG_FILE_PATH)
+        for section, key in [
+            ("constants", "constants_file_path"),
+            ("k_lookup", "k_lookup_file_path"),
+        ]:
+            file = os.path.join(
+                self.directory.name,
+                os.path.basename(config_data[section][key])
+            )
+            shutil.copy(config_data[section][key], file)
+            config_data[section][key] = file
+        self.constants_file = config_data["constants"]["constants_file_path"]
+        self.config_file = os.path.join(self.directory.name, "config.yaml")
+        with open(self.config_file, "w") as f:
+            yaml.safe_dump(config_data, f)
+        self.registry = rr.ReferenceRegistry(max_entries=2)
+
+    def tearDown(self):
+        """Remove the temporary files"""
+        self.directory.cleanup()
+
+    def test_get_without_file_io(self):
+        """Test repeated gets hand back the loaded data without file I/O"""
+        reference_data = self.registry.get(self.config_file)
+        with mock.patch("builtins.open") as open_file:
+            self.assertIs(self.registry.get(self.config_file), reference_data)
+        open_file.assert_not_called()
+        self.assertAlmostEqual(
+            reference_data.reference_book.tmin_single(22.4, 10.9, 14.56, 3.9),
+            11.8116
+        )
+
+    def test_read_only_arrays(self):
+        """Test the shared arrays cannot be changed by callers"""
+        reference_data = self.registry.get(self.config_file)
+        with self.assertRaises(ValueError):
+            reference_data.K_index.K_grid[0, 0] = 1.0
+        with self.assertRaises(ValueError):
+            reference_data.coeff[0][0] = 1.0
+
+    def test_least_recently_used_dropped(self):
+        """Test the least recently used configuration is dropped when full"""
+        config_files = [self.config_file]
+        for name in ["config_1.yaml", "config_2.yaml"]:
+            config_files.append(os.path.join(self.directory.name, name))
+            shutil.copy(self.config_file, config_files[-1])
+        first = self.registry.get(config_files[0])
+        self.registry.get(config_files[1])
+        self.registry.get(config_files[2])
+        self.assertEqual(len(self.registry), 2)
+        self.assertIsNot(self.registry.get(config_files[0]), first)
+
+    def test_invalidate(self):
+        """Test invalidated reference data is loaded again"""
+        reference_data = self.registry.get(self.config_file)
+        self.registry.invalidate(self.config_file)
+        self.assertEqual(len(self.registry), 0)
+        self.assertIsNot(self.registry.get(self.config_file), reference_data)
+
+    def test_reload_if_changed(self):
+        """Test only changed reference data is reloaded"""
+        reference_data = self.registry.get(self.config_file)
+        self.assertEqual(self.registry.reload_if_changed(), [])
+        with open(self.constants_file, "r") as f:
+            constants = f.read()
+        with open(self.constants_file, "w") as f:
+            f.write(constants.replace("0.316", "0.3"))
+        self.assertEqual(
+            self.registry.reload_if_changed(),
+            [os.path.abspath(self.config_file)]
+        )
+        reloaded_data = self.registry.get(self.config_file)
+        self.assertIsNot(reloaded_data, reference_data)
+        self.assertEqual(reloaded_data.reference_book.coeff[0], 0.3)
+
+    def test_concurrent_gets(self):
+        """Test concurrent gets from many threads share one entry"""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda _: self.registry.get(self.config_file), range(32)
+            ))
+        self.assertEqual(len(self.registry), 1)
+        self.assertTrue(all(
+            result is self.registry.get(self.config_file)
+            for result in results
+        ))
+        np.testing.assert_array_equal(
+            results[0].K_index.K_grid, results[-1].K_index.K_grid
+        )
+
+
+# =============================================================================
+# Test execution
+# =============================================================================
+
+if __name__ == "__main__":
+    unittest.main()